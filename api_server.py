@@ -6,12 +6,18 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional
 import asyncio
+import dataclasses
 import catprint
 import PIL.Image
 from bleak import BleakScanner
 import io
+import logging
+import os
+import uuid
 import base64
 
+_LOG = logging.getLogger(__name__)
+
 # API
 app = FastAPI(title="CatPrint Receipt API", version="1.0.0")
 
@@ -19,7 +25,12 @@ app = FastAPI(title="CatPrint Receipt API", version="1.0.0")
 printers_cache = []
 
 
+from catprint import dither
 from catprint import utils
+from catprint import transport
+from catprint import emulator
+from catprint import scheduler
+from catprint import workers
 from catprint.templates import get_template
 
 
@@ -35,12 +46,55 @@ class PrintReceiptRequest(BaseModel):
     include_logo: bool = Field(True, description="Include template logo")
     include_header_footer: bool = Field(True, description="Include template header and footer")
     template: Optional[str] = Field(None, description="Template key to use (defaults to first receipt template)")
+    feed_blank: bool = Field(False, description="Send blank rows as paper feeds (less BLE traffic)")
+    compress: bool = Field(False, description="Run-length encode bitmap lines on printers that support it")
+    priority: int = Field(0, description="Jobs with higher priority print first on a busy printer")
     mock: bool = False
 
 
 # use utils.scan_for_printers directly via endpoint
 
 
+# CATPRINT_EMULATE=1 sends mock jobs to timing-accurate emulated printers (for load tests)
+emulated_printers = emulator.EmulatorFleet() if os.environ.get("CATPRINT_EMULATE") else None
+emulator_pool = catprint.printer.ConnectionPool(factory=emulated_printers) if emulated_printers else None
+
+# CATPRINT_CACHE_DIR keeps encoded jobs on disk as well, so repeat prints survive restarts
+if os.environ.get("CATPRINT_CACHE_DIR"):
+    catprint.printer.set_cache(catprint.printer.JobCache(directory=os.environ["CATPRINT_CACHE_DIR"]))
+
+
+# one print queue and worker per printer; jobs for the same MX06 print in priority order
+print_scheduler = scheduler.Scheduler(max_queue_depth=int(os.environ.get("CATPRINT_MAX_QUEUE", scheduler.DEFAULT_MAX_QUEUE_DEPTH)))
+
+
+# CATPRINT_WARM_BANNERS="SALE,FREE COFFEE" renders common banner blocks at startup
+warm_banners = [b.strip() for b in os.environ.get("CATPRINT_WARM_BANNERS", "").split(",") if b.strip()]
+
+
+# receipts render in worker processes so PIL/pdf2image work doesn't stall the event loop;
+# CATPRINT_RENDER_WORKERS=0 renders in threads instead
+render_workers = int(os.environ.get("CATPRINT_RENDER_WORKERS", workers.DEFAULT_WORKERS))
+render_pool = workers.RenderPool(render_workers, banners=warm_banners) if render_workers > 0 else None
+
+
+@app.on_event("startup")
+async def start_render_workers():
+    if render_pool is not None:
+        await asyncio.to_thread(render_pool.start)
+    else:
+        await asyncio.to_thread(catprint.render.warm_up, warm_banners)
+
+
+@app.on_event("shutdown")
+async def close_printer_links():
+    """Disconnect pooled BLE links so printers are free for other hosts."""
+    await print_scheduler.close()
+    await catprint.printer.get_pool().close()
+    if render_pool is not None:
+        render_pool.shutdown()
+
+
 @app.get("/")
 async def root():
     return {
@@ -49,6 +103,7 @@ async def root():
             "scan": "POST /scan",
             "printers": "GET /printers",
             "print": "POST /print",
+            "jobs": "POST /jobs, GET /jobs/{id}, DELETE /jobs/{id}",
         },
     }
 
@@ -78,6 +133,151 @@ async def get_printers():
     }
 
 
+@app.get("/emulator")
+async def emulator_stats():
+    """Timing stats of the emulated printers (only with CATPRINT_EMULATE=1)."""
+    if emulated_printers is None:
+        raise HTTPException(status_code=404, detail="Emulation is off. Set CATPRINT_EMULATE=1.")
+    return {
+        "success": True,
+        "printers": {
+            address: {**dataclasses.asdict(unit.stats), "rows_per_second": unit.stats.rows_per_second}
+            for address, unit in emulated_printers.printers.items()
+        },
+    }
+
+
+@app.get("/cache")
+async def cache_stats():
+    """Hit/miss counters of the encoded job cache, font registry and banner cache.
+
+    Receipts render in the render workers, so "fonts" and "banners" sum their
+    caches (each as of the last part it rendered); with CATPRINT_RENDER_WORKERS=0
+    they are this process's.
+    """
+    cache = catprint.printer.get_cache()
+    render_stats = render_pool.cache_stats() if render_pool is not None else workers.cache_stats()
+    return {
+        "success": True,
+        "entries": len(cache),
+        "hits": cache.hits,
+        "disk_hits": cache.disk_hits,
+        "misses": cache.misses,
+        "evictions": cache.evictions,
+        "fonts": render_stats["fonts"],
+        "banners": render_stats["banners"],
+    }
+
+
+@app.get("/queue")
+async def queue_stats():
+    """Per-printer queue depth, wait and service times and throughput."""
+    return {
+        "success": True,
+        "printers": {
+            address: {
+                **dataclasses.asdict(stats),
+                "mean_wait": stats.mean_wait,
+                "mean_service": stats.mean_service,
+                "rows_per_second": stats.rows_per_second,
+                "jobs_per_minute": stats.jobs_per_minute,
+            }
+            for address, stats in print_scheduler.stats().items()
+        },
+    }
+
+
+def _find_printer(address: str):
+    printer = utils.find_printer_by_address(printers_cache, address)
+    if not printer:
+        raise HTTPException(
+            status_code=404, detail="Printer not found. Run /scan first."
+        )
+    return printer
+
+
+def _check_dither(blocks: list[ReceiptBlock]) -> None:
+    """Reject unknown `meta.dither` modes up front; the renderer would only fail them once queued."""
+    for block in blocks:
+        mode = (block.meta or {}).get("dither")
+        if not (mode is None or isinstance(mode, bool) or (isinstance(mode, str) and mode in dither.ENGINES)):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown dither mode {mode!r}, expected true, false or one of: {', '.join(dither.ENGINES)}",
+            )
+
+
+def _receipt_pages(req: PrintReceiptRequest):
+    """Lazily rendered pages for a receipt request (supports pdf, images, text, banners).
+
+    With the render pool these are packed rasters rendered in worker processes.
+    """
+    _check_dither(req.blocks)
+    from catprint import receipt
+    from catprint.templates import list_templates
+
+    # Get template if logo or header/footer is requested
+    tpl = None
+    if req.include_logo or req.include_header_footer:
+        # Use provided template or default to first receipt-supporting template
+        all_templates = list_templates()
+        receipt_options = [k for k in all_templates if get_template(k).supports_receipt]
+        template_key = req.template or (receipt_options[0] if receipt_options else "ikea")
+        tpl = get_template(template_key)
+
+    # blocks render lazily and stream to the printer as each one is ready
+    if render_pool is None:
+        return receipt.iter_blocks(
+            req.blocks, 
+            include_logo=req.include_logo,
+            include_header_footer=req.include_header_footer, 
+            template=tpl
+        )
+    # plain dicts, so parts pickle without importing this module in the workers
+    return render_pool.pages(
+        receipt.iter_parts(
+            [block.model_dump() for block in req.blocks],
+            include_logo=req.include_logo,
+            include_header_footer=req.include_header_footer,
+            template=tpl,
+        )
+    )
+
+
+def _submit(req: PrintReceiptRequest, printer, pages) -> scheduler.Job:
+    """Queue `pages` on the printer's worker, routing mock jobs to a sink or emulator."""
+    device = printer
+    pool = None
+    if req.mock and emulator_pool is not None:
+        pool = emulator_pool
+    elif req.mock:
+        # full encode/send pipeline into a spool file (CATPRINT_SPOOL_DIR) or /dev/null
+        device = transport.spool_device(printer, os.environ.get("CATPRINT_SPOOL_DIR"), job=uuid.uuid4().hex[:12])
+    return print_scheduler.submit(
+        device,
+        pages,
+        priority=req.priority,
+        address=printer.address,
+        pool=pool,
+        feed_blank=req.feed_blank,
+        compress=req.compress,
+    )
+
+
+def _job_status(job: scheduler.Job) -> dict:
+    return {
+        "id": job.id,
+        "printer": job.address,
+        "state": job.state.value,
+        "priority": job.priority,
+        "rows_sent": job.rows_sent,
+        "rows_total": job.rows_total,
+        "wait_time": job.wait_time,
+        "service_time": job.service_time,
+        "error": job.error,
+    }
+
+
 @app.post("/print")
 async def print_receipt(req: PrintReceiptRequest):
     """
@@ -96,55 +296,71 @@ async def print_receipt(req: PrintReceiptRequest):
         "mock": false
     }
     """
-    # Find printer
-    printer = utils.find_printer_by_address(printers_cache, req.printer)
-    if not printer:
-        raise HTTPException(
-            status_code=404, detail="Printer not found. Run /scan first."
-        )
+    printer = _find_printer(req.printer)
 
     try:
-        # Render blocks using shared helper (supports pdf, images, text, banners)
-        from catprint import receipt
-        from catprint.templates import list_templates
-
-        # Get template if logo or header/footer is requested
-        tpl = None
-        if req.include_logo or req.include_header_footer:
-            # Use provided template or default to first receipt-supporting template
-            all_templates = list_templates()
-            receipt_options = [k for k in all_templates if get_template(k).supports_receipt]
-            template_key = req.template or (receipt_options[0] if receipt_options else "ikea")
-            tpl = get_template(template_key)
-        
-        rendered_blocks = receipt.render_blocks(
-            req.blocks, 
-            include_logo=req.include_logo,
-            include_header_footer=req.include_header_footer, 
-            template=tpl
-        )
-
-        print(f"DEBUG: Rendered {len(rendered_blocks)} blocks")
-
-        if not rendered_blocks:
+        pages = _receipt_pages(req)
+        first_page = await asyncio.to_thread(next, pages, None)
+        if first_page is None:
             raise HTTPException(status_code=400, detail="No valid blocks")
 
         # Print
-        receipt_img = catprint.render.stack(*rendered_blocks)
-
+        job = _submit(req, printer, scheduler.Prepended(first_page, pages))
+        await job.wait()
+        if job.state is not scheduler.JobState.DONE:
+            raise HTTPException(status_code=500, detail=job.error or f"Job {job.state.value}")
+        stats = job.stats
+        _LOG.debug("Job %s waited %.3fs, first line after %.3fs", job.id, job.wait_time, stats.first_line_after or 0.0)
+        message = f"Printed to {printer.address} ({stats.bytes_saved} bytes saved)"
         if req.mock:
-            await asyncio.sleep(0.5)
-            message = f"[MOCK] Printed to {printer.address}"
-        else:
-            await catprint.printer.print(receipt_img, device=printer)
-            message = f"Printed to {printer.address}"
+            message = "[MOCK] " + message
 
-        return {"success": True, "message": message}
+        return {"success": True, "message": message, "job": job.id}
 
+    except HTTPException:
+        raise
+    except scheduler.QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/jobs", status_code=202)
+async def submit_job(req: PrintReceiptRequest):
+    """Queue a receipt (same body as /print) and return its job id without waiting.
+
+    Rendering and printing run in the printer's background worker; poll
+    GET /jobs/{id} for progress.
+    """
+    printer = _find_printer(req.printer)
+    try:
+        job = _submit(req, printer, _receipt_pages(req))
+    except scheduler.QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"success": True, "job": _job_status(job)}
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """State and progress (rows sent / rows rendered so far) of a job."""
+    job = print_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "job": _job_status(job)}
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or printing job."""
+    job = print_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not print_scheduler.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.state.value}")
+    # a running job reports "cancelled" once it stops at its next write
+    return {"success": True, "job": _job_status(job)}
+
+
 if __name__ == "__main__":
     import uvicorn
 
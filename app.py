@@ -7,10 +7,12 @@ import importlib.resources
 from catprint import utils
 from catprint.templates import list_templates, get_template
 from catprint import receipt
+from catprint import transport
 from bleak import BleakScanner
 import pdf2image
 import io
 import time
+import uuid
 from pathlib import Path
 
 
@@ -357,7 +359,8 @@ with tab_receipt:
             include_header_footer=st.session_state.get("receipt_include_header_footer", True),
             template=tpl_local,
         )
-        preview_img_local = catprint.render.stack(*rendered_blocks) if rendered_blocks else None
+        # only checked for content here, so don't paste the blocks onto a canvas
+        preview_img_local = catprint.render.stack(*rendered_blocks, lazy=True) if rendered_blocks else None
     except Exception:
         preview_img_local = None
 
@@ -386,12 +389,12 @@ with tab_receipt:
                     f"Printing to {selected_device.name} ({selected_device.address})..."
                 ):
                     if st.session_state.mock_printers:
-                        import time
-
-                        time.sleep(1)
+                        # run the full encode/send pipeline into a spool file instead of BLE
+                        sink = transport.spool_device(selected_device, safe_secret_get("spool_dir"), job=f"receipt-{uuid.uuid4().hex[:12]}")
+                        catprint.printer.run(catprint.printer.print_stream(rendered_blocks, device=sink))
                         st.write(f"[MOCK] Printed receipt to {selected_device.address}")
                     else:
-                        asyncio.run(catprint.printer.print(preview_img_local, device=selected_device))
+                        catprint.printer.run(catprint.printer.print_stream(rendered_blocks, device=selected_device))
                 st.success("✅ Printing done!")
             else:
                 st.error("Selected printer not found. Please scan again.")
@@ -408,10 +411,16 @@ with tab_receipt:
                         type=["png", "jpg", "jpeg", "gif", "bmp", "webp"],
                         key=f"image_{block['id']}",
                     )
+                    dither_mode = st.selectbox(
+                        "Dithering",
+                        list(catprint.dither.ENGINES),
+                        key=f"image_dither_{block['id']}",
+                        help="Bayer and blue noise are fastest; Atkinson keeps light backgrounds clean",
+                    )
                     if uploaded_file is not None:
                         try:
                             st.session_state.blocks[i]["data"] = catprint.render.image_page(
-                                PIL.Image.open(uploaded_file)
+                                PIL.Image.open(uploaded_file), dither=dither_mode
                             )
                         except Exception as e:
                             st.error(f"Error loading image: {e}")
@@ -804,13 +813,12 @@ with tab_id:
             canvas.paste(img, (xoff, 0))
 
             if st.session_state.mock_printers:
-                import time
-
-                time.sleep(0.5)
+                sink = transport.spool_device(selected_device, safe_secret_get("spool_dir"), job=f"id_card-{uuid.uuid4().hex[:12]}")
+                catprint.printer.run(catprint.printer.print(catprint.render.image_page(canvas), device=sink))
                 st.write(f"[MOCK] Printed ID card to {selected_device.address}")
             else:
                 with st.spinner(f"Printing ID card to {selected_device.name} ({selected_device.address})..."):
-                    asyncio.run(catprint.printer.print(catprint.render.image_page(canvas), device=selected_device))
+                    catprint.printer.run(catprint.printer.print(catprint.render.image_page(canvas), device=selected_device))
             st.success("✅ ID card printed")
         else:
             st.error("Selected printer not found. Please scan again.")
@@ -0,0 +1,40 @@
+"""Throughput of each dither engine on a printer-width photo and a tall page.
+
+The blue-noise map is built once per process; its build time is printed
+separately and kept out of the rates.
+
+Usage: uv run python benchmarks/bench_dither.py [repeat]
+"""
+import sys
+import time
+
+import PIL.Image
+
+from catprint import dither, render
+
+
+def gray_photo(height: int) -> PIL.Image.Image:
+    size = (render.PRINTER_WIDTH, height)
+    gradient = PIL.Image.radial_gradient("L").resize(size)
+    noise = PIL.Image.effect_noise(size, 40)
+    return PIL.Image.blend(PIL.Image.effect_mandelbrot(size, (-2, -1.5, 1, 1.5), 100), PIL.Image.blend(noise, gradient, 0.5), 0.5)
+
+
+def main(repeat: int) -> None:
+    start = time.perf_counter()
+    dither.blue_noise_map()
+    print(f"blue-noise map built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for height in (512, 4000):
+        image = gray_photo(height)
+        print(f"{image.width}x{height}:")
+        for name, engine in dither.ENGINES.items():
+            engine(image)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                engine(image)
+            elapsed = (time.perf_counter() - start) / repeat
+            print(f"  {name:>16}: {1 / elapsed:8.1f} images/s  {image.width * height / elapsed / 1e6:7.1f} Mpx/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,57 @@
+"""Run print jobs against emulated MX06 units and report timing.
+
+Usage: uv run python benchmarks/bench_emulator.py [printers] [jobs per printer]
+"""
+import asyncio
+import sys
+import time
+
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import emulator, printer
+
+
+def receipt(lines: int = 40) -> PIL.Image.Image:
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, lines * 24), color="white")
+    draw = PIL.ImageDraw.Draw(img)
+    for i in range(lines):
+        draw.text((4, i * 24 + 4), f"{i:03d} Coffee, large ............ 59.00 Kc", fill="black")
+    return img
+
+
+async def run(name: str, printers: int, jobs: int, fleet_settings: dict, **print_kwargs) -> None:
+    fleet = emulator.EmulatorFleet(**fleet_settings)
+    pool = printer.ConnectionPool(factory=fleet)
+    img = receipt()
+    devices = [type("D", (), {"name": "MX06", "address": f"EM:{i:02d}"})() for i in range(printers)]
+
+    async def worker(device):
+        for _ in range(jobs):
+            await printer.print(img, device=device, pool=pool, **print_kwargs)
+        await fleet(device).wait_idle()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(d) for d in devices))
+    wall = time.perf_counter() - start
+    await pool.close()
+
+    units = fleet.printers.values()
+    rows = sum(u.stats.rows_printed for u in units)
+    sent = sum(u.stats.bytes_received for u in units)
+    print(
+        f"{name:>24}: {rows / wall:8.0f} rows/s  {sent / wall / 1024:6.1f} KB/s  "
+        f"pauses {sum(u.stats.pauses for u in units):4d}  stalls {sum(u.stats.stalls for u in units):4d} "
+        f"({sum(u.stats.stall_time for u in units):.2f} s)  overruns {sum(u.stats.overruns for u in units)}"
+    )
+
+
+async def main(printers: int = 3, jobs: int = 2) -> None:
+    print(f"{printers} printers x {jobs} jobs")
+    await run("MTU 23, with response", printers, jobs, dict(mtu_size=23, write_without_response=False))
+    await run("MTU 185", printers, jobs, dict(mtu_size=185))
+    await run("MTU 185, feed+compress", printers, jobs, dict(mtu_size=185), feed_blank=True, compress=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:])))
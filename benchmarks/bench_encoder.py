@@ -0,0 +1,51 @@
+"""Compare the bulk raster encoder against the old per-row encoder.
+
+Usage: uv run python benchmarks/bench_encoder.py [rows]
+"""
+import random
+import sys
+import time
+
+import PIL.Image
+
+from catprint import printer
+from catprint.compat import batched, FLIP_LEFT_RIGHT
+
+
+def legacy_rows(img: PIL.Image.Image) -> bytes:
+    return b"".join(
+        printer.Command.DRAW_BITMAP.format(bytes(reversed(chunk)))
+        for chunk in batched(
+            img.convert("RGB").convert("1").point(lambda p: 255 - p).transpose(FLIP_LEFT_RIGHT).tobytes(),
+            printer.ROW_BYTES,
+        )
+    )
+
+
+def bulk_rows(img: PIL.Image.Image) -> bytes:
+    return printer.encode_rows(printer.pack(img))
+
+
+def bench(name, fn, img, repeat=3):
+    best = min(_timed(fn, img) for _ in range(repeat))
+    print(f"{name:>8}: {img.height / best:12,.0f} rows/s  ({best * 1000:.1f} ms)")
+    return best
+
+
+def _timed(fn, img):
+    start = time.perf_counter()
+    fn(img)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 5000) -> None:
+    rnd = random.Random(0)
+    img = PIL.Image.frombytes("1", (printer.PRINTER_WIDTH, rows), rnd.randbytes(printer.ROW_BYTES * rows))
+    assert legacy_rows(img) == bulk_rows(img)
+    legacy = bench("legacy", legacy_rows, img)
+    bulk = bench("bulk", bulk_rows, img)
+    print(f"speedup: {legacy / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
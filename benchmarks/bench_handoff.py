@@ -0,0 +1,40 @@
+"""Time handing packed rasters back from render workers: pickled vs shared memory.
+
+The part is pre-packed, so only the transfer is measured.
+
+Usage: uv run python benchmarks/bench_handoff.py [MB ...]
+"""
+import functools
+import sys
+import time
+
+from catprint import workers
+
+
+def packed(size: int):
+    yield bytes(size)
+
+
+def best(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes: list[int]) -> None:
+    pool = workers.RenderPool(1)
+    pool.start()
+    executor = pool._get_executor()
+    for mb in sizes:
+        part = functools.partial(packed, mb * 1_000_000)
+        pickled = best(lambda: executor.submit(workers.render_packed, part).result())
+        shared = best(lambda: sum(len(page) for page in pool.pages([part])))
+        print(f"{mb:4d} MB: pickled {pickled * 1000:7.1f} ms  shared memory {shared * 1000:7.1f} ms")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1, 10, 50])
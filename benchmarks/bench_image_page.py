@@ -0,0 +1,68 @@
+"""Pages per second of render.image_page: the fused pipeline vs the Pillow
+stage-per-step chain it replaced, on photo-like images and PDF-like pages.
+
+Usage: uv run python benchmarks/bench_image_page.py [repeat]
+"""
+import sys
+import time
+
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageEnhance
+
+from catprint import render
+
+
+def pillow_chain(image, *, dither=True, contrast=1.2, sharpen=True, threshold=212):
+    """render.image_page as it was: resize, convert, two enhancers and a lambda threshold."""
+    if image.width > render.PRINTER_WIDTH:
+        image = image.resize((render.PRINTER_WIDTH, int(image.height * render.PRINTER_WIDTH / image.width)), render.LANCZOS)
+    image = image.convert("L")
+    if contrast != 1.0:
+        image = PIL.ImageEnhance.Contrast(image).enhance(contrast)
+    if sharpen:
+        image = PIL.ImageEnhance.Sharpness(image).enhance(1.5)
+    if dither:
+        return image.convert("1")
+    return image.point(lambda x: 0 if x < threshold else 255, mode="1")
+
+
+def photo(width: int, height: int) -> PIL.Image.Image:
+    gradient = PIL.Image.radial_gradient("L").resize((width, height))
+    noise = PIL.Image.effect_noise((width, height), 40)
+    mandelbrot = PIL.Image.effect_mandelbrot((width, height), (-2, -1.5, 1, 1.5), 100)
+    return PIL.Image.merge("RGB", (mandelbrot, PIL.Image.blend(noise, gradient, 0.5), gradient))
+
+
+def pdf_page(width: int = 1240, height: int = 1754) -> PIL.Image.Image:
+    """An A4 page at 150 dpi, as receipt._convert_pdf_bytes renders them."""
+    img = PIL.Image.new("RGB", (width, height), "white")
+    draw = PIL.ImageDraw.Draw(img)
+    font = render.get_fonts().get(render.MONO_FONT, 28)
+    for y in range(60, height - 60, 40):
+        draw.text((80, y), "Faktura č. 2024-0815  Total 129,90 Kč  DPH 21 %", fill=(40, 40, 40), font=font)
+    return img
+
+
+def rate(fn, image, options, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(image, **options)
+    return repeat / (time.perf_counter() - start)
+
+
+def main(repeat: int) -> None:
+    cases = [
+        ("photo 384x512", photo(384, 512), dict(dither=True, contrast=1.1, sharpen=False)),
+        ("photo 1200x1600", photo(1200, 1600), dict(dither=True, contrast=1.1, sharpen=False)),
+        ("photo 4000x3000", photo(4000, 3000), dict(dither=True, contrast=1.1, sharpen=False)),
+        ("pdf page 1240x1754", pdf_page(), dict(dither=False, contrast=1.5)),
+        ("image_page defaults", photo(1200, 1600), dict()),
+    ]
+    for name, image, options in cases:
+        before, after = rate(pillow_chain, image, options, repeat), rate(render.image_page, image, options, repeat)
+        print(f"{name:>20}: Pillow chain {before:7.1f}/s  fused {after:7.1f}/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
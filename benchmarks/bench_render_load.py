@@ -0,0 +1,68 @@
+"""Load test: event loop responsiveness while receipts render.
+
+Renders several heavy receipts at once (long text, photos, banners), either in
+threads (the event loop's default executor) or in a workers.RenderPool, while a
+heartbeat task measures how late the event loop wakes up. With threads the GIL
+is shared with the loop; with worker processes it isn't.
+
+Usage: uv run python benchmarks/bench_render_load.py [concurrent receipts] [render workers]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+import PIL.Image
+
+from catprint import receipt, workers
+
+
+def blocks(seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    photo = PIL.Image.frombytes("L", (900, 1200), rng.randbytes(900 * 1200))
+    lines = "\n".join(f"{i:03d} Coffee, large ........... {rng.randint(10, 99)}.00 Kc" for i in range(120))
+    return [
+        {"type": "banner", "data": "SALE"},
+        {"type": "text", "data": lines},
+        {"type": "image", "data": photo},
+        {"type": "text", "data": lines},
+        {"type": "image", "data": photo.rotate(90, expand=True)},
+    ]
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event, interval: float = 0.005) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def run(name: str, jobs: int, render) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(asyncio.to_thread(render, blocks(n)) for n in range(jobs)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    lags.sort()
+    print(
+        f"{name:>16}: {elapsed:6.2f} s  loop lag p50 {statistics.median(lags) * 1000:6.1f} ms  "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:6.1f} ms  max {lags[-1] * 1000:6.1f} ms"
+    )
+
+
+async def main(jobs: int = 4, render_workers: int = workers.DEFAULT_WORKERS) -> None:
+    print(f"{jobs} concurrent receipts")
+    await run("threads", jobs, lambda b: list(receipt.iter_blocks(b)))
+    pool = workers.RenderPool(render_workers)
+    await asyncio.to_thread(pool.start)
+    await run(f"{render_workers} processes", jobs, lambda b: list(pool.pages(receipt.iter_parts(b))))
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:])))
@@ -0,0 +1,54 @@
+"""Compare render-everything-then-print with the streaming pipeline.
+
+Renders a multi-page receipt (one text block per page, plus a simulated PDF
+rasterization delay) and prints it to an emulated MX06, reporting time to the
+first line on the printer and total time.
+
+Usage: uv run python benchmarks/bench_stream.py [pages] [render delay ms]
+"""
+import asyncio
+import sys
+import time
+
+from catprint import emulator, printer, receipt, render
+
+
+def blocks(pages: int, delay: float):
+    for n in range(pages):
+        time.sleep(delay)  # stands in for pdf2image rasterizing a page
+        yield {"type": "text", "data": "\n".join(f"page {n} line {i} ............ 59.00 Kc" for i in range(30))}
+
+
+class TimedPrinter(emulator.EmulatedPrinter):
+    first_line_at = None
+
+    def _enqueue(self, rows, size, line):
+        if self.first_line_at is None and line is not None:
+            self.first_line_at = time.perf_counter()
+        super()._enqueue(rows, size, line)
+
+
+async def run(name: str, pages: int, delay: float, streaming: bool) -> None:
+    unit = TimedPrinter(feed_rate=2000, link_rate=60_000)
+    pool = printer.ConnectionPool(factory=lambda device: unit)
+    device = type("D", (), {"name": "MX06", "address": "EM:00"})()
+    start = time.perf_counter()
+    if streaming:
+        await printer.print_stream(receipt.iter_blocks(blocks(pages, delay)), device=device, pool=pool)
+    else:
+        img = await asyncio.to_thread(lambda: render.stack(*receipt.render_blocks(blocks(pages, delay))))
+        await printer.print(img, device=device, pool=pool, cache=printer.JobCache(max_bytes=0))
+    await unit.wait_idle()
+    total = time.perf_counter() - start
+    await pool.close()
+    print(f"{name:>10}: first line after {unit.first_line_at - start:6.3f} s, done after {total:6.3f} s")
+
+
+async def main(pages: int = 8, delay_ms: int = 150) -> None:
+    print(f"{pages} pages, {delay_ms} ms render each")
+    await run("stack", pages, delay_ms / 1000, streaming=False)
+    await run("stream", pages, delay_ms / 1000, streaming=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:])))
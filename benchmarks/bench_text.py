@@ -0,0 +1,56 @@
+"""Lines per second of render.text: glyph atlas vs drawing each line with FreeType.
+
+Usage: uv run python benchmarks/bench_text.py [lines] [font size]
+"""
+import random
+import sys
+import time
+
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import render
+
+WORDS = "Příliš žluťoučký kůň úpěl ďábelské ódy Total 129,90 Kč DPH 21 % Faktura č. 2024-0815 x3 @ 43,30".split()
+
+
+def freetype_text(text: str, font_size: int) -> PIL.Image.Image:
+    """render.text as it was before the atlas: ImageDraw.text line by line."""
+    font = render.get_fonts().get(render.MONO_FONT, font_size)
+    left, top, right, bottom = font.getbbox("Č")
+    height = int((bottom - top) * 1.4)
+    lines = text.splitlines()
+    img = PIL.Image.new("1", (render.PRINTER_WIDTH, len(lines) * height), color="white")
+    draw = PIL.ImageDraw.Draw(img)
+    for y, line in enumerate(lines):
+        draw.text((0, y * height), line, fill="black", font=font)
+    return img
+
+
+def main(count: int, font_size: int) -> None:
+    random.seed(0)
+    lines = []
+    for _ in range(count):
+        line = ""
+        while len(line) < 40:
+            line += random.choice(WORDS) + " "
+        lines.append(line[:44])
+    text = "\n".join(lines)
+
+    # warm the font registry and the atlas
+    render.text(text[:400], font_size=font_size)
+    start = time.perf_counter()
+    atlas = render.text(text, font_size=font_size)
+    atlas_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = freetype_text(text, font_size)
+    freetype_time = time.perf_counter() - start
+
+    assert atlas.tobytes() == reference.tobytes(), "atlas output differs from FreeType"
+    print(f"{count} lines at {font_size} px")
+    print(f"  FreeType: {count / freetype_time:9.0f} lines/s")
+    print(f"  atlas:    {count / atlas_time:9.0f} lines/s ({freetype_time / atlas_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 18)
@@ -0,0 +1,64 @@
+"""Banners per second of render.text_banner: per-pixel reads vs vectorized cell
+sampling (both uncached), and a repeat banner served from the banner cache.
+
+The uncached runs render the same banner bitmap first; the difference is
+sampling it into character cells and drawing the rows.
+
+Usage: uv run python benchmarks/bench_text_banner.py [text ...]
+"""
+import itertools
+import sys
+import time
+
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import render
+
+
+def per_pixel_text_banner(text: str, *, font_size: int = 18) -> PIL.Image.Image:
+    """render.text_banner as it was: a getpixel per cell and ImageDraw.text per row."""
+    font = render.get_fonts().get(render.MONO_FONT, font_size)
+    _, _, char_width, char_height = font.getbbox("#")
+    banner_img = render.banner(text)
+    img = PIL.Image.new("1", (banner_img.width, banner_img.height), color="white")
+    draw = PIL.ImageDraw.Draw(img)
+    text_iter = itertools.cycle(c for c in text if c != " ")
+    rows = int(banner_img.height / char_height)
+    cols = int(banner_img.width / char_width)
+    for y in range(rows):
+        line_text = ""
+        for x in range(cols):
+            if banner_img.getpixel((int((x + 0.5) * char_width), int((y + 0.5) * char_height))):
+                line_text += " "
+            else:
+                line_text += next(text_iter)
+        draw.text((0, y * char_height), line_text, fill="black", font=font)
+    return img
+
+
+def rate(fn, text: str, repeat: int = 3) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return repeat / (time.perf_counter() - start)
+
+
+def main(texts: list[str]) -> None:
+    render.preload_fonts()
+    uncached, cached = render.BannerCache(max_bytes=0), render.BannerCache()
+    for text in texts:
+        render.set_banners(uncached)
+        assert render.text_banner(text).tobytes() == per_pixel_text_banner(text).tobytes()
+        before, after = rate(per_pixel_text_banner, text), rate(render.text_banner, text)
+        render.set_banners(cached)
+        render.text_banner(text)
+        hit = rate(render.text_banner, text, repeat=100)
+        print(
+            f"{text!r:>24}: per-pixel {before:6.1f}/s  vectorized {after:6.1f}/s ({after / before:.1f}x)"
+            f"  cached {hit:8.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["SALE", "FREE COFFEE", "Happy birthday Zuzana!"])
@@ -0,0 +1,58 @@
+"""Throughput of the MTU-sized, paced sender against a simulated BLE link.
+
+The fake link models the negotiated MTU, a connection interval per
+write-with-response round trip and a small per-write cost otherwise.
+
+Usage: uv run python benchmarks/bench_transport.py [rows]
+"""
+import asyncio
+import sys
+import time
+import types
+
+from catprint import printer
+
+
+class SimulatedLink:
+    def __init__(self, mtu: int, without_response: bool, interval: float = 0.0075, per_write: float = 0.0005):
+        self.mtu_size = mtu
+        props = ["write", "write-without-response"] if without_response else ["write"]
+        char = types.SimpleNamespace(properties=props, max_write_without_response_size=mtu - 3)
+        self.services = types.SimpleNamespace(get_characteristic=lambda uuid: char)
+        self.interval = interval
+        self.per_write = per_write
+
+    async def write_gatt_char(self, uuid, data, response=None):
+        await asyncio.sleep(self.per_write if response is False else self.interval)
+
+
+class LegacyLink(SimulatedLink):
+    async def write_gatt_char(self, uuid, data, response=None):
+        await asyncio.sleep(self.interval)
+
+
+async def legacy_send(client, data: bytes) -> None:
+    # fixed 64-byte chunks with a flat 25 ms sleep, as printer.print used to do
+    for offset in range(0, len(data), 64):
+        await client.write_gatt_char(printer.PRINT_CHARACTERISTIC, data[offset : offset + 64])
+        await asyncio.sleep(0.025)
+
+
+async def bench(name: str, coro, size: int) -> None:
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28}: {size / elapsed / 1024:8.1f} KB/s  ({elapsed:.2f} s)")
+
+
+async def main(rows: int = 100) -> None:
+    data = bytes(printer.ROW_BYTES) * rows
+    await bench("legacy 64 B + 25 ms", legacy_send(LegacyLink(23, False), data), len(data))
+    await bench("MTU 23, with response", printer.send(SimulatedLink(23, False), data), len(data))
+    await bench("MTU 185, with response", printer.send(SimulatedLink(185, False), data), len(data))
+    await bench("MTU 185, without response", printer.send(SimulatedLink(185, True), data), len(data))
+    await bench("MTU 512, without response", printer.send(SimulatedLink(512, True), data), len(data))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:])))
@@ -1,7 +1,7 @@
 import importlib
 from typing import Any
 
-__all__ = ["printer", "render", "effects", "templates", "utils", "receipt"]
+__all__ = ["printer", "render", "effects", "templates", "utils", "receipt", "transport", "emulator", "scheduler", "workers", "raster", "spool", "dither"]
 
 
 def __getattr__(name: str) -> Any:
@@ -30,12 +30,14 @@ def _pillow_attr(name: str, default=None):
 
 
 LANCZOS = None
+NEAREST = None
 FLIP_LEFT_RIGHT = None
 ROTATE_270 = None
 DITHER_FLOYD = None
 try:
     # Pillow >= 9.1
     LANCZOS = getattr(_PILImage, "Resampling").LANCZOS
+    NEAREST = getattr(_PILImage, "Resampling").NEAREST
     FLIP_LEFT_RIGHT = getattr(_PILImage, "Transpose").FLIP_LEFT_RIGHT
     ROTATE_270 = getattr(_PILImage, "Transpose").ROTATE_270
     DITHER_FLOYD = getattr(_PILImage, "Dither").FLOYDSTEINBERG
@@ -43,6 +45,7 @@ except Exception:
     # older Pillow
     if _PILImage is not None:
         LANCZOS = getattr(_PILImage, "LANCZOS", getattr(_PILImage, "ANTIALIAS", None))
+        NEAREST = getattr(_PILImage, "NEAREST", None)
         FLIP_LEFT_RIGHT = getattr(_PILImage, "FLIP_LEFT_RIGHT", None)
         ROTATE_270 = getattr(_PILImage, "ROTATE_270", None)
         DITHER_FLOYD = getattr(_PILImage, "FLOYDSTEINBERG", None)
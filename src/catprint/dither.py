@@ -0,0 +1,216 @@
+"""Dithering engines: a mode "L" image in, a mode "1" image out.
+
+`render.image_page(img, dither=...)` picks one by name:
+
+- "floyd-steinberg" (also `dither=True`): Pillow's error diffusion. Smooth
+  gradients, but serial, and it smears grain into light backgrounds.
+- "bayer": ordered dither against a tiled 8x8 Bayer matrix. Every pixel is
+  compared with its own threshold, so it is one vectorized pass and a strip
+  starting on a tile boundary dithers the same on its own; the pattern is a
+  regular cross-hatch.
+- "blue-noise": the same comparison against a 64x64 void-and-cluster map. As
+  parallel as Bayer, without the visible grid; the map is built once per
+  process.
+- "atkinson": error diffusion that only passes 3/4 of the error on, which keeps
+  highlights and light backgrounds clean. Serial and done in Python, so the
+  slowest of the four.
+
+    img = dither.dither(gray, "blue-noise")
+"""
+from __future__ import annotations
+
+import functools
+import math
+import random
+from typing import Callable
+
+import PIL.Image
+import PIL.ImageChops
+
+from catprint.compat import DITHER_FLOYD
+
+# side of the Bayer matrix used by the "bayer" engine
+BAYER_SIZE = 8
+
+# side of the blue-noise map; at 64 its tiling does not show on a receipt
+BLUE_NOISE_SIZE = 64
+
+# spread of the void-and-cluster energy filter, in pixels (Ulichney's 1.5)
+BLUE_NOISE_SIGMA = 1.5
+
+# black where the map is above the pixel (a nonzero difference), white elsewhere
+_ABOVE = tuple(255 if v == 0 else 0 for v in range(256))
+
+# the 0/255 bytes atkinson writes, as a mode "1" image
+_HALF = tuple(0 if v < 128 else 255 for v in range(256))
+
+
+def _threshold_tile(ranks: list[int], size: int) -> PIL.Image.Image:
+    """Ranks 0..size*size-1 as thresholds spread evenly over 1..255.
+
+    A pixel stays white when it is at least its threshold, so black (0) never
+    turns white and white (255) never turns black.
+    """
+    count = size * size
+    return PIL.Image.frombytes("L", (size, size), bytes(1 + rank * 255 // count for rank in ranks))
+
+
+@functools.lru_cache(maxsize=None)
+def bayer_map(size: int = BAYER_SIZE) -> PIL.Image.Image:
+    """The size x size Bayer threshold matrix (size a power of two) as an image."""
+    if size < 2 or size & (size - 1):
+        raise ValueError(f"Bayer matrix size must be a power of two, got {size}")
+    matrix = [[0]]
+    while len(matrix) < size:
+        matrix = [[4 * v for v in row] + [4 * v + 2 for v in row] for row in matrix] + [
+            [4 * v + 3 for v in row] + [4 * v + 1 for v in row] for row in matrix
+        ]
+    return _threshold_tile([v for row in matrix for v in row], size)
+
+
+@functools.lru_cache(maxsize=None)
+def blue_noise_map(size: int = BLUE_NOISE_SIZE, *, seed: int = 0) -> PIL.Image.Image:
+    """A size x size tileable blue-noise threshold map, by void-and-cluster.
+
+    Ulichney's method: relax a sparse random pattern until its tightest cluster
+    and largest void coincide, then rank pixels by removing clusters from it
+    and filling voids on top of it. Energies wrap around the edges, so the map
+    tiles seamlessly.
+    """
+    count = size * size
+    radius = min(size // 2, math.ceil(3 * BLUE_NOISE_SIGMA))
+    kernel = [
+        (dy, dx, math.exp(-(dx * dx + dy * dy) / (2 * BLUE_NOISE_SIGMA**2)))
+        for dy in range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1)
+    ]
+    bits = bytearray(count)
+    energy = [0.0] * count
+    # energy seen from the ones (for finding clusters) and zeros (for voids);
+    # the other kind is masked out so max() / min() run over plain lists
+    clusters = [-math.inf] * count
+    voids = [0.0] * count
+
+    def toggle(index: int) -> None:
+        on = not bits[index]
+        y, x = divmod(index, size)
+        for dy, dx, weight in kernel:
+            near = (y + dy) % size * size + (x + dx) % size
+            value = energy[near] = energy[near] + (weight if on else -weight)
+            if bits[near]:
+                clusters[near] = value
+            else:
+                voids[near] = value
+        bits[index] = on
+        clusters[index], voids[index] = (energy[index], math.inf) if on else (-math.inf, energy[index])
+
+    for index in random.Random(seed).sample(range(count), max(count // 10, 1)):
+        toggle(index)
+    for _ in range(count):
+        tightest = clusters.index(max(clusters))
+        toggle(tightest)
+        largest = voids.index(min(voids))
+        toggle(largest)
+        if largest == tightest:
+            break
+    prototype = [i for i in range(count) if bits[i]]
+
+    ranks = [0] * count
+    for rank in reversed(range(len(prototype))):
+        tightest = clusters.index(max(clusters))
+        toggle(tightest)
+        ranks[tightest] = rank
+    for index in prototype:
+        toggle(index)
+    for rank in range(len(prototype), count):
+        largest = voids.index(min(voids))
+        toggle(largest)
+        ranks[largest] = rank
+    return _threshold_tile(ranks, size)
+
+
+@functools.lru_cache(maxsize=16)
+def _strip(tile: Callable[..., PIL.Image.Image], size: int, width: int) -> PIL.Image.Image:
+    """One row of tile(size) repeated across `width`; a few KB, so kept."""
+    cell = tile(size)
+    strip = PIL.Image.new("L", (width, cell.height))
+    for x in range(0, width, cell.width):
+        strip.paste(cell, (x, 0))
+    return strip
+
+
+def _ordered(image: PIL.Image.Image, tile: Callable[..., PIL.Image.Image], size: int) -> PIL.Image.Image:
+    # the full threshold map is built per image, doubling the filled rows with each paste
+    strip = _strip(tile, size, image.width)
+    thresholds = PIL.Image.new("L", image.size)
+    thresholds.paste(strip, (0, 0))
+    filled = strip.height
+    while filled < image.height:
+        thresholds.paste(thresholds.crop((0, 0, image.width, filled)), (0, filled))
+        filled *= 2
+    return PIL.ImageChops.subtract(thresholds, image).point(_ABOVE, mode="1")
+
+
+def bayer(image: PIL.Image.Image, *, size: int = BAYER_SIZE) -> PIL.Image.Image:
+    return _ordered(image, bayer_map, size)
+
+
+def blue_noise(image: PIL.Image.Image, *, size: int = BLUE_NOISE_SIZE) -> PIL.Image.Image:
+    return _ordered(image, blue_noise_map, size)
+
+
+def floyd_steinberg(image: PIL.Image.Image) -> PIL.Image.Image:
+    return image.convert("1", dither=DITHER_FLOYD if DITHER_FLOYD is not None else None)
+
+
+def atkinson(image: PIL.Image.Image) -> PIL.Image.Image:
+    """Atkinson error diffusion: 1/8 of the error to each of six neighbours."""
+    width, height = image.size
+    data = image.tobytes()
+    out = bytearray(width * height)
+    # error rows for this line and the two below, padded 2 pixels each side
+    here, below, twice_below = [0] * (width + 4), [0] * (width + 4), [0] * (width + 4)
+    for y in range(height):
+        start = y * width
+        for x in range(width):
+            value = data[start + x] + here[x + 2]
+            # an eighth of the error, rounded toward zero so none leaks in
+            if value >= 128:
+                out[start + x] = 255
+                share = -((255 - value) >> 3)
+            elif value >= 0:
+                share = value >> 3
+            else:
+                share = -(-value >> 3)
+            if share:
+                here[x + 3] += share
+                here[x + 4] += share
+                below[x + 1] += share
+                below[x + 2] += share
+                below[x + 3] += share
+                twice_below[x + 2] += share
+        here, below, twice_below = below, twice_below, [0] * (width + 4)
+    return PIL.Image.frombytes("L", (width, height), bytes(out)).point(_HALF, mode="1")
+
+
+# dither= modes accepted by render.image_page
+ENGINES: dict[str, Callable[[PIL.Image.Image], PIL.Image.Image]] = {
+    "floyd-steinberg": floyd_steinberg,
+    "bayer": bayer,
+    "blue-noise": blue_noise,
+    "atkinson": atkinson,
+}
+
+
+def get_engine(name: str) -> Callable[[PIL.Image.Image], PIL.Image.Image]:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown dither mode {name!r}, expected one of: {', '.join(ENGINES)}") from None
+
+
+def dither(image: PIL.Image.Image, engine: str = "floyd-steinberg") -> PIL.Image.Image:
+    """Dither `image` to mode "1" with the named engine."""
+    if image.mode != "L":
+        image = image.convert("L")
+    return get_engine(engine)(image)
@@ -0,0 +1,285 @@
+"""Timing-accurate MX06 emulator for benchmarking print pipelines offline.
+
+`EmulatedPrinter` is a `Transport` that behaves like the printer end of a BLE
+link: writes take link time, frames are parsed and CRC-checked, bitmap lines
+and feeds go into a bounded receive buffer that the print head drains at
+`feed_rate` rows/s, and the printer notifies pause/resume as the buffer fills
+and drains. Rows arriving at a full buffer are lost, like on the real unit.
+
+Use it wherever `BleakClient` is used, e.g.
+
+    fleet = EmulatorFleet(feed_rate=120)
+    pool = printer.ConnectionPool(factory=fleet)
+    await printer.print(img, device=device, pool=pool)
+    fleet.printers[device.address].stats
+
+`image()` reconstructs what would have been printed.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import types
+import typing
+
+import PIL.Image
+
+from catprint import printer, transport
+
+
+@dataclasses.dataclass
+class EmulatorStats:
+    bytes_received: int = 0
+    frames: int = 0
+    crc_errors: int = 0
+    rows_printed: int = 0
+    # rows dropped because they arrived at a full buffer
+    overruns: int = 0
+    pauses: int = 0
+    # times the head ran out of data mid-job, and for how long in total
+    stalls: int = 0
+    stall_time: float = 0.0
+    first_byte_at: float | None = None
+    last_row_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.first_byte_at is None or self.last_row_at is None:
+            return 0.0
+        return self.last_row_at - self.first_byte_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_printed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_received / self.elapsed if self.elapsed else 0.0
+
+
+class EmulatedPrinter(transport.Transport):
+    """Emulated MX06 behind a BLE link.
+
+    Args:
+        device: the device it stands in for (only its name/address are used)
+        mtu_size: negotiated ATT MTU
+        interval: BLE connection interval, the cost of a write-with-response
+        link_rate: bytes/s for write-without-response
+        feed_rate: print head speed in rows/s
+        buffer_size: receive buffer in bytes of line data
+        high_water, low_water: buffer fill fractions that trigger pause / resume
+        flow_control: notify pause/resume (the printer's real behaviour)
+        connect_delay: seconds a connect takes
+    """
+
+    notifies = True
+
+    def __init__(
+        self,
+        device=None,
+        *,
+        mtu_size: int = 185,
+        interval: float = 0.0075,
+        link_rate: float = 12_000.0,
+        feed_rate: float = 100.0,
+        buffer_size: int = 8192,
+        high_water: float = 0.75,
+        low_water: float = 0.25,
+        flow_control: bool = True,
+        write_without_response: bool = True,
+        connect_delay: float = 0.0,
+    ):
+        self.device = device
+        self.mtu_size = mtu_size
+        self.interval = interval
+        self.link_rate = link_rate
+        self.feed_rate = feed_rate
+        self.buffer_size = buffer_size
+        self.high_water = high_water
+        self.low_water = low_water
+        self.flow_control = flow_control
+        self.connect_delay = connect_delay
+        props = ["write", "write-without-response"] if write_without_response else ["write"]
+        char = types.SimpleNamespace(properties=props, max_write_without_response_size=mtu_size - 3)
+        self.services = types.SimpleNamespace(get_characteristic=lambda uuid: char)
+
+        self.stats = EmulatorStats()
+        self.settings: dict[str, bytes] = {}
+        self.out_of_paper = False
+        self._connected = False
+        self._notify: typing.Callable | None = None
+        self._buffer = bytearray()
+        # queued (rows, size, line, record) entries; line is None for feeds
+        self._pending: collections.deque = collections.deque()
+        self._pending_bytes = 0
+        self._head_time = 0.0
+        self._printing = False
+        self._paused = False
+        self._resume_check: asyncio.TimerHandle | None = None
+        self._rows: list[bytes] = []
+
+    # --- Transport ---
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self) -> None:
+        await asyncio.sleep(self.connect_delay)
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        self._connected = False
+        self._notify = None
+        self._buffer.clear()
+        if self._resume_check is not None:
+            self._resume_check.cancel()
+            self._resume_check = None
+        self._paused = False
+
+    async def start_notify(self, char_specifier, callback: typing.Callable) -> None:
+        self._notify = callback
+
+    async def stop_notify(self, char_specifier) -> None:
+        self._notify = None
+
+    async def write_gatt_char(self, char_specifier, data: bytes, response: bool | None = None) -> None:
+        if not self._connected:
+            raise ConnectionError("Emulated printer is not connected")
+        await asyncio.sleep(self.interval if response is not False else len(data) / self.link_rate)
+        if self.stats.first_byte_at is None:
+            self.stats.first_byte_at = self._now()
+        self.stats.bytes_received += len(data)
+        self._buffer.extend(data)
+        self._parse()
+
+    # --- results ---
+
+    def image(self) -> PIL.Image.Image:
+        """Reconstruct the printed bitmap (lines and in-job feeds)."""
+        return printer.unpack(b"".join(self._rows))
+
+    async def wait_idle(self) -> None:
+        """Wait until the head has printed everything received so far."""
+        self._advance()
+        while self._pending:
+            await asyncio.sleep(max(self._head_time + self._pending[0][0] / self.feed_rate - self._now(), 0.001))
+            self._advance()
+
+    # --- protocol ---
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _parse(self) -> None:
+        buf = self._buffer
+        while True:
+            start = buf.find(b"Qx")
+            if start < 0:
+                del buf[: max(len(buf) - 1, 0)]
+                return
+            del buf[:start]
+            if len(buf) < 6:
+                return
+            length = buf[4]
+            end = 6 + length + 2
+            if len(buf) < end:
+                return
+            command, data, crc = buf[2], bytes(buf[6 : 6 + length]), buf[6 + length]
+            del buf[:end]
+            self.stats.frames += 1
+            if printer.checksum(data) != crc:
+                self.stats.crc_errors += 1
+                continue
+            self._handle(command, data)
+
+    def _handle(self, command: int, data: bytes) -> None:
+        Command = printer.Command
+        if command == Command.DRAW_BITMAP.value[0]:
+            self._enqueue(1, len(data), data)
+        elif command == Command.DRAW_COMPRESSED_BITMAP.value[0]:
+            self._enqueue(1, len(data), printer.rle_decode_row(data))
+        elif command == Command.FEED_PAPER.value[0]:
+            self._enqueue(int.from_bytes(data, "little"), len(data), None)
+        elif command == Command.CONTROL_LATTICE.value[0]:
+            self._printing = data == Command.Lattice.PRINT.value
+        elif command == Command.GET_DEV_STATE.value[0]:
+            self._send(Command.GET_DEV_STATE, bytes([0x01 if self.out_of_paper else 0x00, 0x00, 0x00]))
+        else:
+            try:
+                name = Command(bytes([command])).name
+            except ValueError:
+                name = f"0x{command:02x}"
+            self.settings[name] = data
+
+    def _enqueue(self, rows: int, size: int, line: bytes | None) -> None:
+        self._advance()
+        if self._pending_bytes + size > self.buffer_size:
+            self.stats.overruns += rows
+            return
+        now = self._now()
+        if not self._pending:
+            if self._printing and self.stats.rows_printed and now > self._head_time:
+                self.stats.stalls += 1
+                self.stats.stall_time += now - self._head_time
+            self._head_time = max(self._head_time, now)
+        self._pending.append((rows, size, line, self._printing))
+        self._pending_bytes += size
+        if self.flow_control and not self._paused and self._pending_bytes >= self.high_water * self.buffer_size:
+            self._paused = True
+            self.stats.pauses += 1
+            self._send(printer.Command.FLOW_CONTROL, b"\x10")
+            self._schedule_resume_check()
+
+    def _advance(self) -> None:
+        """Move the print head forward to the current time."""
+        now = self._now()
+        while self._pending:
+            rows, size, line, record = self._pending[0]
+            done_at = self._head_time + rows / self.feed_rate
+            if done_at > now:
+                break
+            self._pending.popleft()
+            self._pending_bytes -= size
+            self._head_time = done_at
+            self.stats.rows_printed += rows
+            self.stats.last_row_at = done_at
+            if record:
+                self._rows.append(line if line is not None else bytes(printer.ROW_BYTES) * rows)
+
+    def _schedule_resume_check(self) -> None:
+        rows = max(len(self._pending) // 4, 1)
+        self._resume_check = asyncio.get_running_loop().call_later(rows / self.feed_rate, self._check_resume)
+
+    def _check_resume(self) -> None:
+        self._advance()
+        if self._pending_bytes <= self.low_water * self.buffer_size:
+            self._paused = False
+            self._send(printer.Command.FLOW_CONTROL, b"\x00")
+        else:
+            self._schedule_resume_check()
+
+    def _send(self, command: printer.Command, payload: bytes) -> None:
+        if self._notify is None:
+            return
+        frame = b"Qx" + command.value + b"\x01" + bytes([len(payload)]) + b"\x00" + payload
+        self._notify(printer.NOTIFY_CHARACTERISTIC, bytearray(frame + bytes([printer.checksum(payload)]) + b"\xff"))
+
+
+class EmulatorFleet:
+    """Client factory giving each device address its own persistent EmulatedPrinter.
+
+    Pass it as `ConnectionPool(factory=...)` or patch it in for `printer.BleakClient`;
+    reconnects reuse the same emulated unit, so stats and output survive them.
+    """
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.printers: dict[str, EmulatedPrinter] = {}
+
+    def __call__(self, device) -> EmulatedPrinter:
+        address = str(getattr(device, "address", device))
+        if address not in self.printers:
+            self.printers[address] = EmulatedPrinter(device, **self.settings)
+        return self.printers[address]
@@ -3,40 +3,48 @@
 # based on: https://github.com/amber-sixel/gb01print/blob/main/gb01print.py
 
 import asyncio
+import bisect
+import collections
+import contextlib
+import dataclasses
 import enum
+import hashlib
 import itertools
+import os
+import re
+import struct
 import sys
+import threading
+import time
 import typing
 import logging
 import builtins
 
 try:
     from bleak import BleakClient, BleakScanner
-    from bleak.exc import BleakDBusError
+    from bleak.exc import BleakDBusError, BleakError
 except Exception:  # pragma: no cover - tests may not have bleak
     BleakClient = None
     BleakScanner = None
 
-    class BleakDBusError(Exception):
+    class BleakError(Exception):
         pass
 
-_LOG = logging.getLogger(__name__)
-
-# serialize connect operations to avoid overlapping BlueZ connect requests
-_connect_lock: asyncio.Lock | None = None
-
+    class BleakDBusError(BleakError):
+        pass
 
-def _get_connect_lock() -> asyncio.Lock:
-    global _connect_lock
-    if _connect_lock is None:
-        _connect_lock = asyncio.Lock()
-    return _connect_lock
-import crc8
+_LOG = logging.getLogger(__name__)
 
 import PIL.Image
-from catprint.compat import batched, FLIP_LEFT_RIGHT
+from pathlib import Path
+from catprint import transport
+
+if typing.TYPE_CHECKING:
+    from catprint.raster import PackedRaster
+    from catprint.render import VStack
 
 PRINTER_WIDTH = 384
+ROW_BYTES = PRINTER_WIDTH // 8
 
 
 class Command(enum.Enum):
@@ -52,6 +60,8 @@ class Command(enum.Enum):
     DRAWING_MODE = b"\xbe"  # Data: 1 for Text, 0 for Images
     SET_ENERGY = b"\xaf"  # Data: 1 - 0xFFFF
     SET_QUALITY = b"\xa4"  # Data: 0x31 - 0x35. APK always sets 0x33 for GB01
+    DRAW_COMPRESSED_BITMAP = b"\xbf"  # Data: run-length encoded line, see rle_encode_row
+    FLOW_CONTROL = b"\xae"  # Notified by the printer. Data: 0x10 when its buffer is full, 0x00 to resume
 
     class Lattice(enum.Enum):
         PRINT = b"\xaa\x55\x17\x38\x44\x5f\x5f\x5f\x44\x38\x2c"
@@ -71,11 +81,492 @@ class Command(enum.Enum):
             + bytes([len(data)])
             + b"\x00"
             + data
-            + crc8.crc8(bytes(data)).digest()
+            + bytes([checksum(data)])
             + b"\x00"
         )
 
 
+# mode "1" rows are packed MSB-first with 1 = white; the printer wants LSB-first with 1 = black
+_PRINTER_ORDER = bytes(int(format(~b & 0xFF, "08b")[::-1], 2) for b in range(256))
+
+
+def _crc8_table(poly: int = 0x07) -> bytes:
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+
+# same CRC as crc8.crc8, usable with bytes.translate
+_CRC8_TABLE = _crc8_table()
+
+_BITMAP_HEADER = b"Qx" + Command.DRAW_BITMAP.value + b"\x00" + bytes([ROW_BYTES]) + b"\x00"
+_BITMAP_FRAME = len(_BITMAP_HEADER) + ROW_BYTES + 2
+
+
+def pack(img: PIL.Image.Image) -> bytes:
+    """Return `img` as raster rows in printer bit order, ROW_BYTES per row."""
+    from catprint.raster import PackedRaster
+    from catprint.render import VStack
+
+    if isinstance(img, VStack):
+        img = img.packed()
+    if isinstance(img, PackedRaster):
+        return img.tobytes()
+    assert img.width == PRINTER_WIDTH, f"Image width must be {PRINTER_WIDTH} pixels"
+    if img.mode != "1":
+        img = img.convert("RGB").convert("1")
+    return img.tobytes().translate(_PRINTER_ORDER)
+
+
+def unpack(raster: bytes) -> PIL.Image.Image:
+    """Inverse of pack: turn printer-order raster rows back into a mode "1" image."""
+    # inverting and reversing bits commute, so the table is its own inverse
+    return PIL.Image.frombytes("1", (PRINTER_WIDTH, len(raster) // ROW_BYTES), bytes(raster).translate(_PRINTER_ORDER))
+
+
+def checksum(data: bytes) -> int:
+    """CRC8 of a frame payload, as carried by Command.format."""
+    crc = 0
+    for b in data:
+        crc = _CRC8_TABLE[crc ^ b]
+    return crc
+
+
+def crc8_rows(raster: bytes, width: int = ROW_BYTES) -> bytes:
+    """CRC8 of every `width`-byte row of `raster`, one byte per row.
+
+    Instead of walking each row byte by byte, the running CRCs of all rows are
+    advanced together one column at a time with a big-int XOR and a table translate.
+    """
+    rows = len(raster) // width
+    if not rows:
+        return b""
+    crc = bytes(rows)
+    for col in range(width):
+        mixed = int.from_bytes(crc, "big") ^ int.from_bytes(raster[col::width], "big")
+        crc = mixed.to_bytes(rows, "big").translate(_CRC8_TABLE)
+    return crc
+
+
+@dataclasses.dataclass
+class EncodeStats:
+    """Size accounting for one encoded job."""
+
+    rows: int = 0
+    blank_rows: int = 0
+    compressed_rows: int = 0
+    # bytes the rows would take as plain DRAW_BITMAP frames vs what was emitted
+    raw_bytes: int = 0
+    encoded_bytes: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.raw_bytes - self.encoded_bytes
+
+
+_BLANK_ROW = bytes(ROW_BYTES)
+
+
+def _bitmap_frames(raster: bytes) -> bytes:
+    rows = len(raster) // ROW_BYTES
+    frame = _BITMAP_FRAME
+    out = bytearray((_BITMAP_HEADER + bytes(ROW_BYTES + 2)) * rows)
+    offset = len(_BITMAP_HEADER)
+    for col in range(ROW_BYTES):
+        out[offset + col :: frame] = raster[col::ROW_BYTES]
+    out[offset + ROW_BYTES :: frame] = crc8_rows(raster)
+    return bytes(out)
+
+
+def _feed_frames(rows: int) -> bytes:
+    return b"".join(Command.FEED_PAPER.format(min(n, 0xFFFF)) for n in range(rows, 0, -0xFFFF))
+
+
+def _blank_runs(raster: bytes) -> typing.Iterator[tuple[int, int, bool]]:
+    """Yield (start, stop, blank) row ranges covering `raster`."""
+    rows = len(raster) // ROW_BYTES
+    start = 0
+    blank = False
+    for row in range(rows):
+        is_blank = raster[row * ROW_BYTES : (row + 1) * ROW_BYTES] == _BLANK_ROW
+        if is_blank != blank and row > start:
+            yield start, row, blank
+            start = row
+        blank = is_blank
+    if rows > start:
+        yield start, rows, blank
+
+
+# printer-order byte -> its 8 pixels left to right, "1" = black
+_PIXELS = [format(b, "08b")[::-1] for b in range(256)]
+_RUNS = re.compile(r"0+|1+")
+
+
+def rle_encode_row(line: bytes) -> bytes:
+    """Run-length encode one packed raster row for DRAW_COMPRESSED_BITMAP.
+
+    Each output byte is one run: bit 7 is the colour (1 = black), bits 0-6 the length.
+    """
+    out = bytearray()
+    for run in _RUNS.finditer("".join([_PIXELS[b] for b in line])):
+        color = 0x80 if run.group()[0] == "1" else 0
+        n = run.end() - run.start()
+        while n > 0x7F:
+            out.append(color | 0x7F)
+            n -= 0x7F
+        out.append(color | n)
+    return bytes(out)
+
+
+def rle_decode_row(data: bytes, width: int = PRINTER_WIDTH) -> bytes:
+    """Inverse of rle_encode_row, returning the packed raster row."""
+    pixels = "".join(("1" if b & 0x80 else "0") * (b & 0x7F) for b in data)
+    if len(pixels) != width:
+        raise ValueError(f"Compressed row decodes to {len(pixels)} pixels, expected {width}")
+    return bytes(int(pixels[i : i + 8][::-1], 2) for i in range(0, width, 8))
+
+
+def _compressed_frames(raster: bytes) -> tuple[bytes, int]:
+    """Frame rows compressed where that is shorter than raw, keeping raw rows in bulk."""
+    parts = []
+    compressed = 0
+    raw_start = 0
+    rows = len(raster) // ROW_BYTES
+    for row in range(rows):
+        rle = rle_encode_row(raster[row * ROW_BYTES : (row + 1) * ROW_BYTES])
+        if len(rle) < ROW_BYTES:
+            parts.append(_bitmap_frames(raster[raw_start * ROW_BYTES : row * ROW_BYTES]))
+            parts.append(Command.DRAW_COMPRESSED_BITMAP.format(rle))
+            compressed += 1
+            raw_start = row + 1
+    parts.append(_bitmap_frames(raster[raw_start * ROW_BYTES :]))
+    return b"".join(parts), compressed
+
+
+def encode_rows(
+    raster: bytes, *, feed_blank: bool = False, compress: bool = False, stats: EncodeStats | None = None
+) -> bytes:
+    """Frame packed raster rows as DRAW_BITMAP commands in bulk.
+
+    With `feed_blank`, every run of all-white rows is sent as a single FEED_PAPER
+    command instead. With `compress`, rows whose run-length encoding is shorter
+    than the raw line are sent as DRAW_COMPRESSED_BITMAP. If `stats` is given it
+    is updated with the job's row and byte counts.
+    """
+    frames = _compressed_frames if compress else lambda rows: (_bitmap_frames(rows), 0)
+    blank_rows = 0
+    if not feed_blank:
+        data, compressed = frames(raster)
+    else:
+        parts = []
+        compressed = 0
+        for start, stop, blank in _blank_runs(raster):
+            if blank:
+                parts.append(_feed_frames(stop - start))
+                blank_rows += stop - start
+            else:
+                part, n = frames(raster[start * ROW_BYTES : stop * ROW_BYTES])
+                parts.append(part)
+                compressed += n
+        data = b"".join(parts)
+    if stats is not None:
+        rows = len(raster) // ROW_BYTES
+        stats.rows += rows
+        stats.blank_rows += blank_rows
+        stats.compressed_rows += compressed
+        stats.raw_bytes += rows * _BITMAP_FRAME
+        stats.encoded_bytes += len(data)
+    return data
+
+
+def preamble() -> bytes:
+    """Commands that put the printer into image printing mode."""
+    return b"".join(
+        (
+            Command.SET_QUALITY.format(b"\x33"),
+            Command.CONTROL_LATTICE.format(Command.Lattice.PRINT.value),
+            Command.SET_ENERGY.format(17500),
+            Command.DRAWING_MODE.format(b"\x00"),
+            Command.OTHER_FEED_PAPER.format(b"\0x23"),
+        )
+    )
+
+
+def postamble() -> bytes:
+    """Commands that end a print job and feed the paper out."""
+    return Command.CONTROL_LATTICE.format(Command.Lattice.FINISH.value) + Command.FEED_PAPER.format(50)
+
+
+def encode(
+    img: PIL.Image.Image, *, feed_blank: bool = False, compress: bool = False, stats: EncodeStats | None = None
+) -> bytes:
+    """Encode `img` into the full command stream for one print job."""
+    return b"".join(
+        (
+            preamble(),
+            encode_rows(pack(img), feed_blank=feed_blank, compress=compress, stats=stats),
+            postamble(),
+        )
+    )
+
+
+# rows per unit of progress tracking; resumed jobs restart on a band boundary
+BAND_ROWS = 64
+
+# rows re-sent before the last acknowledged one when resuming, covering lines
+# that were written but lost with the link
+DEFAULT_RESUME_OVERLAP = 4
+
+
+@dataclasses.dataclass
+class PrintJob:
+    """A packed raster plus how far it got, so it can resume after a disconnect."""
+
+    raster: bytes
+    feed_blank: bool = False
+    compress: bool = False
+    # raster rows whose frames were fully written to the printer
+    rows_acked: int = 0
+    stats: EncodeStats = dataclasses.field(default_factory=EncodeStats)
+
+    @property
+    def rows(self) -> int:
+        return len(self.raster) // ROW_BYTES
+
+    def bands(
+        self, start_row: int = 0, stop_row: int | None = None, stats: EncodeStats | None = None
+    ) -> typing.Iterator[tuple[bytes, int]]:
+        """Encode rows `start_row:stop_row` band by band, yielding (frames, end row)."""
+        stop_row = self.rows if stop_row is None else stop_row
+        for band in range(start_row, stop_row, BAND_ROWS):
+            end = min(band + BAND_ROWS, stop_row)
+            part = encode_rows(
+                self.raster[band * ROW_BYTES : end * ROW_BYTES],
+                feed_blank=self.feed_blank,
+                compress=self.compress,
+                stats=stats,
+            )
+            yield part, end
+
+    def stream(self, start_row: int = 0) -> tuple[bytes, list[int], list[int]]:
+        """Encode rows from `start_row` on, with preamble and postamble.
+
+        Returns the data plus parallel lists of band end offsets in the data and
+        the raster row each band ends at, for `track`.
+        """
+        head = preamble()
+        parts = [head]
+        offsets = []
+        rows = []
+        offset = len(head)
+        # only the first full encode counts towards the job's stats
+        stats = self.stats if start_row == 0 and not self.stats.rows else None
+        for part, end in self.bands(start_row, stats=stats):
+            parts.append(part)
+            offset += len(part)
+            offsets.append(offset)
+            rows.append(end)
+        parts.append(postamble())
+        return b"".join(parts), offsets, rows
+
+    def track(self, offsets: list[int], rows: list[int]) -> typing.Callable[[int], None]:
+        """Return a `send` progress callback that advances `rows_acked`."""
+
+        def progress(sent: int) -> None:
+            done = bisect.bisect_right(offsets, sent)
+            if done:
+                self.rows_acked = max(self.rows_acked, rows[done - 1])
+
+        return progress
+
+
+# in-memory budget of the shared job cache, in bytes of encoded command stream
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_CACHE_DISK_BYTES = 256 * 1024 * 1024
+
+# magic, bands, then the EncodeStats counters
+_CACHE_HEADER = struct.Struct("<4sI5Q")
+_CACHE_MAGIC = b"CPJ1"
+
+
+class JobCache:
+    """Bounded LRU of encoded print jobs, keyed by raster content and settings.
+
+    An entry is the output of `PrintJob.stream()` (command stream, band offsets
+    and rows) plus the job's EncodeStats, so a repeat job skips framing, CRCs
+    and compression and goes straight to the transport. With `directory`,
+    entries are also written there and survive restarts; the disk tier is
+    trimmed oldest-first to `max_disk_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        directory: str | os.PathLike | None = None,
+        max_disk_bytes: int = DEFAULT_CACHE_DISK_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: collections.OrderedDict[str, tuple] = collections.OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(job: PrintJob) -> str:
+        """Content hash of the job's raster and everything that affects its encoding."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(preamble())
+        h.update(bytes([job.feed_blank, job.compress]))
+        h.update(job.raster)
+        return h.hexdigest()
+
+    def get(self, key: str) -> tuple[bytes, list[int], list[int], EncodeStats] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            entry = self._load(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        data, offsets, rows, stats = entry
+        return data, list(offsets), list(rows), dataclasses.replace(stats)
+
+    def put(self, key: str, data: bytes, offsets: list[int], rows: list[int], stats: EncodeStats) -> None:
+        entry = (data, tuple(offsets), tuple(rows), dataclasses.replace(stats))
+        self._remember(key, entry)
+        if self.directory is not None:
+            try:
+                self._store(key, entry)
+            except OSError as e:
+                _LOG.warning("Could not write job cache entry %s: %s", key, e)
+
+    def stream(self, job: PrintJob) -> tuple[bytes, list[int], list[int]]:
+        """`job.stream()`, served from the cache when the same job was encoded before."""
+        key = self.key(job)
+        cached = self.get(key)
+        if cached is not None:
+            data, offsets, rows, job.stats = cached
+            return data, offsets, rows
+        data, offsets, rows = job.stream()
+        self.put(key, data, offsets, rows, job.stats)
+        return data, offsets, rows
+
+    def clear(self) -> None:
+        """Drop the in-memory tier; the disk tier is left alone."""
+        self._entries.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key)[0])
+        self._entries[key] = entry
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted[0])
+            self.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.job"
+
+    def _store(self, key: str, entry: tuple) -> None:
+        data, offsets, rows, stats = entry
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = _CACHE_HEADER.pack(
+            _CACHE_MAGIC, len(offsets),
+            stats.rows, stats.blank_rows, stats.compressed_rows, stats.raw_bytes, stats.encoded_bytes,
+        )
+        bands = struct.pack(f"<{2 * len(offsets)}Q", *offsets, *rows)
+        tmp = self._path(key).with_suffix(".tmp")
+        tmp.write_bytes(header + bands + data)
+        os.replace(tmp, self._path(key))
+        self._trim_disk()
+
+    def _load(self, key: str) -> tuple | None:
+        if self.directory is None:
+            return None
+        try:
+            blob = self._path(key).read_bytes()
+            magic, n, *counts = _CACHE_HEADER.unpack_from(blob)
+            if magic != _CACHE_MAGIC:
+                return None
+            bands = struct.unpack_from(f"<{2 * n}Q", blob, _CACHE_HEADER.size)
+        except (OSError, struct.error):
+            return None
+        data = blob[_CACHE_HEADER.size + 16 * n :]
+        return data, bands[:n], bands[n:], EncodeStats(*counts)
+
+    def _trim_disk(self) -> None:
+        files = sorted(self.directory.glob("*.job"), key=lambda f: f.stat().st_mtime)
+        total = sum(f.stat().st_size for f in files)
+        for f in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= f.stat().st_size
+            f.unlink(missing_ok=True)
+
+
+_cache: JobCache | None = None
+
+
+def get_cache() -> JobCache:
+    """Return the process-wide job cache (memory only unless `set_cache` replaced it)."""
+    global _cache
+    if _cache is None:
+        _cache = JobCache()
+    return _cache
+
+
+def set_cache(cache: JobCache) -> None:
+    global _cache
+    _cache = cache
+
+
+@dataclasses.dataclass
+class Capabilities:
+    """Protocol features a printer unit understands; unknown units get none."""
+
+    compressed_bitmap: bool = False
+
+
+# keyed by printer address or device name; addresses take precedence. Only
+# models known to accept compressed bitmap lines (0xbf) are listed here.
+_capabilities: dict[str, Capabilities] = {"MX06": Capabilities(compressed_bitmap=True)}
+
+
+def set_capabilities(key: str, caps: Capabilities) -> None:
+    """Register capabilities for a printer address or model name (e.g. "MX06")."""
+    _capabilities[key] = caps
+
+
+def get_capabilities(device) -> Capabilities:
+    for key in (getattr(device, "address", None), getattr(device, "name", None)):
+        if key in _capabilities:
+            return _capabilities[key]
+    return Capabilities()
+
+
 async def select_printer() -> typing.Any:
     """Scan for available printers and let the user choose one."""
     import builtins
@@ -114,83 +605,831 @@ async def select_printer() -> typing.Any:
             sys.exit(0)
 
 
-async def print(img: PIL.Image.Image, device=None, keep_alive_callback=None) -> None:
+PRINT_CHARACTERISTIC = "0000AE01-0000-1000-8000-00805F9B34FB"
+
+# chunk size when the link doesn't report an MTU, and the ATT header taken from it
+DEFAULT_CHUNK_SIZE = 64
+_ATT_HEADER = 3
+
+
+def write_plan(client) -> tuple[int, bool]:
+    """Return (chunk size, with response) for writes to the print characteristic.
+
+    Chunks fill the negotiated MTU, and write-without-response is used whenever the
+    characteristic allows it.
+    """
+    size = None
+    response = True
+    try:
+        char = client.services.get_characteristic(PRINT_CHARACTERISTIC)
+    except Exception:
+        char = None
+    if char is not None and "write-without-response" in getattr(char, "properties", ()):
+        response = False
+        size = getattr(char, "max_write_without_response_size", None)
+    mtu = getattr(client, "mtu_size", None)
+    if not size and mtu:
+        size = mtu - _ATT_HEADER
+    return size or DEFAULT_CHUNK_SIZE, response
+
+
+class Pacer:
+    """Adaptive delay between writes.
+
+    Writes that take much longer than the fastest one seen mean the link (or the
+    printer behind it) is congested: the delay backs off multiplicatively, then
+    decays back towards `min_delay` while writes stay fast.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 0.0,
+        max_delay: float = 0.1,
+        backoff: float = 2.0,
+        decay: float = 0.75,
+        slow_factor: float = 3.0,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.decay = decay
+        self.slow_factor = slow_factor
+        self.delay = min_delay
+        self.fastest: float | None = None
+        self.backoffs = 0
+
+    def record(self, elapsed: float) -> None:
+        if self.fastest is None or elapsed < self.fastest:
+            self.fastest = elapsed
+        if elapsed > self.fastest * self.slow_factor + 0.001:
+            self.delay = min(self.max_delay, max(self.delay * self.backoff, 0.005))
+            self.backoffs += 1
+        else:
+            self.delay = self.delay * self.decay
+            if self.delay < 0.0005:
+                self.delay = 0.0
+            self.delay = max(self.min_delay, self.delay)
+
+    async def wait(self) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+
+NOTIFY_CHARACTERISTIC = "0000AE02-0000-1000-8000-00805F9B34FB"
+
+# how long to honour a pause before assuming the resume notification was lost
+RESUME_TIMEOUT = 10.0
+
+
+@dataclasses.dataclass
+class Notification:
+    command: int
+    payload: bytes
+
+
+def parse_notification(data: bytes) -> Notification | None:
+    """Parse a frame from the notify characteristic (same framing as Command.format)."""
+    data = bytes(data)
+    if len(data) < 6 or data[:2] != b"Qx":
+        return None
+    length = data[4]
+    return Notification(data[2], data[6 : 6 + length])
+
+
+@dataclasses.dataclass
+class DeviceState:
+    """Status flags from a GET_DEV_STATE reply."""
+
+    out_of_paper: bool = False
+    cover_open: bool = False
+    overheated: bool = False
+    low_battery: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "DeviceState":
+        status = payload[0] if payload else 0
+        return cls(bool(status & 0x01), bool(status & 0x02), bool(status & 0x04), bool(status & 0x08))
+
+    @property
+    def ok(self) -> bool:
+        return not (self.out_of_paper or self.cover_open or self.overheated)
+
+
+class FlowControl:
+    """Notification handler tracking the printer's flow-control and state messages.
+
+    Pass an instance as the `start_notify` callback; `send` then waits on it
+    whenever the printer reports that its buffer is full.
+    """
+
+    def __init__(self):
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self.state: DeviceState | None = None
+        self.pauses = 0
+
+    @property
+    def paused(self) -> bool:
+        return not self._ready.is_set()
+
+    def __call__(self, sender, data: bytes) -> None:
+        note = parse_notification(data)
+        if note is None:
+            _LOG.debug("Ignoring notification %s", bytes(data).hex())
+        elif note.command == Command.FLOW_CONTROL.value[0]:
+            if note.payload[:1] == b"\x00":
+                self._ready.set()
+            else:
+                if self._ready.is_set():
+                    self.pauses += 1
+                self._ready.clear()
+        elif note.command == Command.GET_DEV_STATE.value[0]:
+            self.state = DeviceState.from_payload(note.payload)
+            if not self.state.ok:
+                _LOG.warning("Printer reports %s", self.state)
+
+    async def wait(self, timeout: float = RESUME_TIMEOUT) -> None:
+        if self._ready.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            _LOG.warning("No resume from printer after %.1f s, continuing", timeout)
+            self._ready.set()
+
+
+async def start_flow_control(client) -> FlowControl | None:
+    """Subscribe to the printer's notifications and request its state.
+
+    Returns None when the client can't notify; sending then relies on pacing alone.
+    """
+    # BleakClient has no `notifies`; transports without notifications say so
+    if not getattr(client, "notifies", True):
+        return None
+    flow = FlowControl()
+    try:
+        await client.start_notify(NOTIFY_CHARACTERISTIC, flow)
+    except Exception as e:
+        _LOG.debug("Notifications unavailable, sending without flow control: %s", e)
+        return None
+    await client.write_gatt_char(PRINT_CHARACTERISTIC, Command.GET_DEV_STATE.format(b"\x00"))
+    return flow
+
+
+async def stop_flow_control(client, flow: FlowControl | None) -> None:
+    if flow is None:
+        return
+    try:
+        await client.stop_notify(NOTIFY_CHARACTERISTIC)
+    except Exception as e:
+        _LOG.debug("stop_notify failed: %s", e)
+
+
+async def send(
+    client,
+    data: bytes,
+    pacer: Pacer | None = None,
+    flow: FlowControl | None = None,
+    progress: typing.Callable[[int], None] | None = None,
+) -> None:
+    """Stream `data` to the print characteristic in MTU-sized, paced chunks.
+
+    With `flow`, writing pauses while the printer reports a full buffer.
+    `progress` is called with the number of bytes written after every write.
+    """
+    size, response = write_plan(client)
+    # older clients (and test doubles) don't take the keyword; with-response is their default
+    kwargs = {} if response else {"response": False}
+    if pacer is None:
+        pacer = Pacer()
+    for offset in range(0, len(data), size):
+        if flow is not None:
+            await flow.wait()
+        start = time.perf_counter()
+        await client.write_gatt_char(PRINT_CHARACTERISTIC, data[offset : offset + size], **kwargs)
+        pacer.record(time.perf_counter() - start)
+        if progress is not None:
+            progress(min(offset + size, len(data)))
+        await pacer.wait()
+
+
+# idle BLE links are closed after this many seconds without a print job
+DEFAULT_IDLE_TTL = 30.0
+
+# BlueZ rejects overlapping connect requests, so only this many run at a time;
+# data transfers to already connected printers are not limited
+MAX_CONCURRENT_CONNECTS = 1
+
+
+@dataclasses.dataclass
+class _Link:
+    client: typing.Any
+    stack: contextlib.AsyncExitStack
+    last_used: float
+    expiry: asyncio.TimerHandle | None = None
+
+
+def open_client(device):
+    """Return an unconnected client for `device`: a BleakClient, or the
+    file/TCP transport named by a `file://` or `tcp://` address."""
+    return transport.for_address(str(device.address)) or BleakClient(device)
+
+
+class ConnectionPool:
+    """Keep BLE clients alive between print jobs, keyed by printer address.
+
+    A link is health-checked before reuse and dropped whenever a job fails on it,
+    so the next job transparently reconnects. Links unused for `idle_ttl` seconds
+    are disconnected. Jobs for one address are serialized, jobs for different
+    addresses only contend for the `max_connects` connect slots. Clients whose
+    `poolable` is false (file sinks) are opened and closed for every job.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_connects: int = MAX_CONCURRENT_CONNECTS,
+        factory: typing.Callable[[typing.Any], typing.Any] | None = None,
+    ):
+        self.idle_ttl = idle_ttl
+        self.max_connects = max_connects
+        # builds an unconnected client (async context manager) for a device
+        self.factory = factory or open_client
+        self._connect_slots: asyncio.Semaphore | None = None
+        self._links: dict[str, _Link] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # clients from a previous (closed) loop can't be reused or even closed
+            self._loop = loop
+            self._links.clear()
+            self._locks.clear()
+            self._tasks.clear()
+            self._connect_slots = asyncio.Semaphore(self.max_connects)
+
+    def _lock_for(self, address: str) -> asyncio.Lock:
+        lock = self._locks.get(address)
+        if lock is None:
+            lock = self._locks[address] = asyncio.Lock()
+        return lock
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._links
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    @contextlib.asynccontextmanager
+    async def connection(self, device) -> typing.AsyncIterator[typing.Any]:
+        """Yield a connected client for `device`, holding it exclusively for one job."""
+        self._bind_loop()
+        address = device.address
+        async with self._lock_for(address):
+            link = self._links.get(address)
+            if link is not None:
+                if link.expiry is not None:
+                    link.expiry.cancel()
+                    link.expiry = None
+                if not getattr(link.client, "is_connected", True):
+                    _LOG.info("Pooled link to %s went stale, reconnecting", address)
+                    await self._discard(address)
+                    link = None
+            if link is None:
+                stack = contextlib.AsyncExitStack()
+                # only the connect itself is serialized, not the transfer
+                async with self._connect_slots:
+                    client = await stack.enter_async_context(self.factory(device))
+                if not getattr(client, "poolable", True):
+                    # file sinks: one connection per job, closed (and flushed) with it
+                    async with stack:
+                        yield client
+                    return
+                link = self._links[address] = _Link(client, stack, time.monotonic())
+            try:
+                yield link.client
+            except BaseException:
+                await self._discard(address)
+                raise
+            link.last_used = time.monotonic()
+            link.expiry = self._loop.call_later(self.idle_ttl, self._expire, address)
+
+    def _expire(self, address: str) -> None:
+        task = asyncio.ensure_future(self._close_if_idle(address))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _close_if_idle(self, address: str) -> None:
+        lock = self._lock_for(address)
+        if lock.locked():
+            return
+        async with lock:
+            link = self._links.get(address)
+            if link is not None and time.monotonic() - link.last_used >= self.idle_ttl:
+                _LOG.info("Closing idle link to %s", address)
+                await self._discard(address)
+
+    async def _discard(self, address: str) -> None:
+        link = self._links.pop(address, None)
+        if link is None:
+            return
+        if link.expiry is not None:
+            link.expiry.cancel()
+        try:
+            await link.stack.aclose()
+        except Exception as e:
+            _LOG.debug("Error closing link to %s: %s", address, e)
+
+    async def close(self) -> None:
+        """Disconnect every pooled link."""
+        for address in list(self._links):
+            await self._discard(address)
+
+
+_pool: ConnectionPool | None = None
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide pool shared by the API server and the Streamlit app."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool()
+    return _pool
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def run(coro: typing.Awaitable) -> typing.Any:
+    """Run `coro` on a long-lived background event loop and wait for the result.
+
+    Synchronous callers (the Streamlit app) should use this instead of `asyncio.run`,
+    which closes its loop and with it every pooled BLE link.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="catprint-ble", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+@contextlib.asynccontextmanager
+async def _session(client, keep_alive_callback=None):
+    """Run the keep-alive callback and flow control for one print job on `client`.
+
+    Yields the job's FlowControl (None if the client can't notify).
+    """
+
+    # Periodically call the keep-alive callback if provided
+    async def _keep_alive_task():
+        try:
+            while True:
+                try:
+                    if keep_alive_callback:
+                        await keep_alive_callback()
+                except Exception as e:
+                    _LOG.debug("Keep-alive callback failed: %s", e)
+                await asyncio.sleep(8)
+        except asyncio.CancelledError:
+            return
+
+    keepalive = asyncio.create_task(_keep_alive_task())
+    try:
+        flow = await start_flow_control(client)
+        try:
+            yield flow
+        finally:
+            await stop_flow_control(client, flow)
+    finally:
+        keepalive.cancel()
+        try:
+            await keepalive
+        except (asyncio.CancelledError, Exception):
+            # also raised when the task is cancelled before it ever ran
+            pass
+
+
+async def print(
+    img: "PIL.Image.Image | PackedRaster | VStack",
+    device=None,
+    keep_alive_callback=None,
+    *,
+    pool: ConnectionPool | None = None,
+    cache: JobCache | None = None,
+    feed_blank: bool = False,
+    compress: bool = False,
+    retries: int = 3,
+    resume_overlap: int = DEFAULT_RESUME_OVERLAP,
+) -> EncodeStats:
     """
     Print image to device.
     Args:
-        img: PIL Image to print
+        img: PIL Image (or catprint.raster.PackedRaster, render.VStack) to print
         device: BLE device to print to
         keep_alive_callback: Optional async callback to periodically send keep-alive signals
+        pool: Connection pool to reuse links from (defaults to the shared pool)
+        cache: Cache of encoded jobs to reuse (defaults to the shared cache)
+        feed_blank: Send runs of blank rows as paper feeds instead of empty bitmap lines
+        compress: Run-length encode bitmap lines, if the printer's Capabilities allow it
+        retries: Connection attempts; a job interrupted mid-transfer resumes from the
+            last acknowledged row (minus `resume_overlap` rows) instead of the top
+    Returns the job's EncodeStats (rows, bytes saved).
     """
     assert img.width == PRINTER_WIDTH, f"Image width must be {PRINTER_WIDTH} pixels"
 
-    data = b"".join(
-        (
-            Command.SET_QUALITY.format(b"\x33"),
-            Command.CONTROL_LATTICE.format(b"\xaa\x55\x17\x38\x44\x5f\x5f\x5f\x44\x38\x2c"),
-            Command.SET_ENERGY.format(17500),
-            Command.DRAWING_MODE.format(b"\x00"),
-            Command.OTHER_FEED_PAPER.format(b"\0x23"),
-            *(
-                Command.DRAW_BITMAP.format(bytes(reversed(chunk)))
-                for chunk in batched(
-                    img.convert("RGB")
-                    .convert("1")
-                    .point(lambda p: 255 - p)
-                    .transpose(FLIP_LEFT_RIGHT if FLIP_LEFT_RIGHT is not None else PIL.Image.FLIP_LEFT_RIGHT)
-                    .tobytes(),
-                    PRINTER_WIDTH // 8,
-                )
-            ),
-            Command.CONTROL_LATTICE.format(b"\xaa\x55\x17\x00\x00\x00\x00\x00\x00\x00\x17"),
-            Command.FEED_PAPER.format(50),
-        )
-    )
-
     if device is None:
         device = await select_printer()
+
+    compress = compress and get_capabilities(device).compressed_bitmap
+    job = PrintJob(pack(img), feed_blank=feed_blank, compress=compress)
+    if cache is None:
+        cache = get_cache()
+    data, offsets, rows = cache.stream(job)
+    stats = job.stats
+    _LOG.info(
+        "Encoded %d rows (%d blank, %d compressed) into %d bytes, saved %d bytes",
+        stats.rows, stats.blank_rows, stats.compressed_rows, len(data), stats.bytes_saved,
+    )
     builtins.print(f"\nConnecting to {device.name} ({device.address})...")
 
-    lock = _get_connect_lock()
-    # retry transient DBus failures
-    retries = 3
+    if pool is None:
+        pool = get_pool()
+    # retry transient DBus failures and links dropped mid-transfer
     for attempt in range(retries):
         try:
-            async with lock:
-                async with BleakClient(device) as client:
-                    _LOG.info("Connected to %s, printing...", device.address)
-
-                    # Periodically call the keep-alive callback if provided
-                    async def _keep_alive_task():
-                        try:
-                            while True:
-                                try:
-                                    if keep_alive_callback:
-                                        await keep_alive_callback()
-                                except Exception as e:
-                                    _LOG.debug("Keep-alive callback failed: %s", e)
-                                await asyncio.sleep(8)
-                        except asyncio.CancelledError:
-                            return
-
-                    keepalive = asyncio.create_task(_keep_alive_task())
-                    try:
-                        for chunk in batched(data, n=64):
-                            await client.write_gatt_char(
-                                "0000AE01-0000-1000-8000-00805F9B34FB", bytearray(chunk)
-                            )
-                            await asyncio.sleep(0.025)
-                        _LOG.info("Print job sent successfully!")
-                    finally:
-                        keepalive.cancel()
-                        try:
-                            await keepalive
-                        except Exception:
-                            pass
+            async with pool.connection(device) as client, _session(client, keep_alive_callback) as flow:
+                _LOG.info("Connected to %s, printing...", device.address)
+                await send(client, data, flow=flow, progress=job.track(offsets, rows))
+                _LOG.info("Print job sent successfully!")
             break
-        except BleakDBusError as e:
-            _LOG.warning("BleakDBusError on connect: %s (attempt %s/%s)", e, attempt + 1, retries)
+        except (BleakError, OSError, asyncio.TimeoutError) as e:
+            _LOG.warning(
+                "%s after %d/%d rows: %s (attempt %s/%s)",
+                type(e).__name__, job.rows_acked, job.rows, e, attempt + 1, retries,
+            )
             if attempt < retries - 1:
                 await asyncio.sleep(0.5 * (attempt + 1))
+                start_row = max(job.rows_acked - resume_overlap, 0)
+                data, offsets, rows = job.stream(start_row)
                 continue
             raise
+    return stats
+
+
+# encoded bands buffered between the encoder and the link; rendering stays as many
+# bands ahead of the encoder, so with the packed raster (48 bytes per row, kept for
+# resuming) this bounds a streamed job's memory
+DEFAULT_STREAM_QUEUE = 8
+
+
+@dataclasses.dataclass
+class StreamStats(EncodeStats):
+    pages: int = 0
+    # seconds from the start of the job until its first band was written
+    first_line_after: float | None = None
+
+
+def pack_page(page: "PIL.Image.Image | PackedRaster | VStack | bytes") -> bytes:
+    """Pack one page, scaled to the printer width like render.stack would.
+
+    Pages that are already packed rasters (e.g. from catprint.workers) pass through.
+    """
+    if isinstance(page, (bytes, bytearray, memoryview)):
+        return page
+    if isinstance(page, PIL.Image.Image) and page.width != PRINTER_WIDTH:
+        page = page.resize((PRINTER_WIDTH, int(page.height * PRINTER_WIDTH / page.width)))
+    return pack(page)
+
+
+async def _encode_pages(
+    pages: typing.Iterable[PIL.Image.Image | bytes], job: PrintJob, queue: asyncio.Queue, cache: JobCache | None = None
+) -> None:
+    """Render and pack `pages` off the event loop, queueing the job's bands as
+    (frames, end row) as soon as they are complete, then None.
+
+    Rendering stays about a queue's worth of bands ahead of encoding, which
+    only fills the queue's free slots. Once the raster is complete it is
+    looked up in `cache`: on a hit the bands not yet encoded come from there.
+    On a miss the job is stored if it is no longer than the queue; longer jobs
+    are not, so no more than a queue's worth of bands is held for the cache.
+    """
+    from catprint.render import VStack
+
+    window = max(queue.maxsize, 1)
+    grew, room = asyncio.Event(), asyncio.Event()
+    encoded = 0
+
+    async def ahead(it: typing.Iterator) -> typing.Any:
+        """next(it) in a worker thread, once the encoder is within the window."""
+        while job.rows - encoded >= window * BAND_ROWS:
+            room.clear()
+            await room.wait()
+        return await asyncio.to_thread(next, it, None)
+
+    def append(part) -> None:
+        # a spooled raster writes to its file here, off the event loop
+        job.raster += pack_page(part)
+
+    async def render() -> None:
+        try:
+            it = iter(pages)
+            while (page := await ahead(it)) is not None:
+                # a lazy render.VStack is packed and sent a part at a time
+                parts = page.pages() if isinstance(page, VStack) else iter([page])
+                while (part := await ahead(parts)) is not None:
+                    await asyncio.to_thread(append, part)
+                    grew.set()
+                job.stats.pages += 1
+        finally:
+            grew.set()
+
+    renderer = asyncio.create_task(render())
+    # the job's bands as (frames, end row), kept for the cache while it is no longer than the queue
+    kept: list[tuple[bytes, int]] | None = [] if cache is not None else None
+    complete = False
+    try:
+        while True:
+            if not complete and renderer.done() and renderer.exception() is None:
+                complete = True
+                # every row is in; a spooled job can be resumed from its file from now on
+                getattr(job.raster, "finish", lambda: None)()
+                if cache is not None:
+                    key = await asyncio.to_thread(cache.key, job)
+                    cached = cache.get(key)
+                    if cached is not None and await _queue_cached(cached, encoded, job, queue):
+                        kept = None
+                        break
+            # bands on the same boundaries as PrintJob.stream, so the stream is identical
+            full = job.rows if complete else job.rows - job.rows % BAND_ROWS
+            if encoded < full:
+                # only as many bands as the queue takes; the rest may come from the cache
+                stop = min(encoded + max(queue.maxsize - queue.qsize(), 1) * BAND_ROWS, full)
+                for band in await asyncio.to_thread(list, job.bands(encoded, stop, job.stats)):
+                    if kept is not None:
+                        kept.append(band)
+                        if len(kept) > window:
+                            kept = None
+                    await queue.put(band)
+                encoded = stop
+                room.set()
+            elif complete:
+                break
+            elif renderer.done():
+                # surfaces rendering errors once everything rendered before them is queued
+                renderer.result()
+            else:
+                await grew.wait()
+                grew.clear()
+        if kept is not None:
+            head = preamble()
+            offsets = list(itertools.accumulate((len(part) for part, _ in kept), initial=len(head)))[1:]
+            data = b"".join([head, *(part for part, _ in kept), postamble()])
+            cache.put(key, data, offsets, [end for _, end in kept], _encode_counters(job.stats))
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        await queue.put(None)
+        raise
+    finally:
+        renderer.cancel()
+    await queue.put(None)
+
+
+async def _queue_cached(cached: tuple, start_row: int, job: PrintJob, queue: asyncio.Queue) -> bool:
+    """Queue the bands of a cached job from `start_row` on, taking its stats.
+
+    Returns False, queueing nothing, if no cached band ends at `start_row`.
+    """
+    data, offsets, rows, stats = cached
+    first = bisect.bisect_right(rows, start_row)
+    if first and rows[first - 1] != start_row:
+        return False
+    begin = offsets[first - 1] if first else len(preamble())
+    for end, row in zip(offsets[first:], rows[first:]):
+        await queue.put((data[begin:end], row))
+        begin = end
+    for field in dataclasses.fields(EncodeStats):
+        setattr(job.stats, field.name, getattr(stats, field.name))
+    return True
+
+
+def _encode_counters(stats: EncodeStats) -> EncodeStats:
+    """The EncodeStats part of `stats` (e.g. of a StreamStats)."""
+    return EncodeStats(**{field.name: getattr(stats, field.name) for field in dataclasses.fields(EncodeStats)})
+
+
+async def print_stream(
+    pages: typing.Iterable[PIL.Image.Image | bytes],
+    device=None,
+    keep_alive_callback=None,
+    *,
+    pool: ConnectionPool | None = None,
+    cache: JobCache | None = None,
+    feed_blank: bool = False,
+    compress: bool = False,
+    retries: int = 3,
+    resume_overlap: int = DEFAULT_RESUME_OVERLAP,
+    queue_size: int = DEFAULT_STREAM_QUEUE,
+    progress: typing.Callable[[int, int], None] | None = None,
+    spool: str | os.PathLike | None = None,
+) -> StreamStats:
+    """
+    Print `pages` as one job, transmitting while later pages are still rendering.
+    Args:
+        pages: Iterable of page images or packed rasters, e.g. receipt.iter_blocks(...);
+            it is consumed in a worker thread, so rendering happens there and not on
+            the event loop
+        cache: Cache of encoded jobs (defaults to the shared cache). Once the last
+            page is in, the rest of a job that was printed before is sent from
+            the cache. New jobs of up to `queue_size` bands are stored; longer
+            and spooled jobs are not
+        queue_size: Encoded bands buffered ahead of the link, and how many bands
+            rendering may run ahead of encoding
+        progress: Called with (rows sent, rows rendered so far) after every write
+        spool: Keep the job's packed raster in this file (see catprint.spool) instead
+            of in memory. It is removed once the job has printed; if printing fails
+            it is kept, for print_spool
+        others: as for `print`; the stream is the same as printing the stacked pages
+    Returns the job's StreamStats (rows, bytes saved, pages, time to first line).
+    """
+    if device is None:
+        device = await select_printer()
+
+    compress = compress and get_capabilities(device).compressed_bitmap
+    if spool is None:
+        raster = bytearray()
+        if cache is None:
+            cache = get_cache()
+    else:
+        cache = None
+        from catprint.spool import Spool
+
+        raster = Spool.create(spool, feed_blank=feed_blank, compress=compress)
+    job = PrintJob(raster, feed_blank=feed_blank, compress=compress, stats=StreamStats())
+    try:
+        stats = await _stream(
+            job, lambda queue: _encode_pages(pages, job, queue, cache), device, keep_alive_callback,
+            pool=pool, retries=retries, resume_overlap=resume_overlap, queue_size=queue_size, progress=progress,
+        )
+    finally:
+        if spool is not None:
+            raster.close()
+    if spool is not None:
+        os.unlink(spool)
+    _LOG.info(
+        "Streamed %d pages, %d rows (%d blank, %d compressed), first line after %.3fs, saved %d bytes",
+        stats.pages, stats.rows, stats.blank_rows, stats.compressed_rows,
+        stats.first_line_after or 0.0, stats.bytes_saved,
+    )
+    return stats
+
+
+async def print_spool(
+    spool: str | os.PathLike,
+    device=None,
+    keep_alive_callback=None,
+    *,
+    pool: ConnectionPool | None = None,
+    retries: int = 3,
+    resume_overlap: int = DEFAULT_RESUME_OVERLAP,
+    queue_size: int = DEFAULT_STREAM_QUEUE,
+    progress: typing.Callable[[int, int], None] | None = None,
+) -> StreamStats:
+    """
+    Print a job left in a spool file by `print_stream(..., spool=...)`, e.g. after a
+    restart. It resumes from the last row the printer acknowledged (minus
+    `resume_overlap`), and the file is removed once the job has printed.
+    Raises RuntimeError if the job's rendering never finished.
+    """
+    from catprint.spool import Spool
+
+    if device is None:
+        device = await select_printer()
+
+    with Spool.open(spool) as raster:
+        if not raster.finished:
+            raise RuntimeError(f"{os.fspath(spool)} was not finished rendering; print the job again")
+        compress = raster.compress and get_capabilities(device).compressed_bitmap
+        job = PrintJob(
+            raster, feed_blank=raster.feed_blank, compress=compress, rows_acked=raster.rows_acked, stats=StreamStats()
+        )
+        start_row = max(raster.rows_acked - resume_overlap, 0) if raster.rows_acked else 0
+        _LOG.info("Resuming %s at row %d of %d", os.fspath(spool), start_row, job.rows)
+        stats = await _stream(
+            job, lambda queue: _spooled_bands(job, start_row, queue), device, keep_alive_callback,
+            pool=pool, retries=retries, resume_overlap=resume_overlap, queue_size=queue_size, progress=progress,
+        )
+    os.unlink(spool)
+    return stats
+
+
+async def _spooled_bands(job: PrintJob, start_row: int, queue: asyncio.Queue) -> None:
+    """Queue the bands of an already rendered job from `start_row` on, then None."""
+    try:
+        bands = job.bands(start_row, stats=job.stats)
+        while (band := await asyncio.to_thread(next, bands, None)) is not None:
+            await queue.put(band)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        await queue.put(None)
+        raise
+    await queue.put(None)
+
+
+async def _stream(
+    job: PrintJob,
+    producer_factory: typing.Callable[[asyncio.Queue], typing.Awaitable[None]],
+    device,
+    keep_alive_callback,
+    *,
+    pool: ConnectionPool | None,
+    retries: int,
+    resume_overlap: int,
+    queue_size: int,
+    progress: typing.Callable[[int, int], None] | None,
+) -> StreamStats:
+    """Send the bands a producer queues (then None) for `job`, resuming from the
+    job's raster when the link drops."""
+    stats = job.stats
+    started = time.perf_counter()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    producer = asyncio.create_task(producer_factory(queue))
+    builtins.print(f"\nConnecting to {device.name} ({device.address})...")
+
+    if pool is None:
+        pool = get_pool()
+    # a spooled job records its progress, so it can be resumed after a restart
+    ack = getattr(job.raster, "ack", None)
+
+    def _report(track: typing.Callable[[int], None]) -> typing.Callable[[int], None]:
+        if progress is None and ack is None:
+            return track
+
+        def on_write(sent: int) -> None:
+            track(sent)
+            if ack is not None:
+                ack(job.rows_acked)
+            if progress is not None:
+                progress(job.rows_acked, job.rows)
+
+        return on_write
+
+    # bands to send before taking more off the queue; refilled from the raster on resume
+    pending: list[tuple[bytes, int]] = []
+    # end row of the last band taken off the queue, and whether the queue is finished
+    taken = 0
+    eof = False
+    try:
+        for attempt in range(retries):
+            try:
+                async with pool.connection(device) as client, _session(client, keep_alive_callback) as flow:
+                    _LOG.info("Connected to %s, streaming...", device.address)
+                    pacer = Pacer()
+                    await send(client, preamble(), pacer, flow)
+                    while pending or not eof:
+                        if not pending:
+                            band = await queue.get()
+                            # batch up whatever else is ready
+                            while band is not None:
+                                pending.append(band)
+                                if queue.empty():
+                                    break
+                                band = queue.get_nowait()
+                            eof = band is None
+                            if not pending:
+                                continue
+                            taken = pending[-1][1]
+                        offsets = list(itertools.accumulate(len(part) for part, _ in pending))
+                        rows = [end for _, end in pending]
+                        data = b"".join(part for part, _ in pending)
+                        await send(client, data, pacer, flow, progress=_report(job.track(offsets, rows)))
+                        pending = []
+                        if stats.first_line_after is None:
+                            stats.first_line_after = time.perf_counter() - started
+                    await send(client, postamble(), pacer, flow)
+                    _LOG.info("Print job streamed successfully!")
+                break
+            except (BleakError, OSError, asyncio.TimeoutError) as e:
+                _LOG.warning(
+                    "%s after %d/%d rows: %s (attempt %s/%s)",
+                    type(e).__name__, job.rows_acked, taken, e, attempt + 1, retries,
+                )
+                if attempt < retries - 1:
+                    await asyncio.sleep(0.5 * (attempt + 1))
+                    start_row = max(job.rows_acked - resume_overlap, 0)
+                    pending = await asyncio.to_thread(list, job.bands(start_row, taken))
+                    continue
+                raise
+        # surfaces rendering errors; the pages before the failure were printed
+        await producer
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await producer
+    return stats
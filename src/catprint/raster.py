@@ -0,0 +1,129 @@
+"""Compact 1-bit rasters in the printer's row format.
+
+A PIL image of a receipt costs 1 byte per pixel in mode "1" or "L" and 3 in
+RGB; `PackedRaster` holds the same rows at 1 bit per pixel (48 bytes per row),
+8-24x less. Its rows are already in the order `printer.encode_rows` wants, so
+the encoder takes them as they are, and PIL only comes in at the edges
+(`from_image` / `to_image`).
+
+Rows live in read-only segments shared between rasters: stacking and row slicing
+never copy pixel data.
+
+    logo = PackedRaster.from_image(render.image_page(img))
+    body = render.stack(logo, PackedRaster.from_image(render.text("Hi")), render.blank(20, packed=True))
+    await printer.print(body, device)
+"""
+from __future__ import annotations
+
+import typing
+
+import PIL.Image
+
+from catprint.printer import PRINTER_WIDTH, ROW_BYTES, pack, unpack
+
+
+class PackedRaster:
+    """Immutable packed raster, PRINTER_WIDTH pixels wide.
+
+    `len()` is the number of rows. Indexing with a slice gives the rows as a new
+    raster sharing memory with this one; an int gives one row's bytes.
+    """
+
+    __slots__ = ("_segments", "height")
+
+    width = PRINTER_WIDTH
+
+    def __init__(self, data: bytes | bytearray | memoryview = b""):
+        view = memoryview(data).cast("B")
+        if len(view) % ROW_BYTES:
+            raise ValueError(f"Raster data must be a whole number of {ROW_BYTES}-byte rows, got {len(view)} bytes")
+        self._segments: tuple[memoryview, ...] = (view.toreadonly(),) if len(view) else ()
+        self.height = len(view) // ROW_BYTES
+
+    @classmethod
+    def _join(cls, segments: typing.Iterable[memoryview]) -> "PackedRaster":
+        raster = cls.__new__(cls)
+        raster._segments = tuple(s for s in segments if len(s))
+        raster.height = sum(len(s) for s in raster._segments) // ROW_BYTES
+        return raster
+
+    @classmethod
+    def from_image(cls, img: PIL.Image.Image) -> "PackedRaster":
+        """Pack a PIL image, scaling it to the printer width like render.stack would."""
+        if img.width != PRINTER_WIDTH:
+            img = img.resize((PRINTER_WIDTH, int(img.height * PRINTER_WIDTH / img.width)))
+        return cls(pack(img))
+
+    @classmethod
+    def blank(cls, height: int) -> "PackedRaster":
+        return cls(bytes(height * ROW_BYTES))
+
+    @classmethod
+    def concat(cls, rasters: typing.Iterable["PackedRaster"]) -> "PackedRaster":
+        """Stack rasters top to bottom without copying their rows."""
+        return cls._join(segment for raster in rasters for segment in raster._segments)
+
+    def __add__(self, other: "PackedRaster") -> "PackedRaster":
+        if not isinstance(other, PackedRaster):
+            return NotImplemented
+        return self._join(self._segments + other._segments)
+
+    def __len__(self) -> int:
+        return self.height
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def nbytes(self) -> int:
+        return self.height * ROW_BYTES
+
+    def __getitem__(self, key: int | slice) -> "PackedRaster | memoryview":
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.height)
+            if step != 1:
+                raise ValueError("PackedRaster slices can't have a step")
+            return self._slice(start, max(stop, start))
+        row = key + self.height if key < 0 else key
+        if not 0 <= row < self.height:
+            raise IndexError("row index out of range")
+        return self._slice(row, row + 1)._segments[0]
+
+    def _slice(self, start: int, stop: int) -> "PackedRaster":
+        begin, end = start * ROW_BYTES, stop * ROW_BYTES
+        segments = []
+        offset = 0
+        for segment in self._segments:
+            lo, hi = max(begin - offset, 0), min(end - offset, len(segment))
+            if lo < hi:
+                segments.append(segment[lo:hi])
+            offset += len(segment)
+            if offset >= end:
+                break
+        return self._join(segments)
+
+    def rows(self) -> typing.Iterator[memoryview]:
+        """Each row's ROW_BYTES bytes, top to bottom."""
+        for segment in self._segments:
+            for offset in range(0, len(segment), ROW_BYTES):
+                yield segment[offset : offset + ROW_BYTES]
+
+    def tobytes(self) -> bytes:
+        if len(self._segments) == 1:
+            return self._segments[0].tobytes()
+        return b"".join(self._segments)
+
+    def to_image(self) -> PIL.Image.Image:
+        """The raster as a mode "1" PIL image (for previews)."""
+        return unpack(self.tobytes())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedRaster):
+            return NotImplemented
+        return self.height == other.height and self.tobytes() == other.tobytes()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<PackedRaster {self.width}x{self.height}, {len(self._segments)} segments>"
@@ -1,84 +1,395 @@
+import collections
+import functools
 import importlib.resources
-import itertools
-from catprint.compat import batched, LANCZOS, FLIP_LEFT_RIGHT, ROTATE_270
+import os
+import re
+import threading
+import unicodedata
+from typing import Callable, Iterable, Iterator, NamedTuple
+from catprint.compat import batched, LANCZOS, NEAREST, FLIP_LEFT_RIGHT, ROTATE_270
+from catprint import dither as dithering
 import PIL
 import PIL.Image
 import PIL.ImageDraw
 import PIL.ImageFont
-import PIL.ImageEnhance
+import PIL.ImageFilter
 try:
     from catprint.printer import PRINTER_WIDTH
+    from catprint.raster import PackedRaster
 except Exception:
     # allow importing render even when optional deps (bleak) for printer are not installed
     PRINTER_WIDTH = 384
+    PackedRaster = None
 import importlib
 
+# bundled fonts, relative to the catprint package
+MONO_FONT = "fonts/NotoSansMono_ExtraCondensed-Regular.ttf"
+BLACK_FONT = "fonts/NotoSans_ExtraCondensed-Black.ttf"
+
+# the (font, size) pairs render itself uses, loaded by preload_fonts
+BUNDLED_FONTS = [(MONO_FONT, 16), (MONO_FONT, 18), (MONO_FONT, 22), (BLACK_FONT, 20), (BLACK_FONT, PRINTER_WIDTH)]
+
+# (font, size) pairs kept loaded
+DEFAULT_FONT_CACHE = 32
+
+
+class FontRegistry:
+    """Bounded LRU of loaded fonts, keyed by (font file, size).
+
+    Loading a TrueType font parses the whole file; a registry loads each
+    (font, size) once per process and shares it between renders.
+    """
+
+    def __init__(self, max_fonts: int = DEFAULT_FONT_CACHE):
+        self.max_fonts = max_fonts
+        self._fonts: collections.OrderedDict[tuple[str, int], PIL.ImageFont.FreeTypeFont] = collections.OrderedDict()
+        self._atlases: dict[tuple[str, int], GlyphAtlas] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, font: str, size: int) -> PIL.ImageFont.FreeTypeFont:
+        """`font` is a path, or a file relative to the catprint package (e.g. MONO_FONT)."""
+        key = (font, size)
+        with self._lock:
+            loaded = self._fonts.get(key)
+            if loaded is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return loaded
+        loaded = PIL.ImageFont.truetype(_font_path(font), size)
+        with self._lock:
+            self.loads += 1
+            self._fonts[key] = loaded
+            while len(self._fonts) > self.max_fonts:
+                evicted, _ = self._fonts.popitem(last=False)
+                self._atlases.pop(evicted, None)
+                self.evictions += 1
+        return loaded
+
+    def atlas(self, font: str, size: int) -> "GlyphAtlas":
+        """The glyph atlas of a loaded font; it is dropped with the font."""
+        loaded = self.get(font, size)
+        with self._lock:
+            atlas = self._atlases.get((font, size))
+            if atlas is None or atlas.font is not loaded:
+                atlas = self._atlases[(font, size)] = GlyphAtlas(loaded)
+            return atlas
+
+    def preload(self, fonts: Iterable[tuple[str, int]] = BUNDLED_FONTS) -> None:
+        for font, size in fonts:
+            self.get(font, size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fonts.clear()
+            self._atlases.clear()
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+
+class _Glyph(NamedTuple):
+    # None for blank glyphs
+    tile: PIL.Image.Image | None
+    # tile offset from the pen, inside a line
+    x: int
+    y: int
+    advance: float
+    # x offset when the glyph starts a line
+    lead: int
+    # top of the glyph's box, and how far its bitmap reaches up relative to a capital's
+    top: int
+    reach: int
+
+
+class GlyphAtlas:
+    """1-bit glyph tiles of one font, for drawing lines of text without FreeType.
+
+    `ImageDraw.text` hints and rasterizes every glyph of a line on each call,
+    which dominates rendering receipts. An atlas rasterizes each character
+    once (on first use) and lays lines out by pasting tiles at the font's
+    hinted advances, reproducing Pillow's placement pixel for pixel. Lines with
+    characters it can't lay out (combining marks, right-to-left or wide
+    scripts) are drawn by FreeType instead.
+    """
+
+    def __init__(self, font: PIL.ImageFont.FreeTypeFont):
+        self.font = font
+        # None for characters left to FreeType
+        self._glyphs: dict[str, _Glyph | None] = {}
+        self._space = int(font.getlength(" ", mode="1"))
+        self._ascent = font.getmetrics()[0]
+
+    def _glyph(self, char: str) -> _Glyph | None:
+        try:
+            return self._glyphs[char]
+        except KeyError:
+            pass
+        glyph = None
+        if (
+            char.isprintable()
+            and not unicodedata.combining(char)
+            and unicodedata.bidirectional(char) not in ("R", "AL")
+            and unicodedata.east_asian_width(char) not in ("W", "F")
+        ):
+            glyph = self._rasterize(char)
+        self._glyphs[char] = glyph
+        return glyph
+
+    def _rasterize(self, char: str) -> _Glyph:
+        # Pillow places a line's glyphs relative to its highest-reaching bitmap, so
+        # the tile is cut from inside a line: after a space, with a capital well clear
+        pad = self.font.size
+        advance = self.font.getlength(char, mode="1")
+        size = (3 * pad + 5 * self._space + int(advance), 3 * pad)
+        canvas = PIL.Image.new("1", size, color=0)
+        PIL.ImageDraw.Draw(canvas).text((pad, pad), f" {char}   Ď", fill=1, font=self.font)
+        box = canvas.crop((0, 0, pad + int(advance) + 3 * self._space, size[1])).getbbox()
+        left, top, _, _ = self.font.getbbox(char, mode="1")
+        if box is None:
+            return _Glyph(None, 0, 0, advance, min(left, 0), top, 0)
+        alone = PIL.Image.new("1", size, color=0)
+        PIL.ImageDraw.Draw(alone).text((pad, pad), char, fill=1, font=self.font)
+        y = box[1] - pad
+        return _Glyph(canvas.crop(box), box[0] - pad - self._space, y, advance, min(left, 0), top, alone.getbbox()[1] - pad - top - y)
+
+    def draw(self, img: PIL.Image.Image, xy: tuple[int, int], line: str, fill=0) -> None:
+        """Draw `line` like ImageDraw.Draw(img).text(xy, line, fill=fill, font=font)."""
+        glyphs = [self._glyph(char) for char in line]
+        inked = [glyph for glyph in glyphs if glyph is not None and glyph.tile is not None]
+        if not inked:
+            if None in glyphs:
+                PIL.ImageDraw.Draw(img).text(xy, line, fill=fill, font=self.font)
+            return
+        top = min(glyph.top for glyph in inked)
+        if None in glyphs or (len(inked) < len(glyphs) and top >= self._ascent):
+            # also blanks with only glyphs under the baseline ("_ _"), which Pillow misplaces
+            PIL.ImageDraw.Draw(img).text(xy, line, fill=fill, font=self.font)
+            return
+        x0, y0 = xy[0], xy[1] + top + max(glyph.reach for glyph in inked)
+        pen = float(glyphs[0].lead)
+        for glyph in glyphs:
+            if glyph.tile is not None:
+                img.paste(fill, (x0 + int(pen) + glyph.x, y0 + glyph.y), glyph.tile)
+            pen += glyph.advance
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+
+def _font_path(font: str) -> str:
+    if os.path.isabs(font):
+        return font
+    return str(importlib.resources.files("catprint").joinpath(font))
+
+
+_fonts: FontRegistry | None = None
+
+
+def get_fonts() -> FontRegistry:
+    """Return the process-wide font registry, creating it on first use."""
+    global _fonts
+    if _fonts is None:
+        _fonts = FontRegistry()
+    return _fonts
+
+
+def set_fonts(registry: FontRegistry | None) -> None:
+    """Replace the process-wide font registry (None resets it to a fresh default)."""
+    global _fonts
+    _fonts = registry
+
+
+def preload_fonts() -> None:
+    """Load the bundled fonts now rather than on the first render."""
+    get_fonts().preload()
+
+
+# bytes of rendered banners kept; a mode "1" image costs a byte per pixel,
+# so a short banner is a few hundred KB
+DEFAULT_BANNER_CACHE_BYTES = 16 * 1024 * 1024
+
+
+class BannerCache:
+    """Bounded LRU of rendered banners, keyed by (kind, text, font, size).
+
+    Banners rasterize a 384 px font and the same few ("SALE", "FREE COFFEE")
+    recur on most receipts. Entries are evicted least recently used first once
+    their pixels exceed `max_bytes`; callers get copies, never the cached image.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_BANNER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[tuple, PIL.Image.Image] = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _nbytes(img: PIL.Image.Image) -> int:
+        return img.width * img.height * len(img.getbands())
+
+    def get(self, key: tuple, render: Callable[[], PIL.Image.Image]) -> PIL.Image.Image:
+        """The cached image for `key`, rendering it with `render()` on a miss.
+
+        The returned image is shared: copy it before changing it.
+        """
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+        img = render()
+        size = self._nbytes(img)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = img
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= self._nbytes(evicted)
+                    self.evictions += 1
+        return img
+
+    @property
+    def nbytes(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_banners: BannerCache | None = None
+
+
+def get_banners() -> BannerCache:
+    """Return the process-wide banner cache, creating it on first use."""
+    global _banners
+    if _banners is None:
+        _banners = BannerCache()
+    return _banners
+
+
+def set_banners(cache: BannerCache | None) -> None:
+    """Replace the process-wide banner cache (None resets it to a fresh default)."""
+    global _banners
+    _banners = cache
+
+
+def warm_up(banners: Iterable[str] = ()) -> None:
+    """Load the bundled fonts, build the blue-noise dither map and render
+    `banners` (as receipts' banner blocks) ahead of use."""
+    preload_fonts()
+    dithering.blue_noise_map()
+    for text in banners:
+        text_banner(text)
+
+
+# reducing_gap for image_page's downscale: a cheap box reduce, then LANCZOS
+# over the last 3x, which Pillow documents as indistinguishable from a full pass
+RESIZE_REDUCING_GAP = 3.0
+
+# ImageEnhance.Sharpness(1.5) as one convolution: 1.5 * pixel - 0.5 * SMOOTH
+_SHARPEN = PIL.ImageFilter.Kernel((3, 3), (-1, -1, -1, -1, 34, -1, -1, -1, -1), scale=26)
+
+# every gray level once, blended into a contrast table
+_RAMP = PIL.Image.frombytes("L", (256, 1), bytes(range(256)))
+
+
+def _contrast_lut(image: PIL.Image.Image, contrast: float) -> list[int]:
+    """ImageEnhance.Contrast(image).enhance(contrast) as a point() table."""
+    histogram = image.histogram()
+    mean = int(sum(i * n for i, n in enumerate(histogram)) / (sum(histogram) or 1) + 0.5)
+    return list(PIL.Image.blend(PIL.Image.new("L", (256, 1), mean), _RAMP, contrast).tobytes())
+
+
+# bounded, as thresholds come from request meta and may be any number
+@functools.lru_cache(maxsize=16)
+def _threshold_lut(threshold: int) -> tuple[int, ...]:
+    return tuple(0 if x < threshold else 255 for x in range(256))
+
 
 def image_page(
-    image: PIL.Image.Image, *, dither=True, contrast=1.2, sharpen=True, threshold=212
+    image: PIL.Image.Image, *, dither=True, contrast=1.2, sharpen=True, threshold=212, packed=False
 ) -> PIL.Image.Image:
     """
     Convert image to 1-bit for thermal printing with quality enhancements.
     Args:
         image: Input PIL Image
-        dither: Use Floyd-Steinberg dithering (better for photos/complex images)
+        dither: Dithering engine, one of dither.ENGINES ("floyd-steinberg",
+            "bayer", "blue-noise", "atkinson"); True is Floyd-Steinberg (better
+            for photos/complex images), False a plain threshold
         contrast: Contrast adjustment (1.0 = no change, >1.0 = more contrast)
         sharpen: Apply sharpening filter
         threshold: Threshold value for 1-bit conversion (0-255, default 212)
+        packed: Return a PackedRaster instead of a mode "1" image
+
+    Unsharpened, undithered output matches the old resize-convert-enhance
+    chain bit for bit on gray input up to six times the printer width. RGB
+    input wider than the printer goes gray before the resize, and wider
+    input gets the reducing_gap box reduce; both shift some gray levels
+    (mostly by one) and flip up to 0.5% of pixels near the threshold.
     """
-    # Resize first if needed
+    engine = dithering.get_engine(dither if isinstance(dither, str) else "floyd-steinberg") if dither else None
+    # RGB goes gray before resizing, a third of the pixels to resample;
+    # other modes (palette, alpha) resize as they are, like they always did
+    if image.mode == "RGB":
+        image = image.convert("L")
     if image.width > PRINTER_WIDTH:
         new_height = int(image.height * PRINTER_WIDTH / image.width)
-        image = image.resize((PRINTER_WIDTH, new_height), LANCZOS)
-    # Convert to grayscale first
+        image = image.resize((PRINTER_WIDTH, new_height), LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
     if image.mode != "L":
         image = image.convert("L")
-    # Enhance contrast for better text readability
-    if contrast != 1.0:
-        enhancer = PIL.ImageEnhance.Contrast(image)
-        image = enhancer.enhance(contrast)
-    # Sharpen for better text clarity
-    if sharpen:
-        enhancer = PIL.ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(1.5)
-    # Convert to 1-bit with optional dithering
-    if dither:
-        # Floyd-Steinberg dithering (better for photos and complex images)
-        from catprint.compat import DITHER_FLOYD
-
-        image = image.convert("1", dither=DITHER_FLOYD if DITHER_FLOYD is not None else None)
+    # contrast is a table lookup; without sharpening in between it fuses
+    # with the threshold into a single pass
+    lut = _contrast_lut(image, contrast) if contrast != 1.0 else None
+    if not engine and not sharpen:
+        cutoff = _threshold_lut(threshold)
+        image = image.point([cutoff[v] for v in lut] if lut else cutoff, mode="1")
     else:
-        # Simple threshold (better for text and line art)
-        image = image.point(lambda x: 0 if x < threshold else 255, mode="1")
-    return image
+        if lut:
+            image = image.point(lut)
+        if sharpen:
+            image = image.filter(_SHARPEN)
+        if engine:
+            image = engine(image)
+        else:
+            # Simple threshold (better for text and line art)
+            image = image.point(_threshold_lut(threshold), mode="1")
+    return PackedRaster.from_image(image) if packed else image
 
 
-def pdf_page(image: PIL.Image.Image, *, contrast=1.5, threshold=212) -> PIL.Image.Image:
+def pdf_page(image: PIL.Image.Image, *, contrast=1.5, threshold=212, dither=False) -> PIL.Image.Image:
     """
     Specialized rendering for PDF pages - optimized for text clarity.
-    Uses higher contrast and no dithering for crisp text.
+    Uses higher contrast and no dithering for crisp text; pass a `dither`
+    mode for pages that are mostly pictures.
     """
     return image_page(
-        image, dither=False, contrast=contrast, sharpen=True, threshold=threshold
+        image, dither=dither, contrast=contrast, sharpen=True, threshold=threshold
     )
 
 
-def photo(image: PIL.Image.Image) -> PIL.Image.Image:
+def photo(image: PIL.Image.Image, *, dither=True) -> PIL.Image.Image:
     """
     Specialized rendering for photos - uses dithering for better gradients.
     """
-    return image_page(image, dither=True, contrast=1.1, sharpen=False)
+    return image_page(image, dither=dither, contrast=1.1, sharpen=False)
 
 
 def text(text: str, *, font_size: int = 18, line_length: int = 44) -> PIL.Image.Image:
-    font = PIL.ImageFont.truetype(
-        str(
-            importlib.resources.files("catprint").joinpath(
-                "fonts/NotoSansMono_ExtraCondensed-Regular.ttf"
-            )
-        ),
-        font_size,
-    )
+    font = get_fonts().get(MONO_FONT, font_size)
     left, top, right, bottom = font.getbbox("Č")
     height = int((bottom - top) * 1.4)
     lines = [
@@ -87,21 +398,23 @@ def text(text: str, *, font_size: int = 18, line_length: int = 44) -> PIL.Image.
         for subline in batched(line, line_length)
     ]
     img = PIL.Image.new("1", (PRINTER_WIDTH, len(lines) * height), color="white")
-    draw = PIL.ImageDraw.Draw(img)
+    atlas = get_fonts().atlas(MONO_FONT, font_size)
     for y, line in enumerate(lines):
-        draw.text((0, y * height), line, fill="black", font=font)
+        atlas.draw(img, (0, y * height), line)
     return img
 
 
 def banner(text: str) -> PIL.Image.Image:
-    font = PIL.ImageFont.truetype(
-        str(
-            importlib.resources.files("catprint").joinpath(
-                "fonts/NotoSans_ExtraCondensed-Black.ttf"
-            )
-        ),
-        PRINTER_WIDTH,
-    )
+    return _banner(text).copy()
+
+
+def _banner(text: str) -> PIL.Image.Image:
+    # shared with the cache, so read only
+    return get_banners().get(("banner", text, BLACK_FONT, PRINTER_WIDTH), lambda: _render_banner(text))
+
+
+def _render_banner(text: str) -> PIL.Image.Image:
+    font = get_fonts().get(BLACK_FONT, PRINTER_WIDTH)
     left, top, right, bottom = font.getbbox(text)
     text_width, text_height = int(right - left), int(bottom - top)
     canvas_width = text_width
@@ -121,35 +434,51 @@ def banner(text: str) -> PIL.Image.Image:
 
 
 def text_banner(text: str, *, font_size: int = 18) -> PIL.Image.Image:
-    font = PIL.ImageFont.truetype(
-        str(
-            importlib.resources.files("catprint").joinpath(
-                "fonts/NotoSansMono_ExtraCondensed-Regular.ttf"
-            )
-        ),
-        font_size,
-    )
+    key = ("text_banner", text, MONO_FONT, font_size)
+    return get_banners().get(key, lambda: _render_text_banner(text, font_size)).copy()
+
+
+def _render_text_banner(text: str, font_size: int) -> PIL.Image.Image:
+    font = get_fonts().get(MONO_FONT, font_size)
     _, _, char_width, char_height = font.getbbox("#")
-    banner_img = banner(text)
+    banner_img = _banner(text)
     img = PIL.Image.new("1", (banner_img.width, banner_img.height), color="white")
-    draw = PIL.ImageDraw.Draw(img)
-    text_iter = itertools.cycle(c for c in text if c != " ")
     rows = int(banner_img.height / char_height)
     cols = int(banner_img.width / char_width)
+    # the banner pixel at the centre of each character cell, in one pass
+    cells = banner_img.resize((cols, rows), NEAREST, box=(0, 0, cols * char_width, rows * char_height))
+    cells = cells.convert("L").tobytes().decode("latin-1")
+    # dark cells take the text's letters in turn, so cut runs of them from one long fill
+    letters = text.replace(" ", "")
+    dark = cells.count("\x00")
+    fill = letters * (dark // len(letters) + 1) if letters else ""
+    taken = 0
+
+    def take(run: re.Match) -> str:
+        nonlocal taken
+        taken += len(run[0])
+        return fill[taken - len(run[0]) : taken]
+
+    atlas = get_fonts().atlas(MONO_FONT, font_size)
     for y in range(rows):
-        line_text = ""
-        for x in range(cols):
-            if banner_img.getpixel(
-                (int((x + 0.5) * char_width), int((y + 0.5) * char_height))
-            ):
-                line_text += " "
-            else:
-                line_text += next(text_iter)
-        draw.text((0, y * char_height), line_text, fill="black", font=font)
+        line_text = re.sub("\x00+", take, cells[y * cols : (y + 1) * cols]).replace("\xff", " ")
+        atlas.draw(img, (0, y * char_height), line_text)
     return img
 
 
-def stack(*images: PIL.Image.Image) -> PIL.Image.Image:
+def stack(*images: PIL.Image.Image, lazy: bool = False) -> PIL.Image.Image:
+    """Stack images top to bottom, scaled to the widest one.
+
+    With `lazy`, return a VStack that only references the images instead of
+    pasting them onto a new canvas.
+    """
+    if PackedRaster is not None and any(isinstance(img, PackedRaster) for img in images):
+        # packed rasters stack without copying; images are packed at the printer width
+        return PackedRaster.concat(
+            img if isinstance(img, PackedRaster) else PackedRaster.from_image(img) for img in images
+        )
+    if lazy:
+        return VStack(*images)
     max_width = max(img.width for img in images)
     resized_images = [
         img
@@ -167,7 +496,55 @@ def stack(*images: PIL.Image.Image) -> PIL.Image.Image:
     return stacked_image
 
 
-def blank(height: int) -> PIL.Image.Image:
+class VStack:
+    """A virtual `stack`: the same geometry, without copying the images.
+
+    Printing packs it one part at a time (`pages`, `packed`, `rows`); only
+    `materialize` builds the full-height image, for previews.
+    """
+
+    __slots__ = ("parts", "mode", "width", "height")
+
+    def __init__(self, *images: PIL.Image.Image):
+        parts = []
+        for img in images:
+            parts.extend(img.parts if isinstance(img, VStack) else [img])
+        self.parts = tuple(parts)
+        self.mode = images[0].mode
+        self.width = max(img.width for img in parts)
+        self.height = sum(self._scaled_height(img, self.width) for img in parts)
+
+    @staticmethod
+    def _scaled_height(img: PIL.Image.Image, width: int) -> int:
+        return img.height if img.width == width else int(img.height * width / img.width)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    def pages(self) -> Iterator[PIL.Image.Image]:
+        """The parts scaled to the printer width, in the stack's mode, one at a time."""
+        for img in self.parts:
+            if img.width != PRINTER_WIDTH:
+                img = img.resize((PRINTER_WIDTH, self._scaled_height(img, PRINTER_WIDTH)))
+            # what pasting onto the stack's canvas would do
+            yield img if img.mode == self.mode else img.convert(self.mode)
+
+    def packed(self) -> PackedRaster:
+        return PackedRaster.concat(PackedRaster.from_image(img) for img in self.pages())
+
+    def rows(self) -> Iterator[memoryview]:
+        """Packed printer rows, top to bottom; only one part is packed at a time."""
+        for img in self.pages():
+            yield from PackedRaster.from_image(img).rows()
+
+    def materialize(self) -> PIL.Image.Image:
+        return stack(*self.parts)
+
+
+def blank(height: int, *, packed: bool = False) -> PIL.Image.Image:
+    if packed:
+        return PackedRaster.blank(height)
     return PIL.Image.new("1", (PRINTER_WIDTH, height), color="white")
 
 
@@ -190,18 +567,9 @@ def id_card(
     Returns a printer-ready 1-bit image.
     """
     # Fonts (reverted to previous sizes, increased desc font for contrast)
-    header_font = PIL.ImageFont.truetype(
-        str(importlib.resources.files("catprint").joinpath("fonts/NotoSans_ExtraCondensed-Black.ttf")),
-        20,
-    )
-    name_font = PIL.ImageFont.truetype(
-        str(importlib.resources.files("catprint").joinpath("fonts/NotoSansMono_ExtraCondensed-Regular.ttf")),
-        22,
-    )
-    desc_font = PIL.ImageFont.truetype(
-        str(importlib.resources.files("catprint").joinpath("fonts/NotoSansMono_ExtraCondensed-Regular.ttf")),
-        16,
-    )
+    header_font = get_fonts().get(BLACK_FONT, 20)
+    name_font = get_fonts().get(MONO_FONT, 22)
+    desc_font = get_fonts().get(MONO_FONT, 16)
 
     # Determine card height for 16:9 (width x height = 16:9)
     card_height = max(int(width * 9 / 16), 64)
@@ -0,0 +1,325 @@
+"""Per-printer print queues.
+
+One worker per printer address takes jobs off a priority queue (FIFO within a
+priority) and prints them one at a time, so concurrent requests for the same
+MX06 are ordered instead of racing for its link. Jobs are tracked through
+queued -> rendering -> sending -> done/failed (or cancelled), with rows sent
+so far, and each printer reports queue wait, service time and throughput.
+
+    scheduler = Scheduler()
+    job = scheduler.submit(device, receipt.iter_blocks(blocks), priority=1)
+    await job.wait()
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import enum
+import itertools
+import logging
+import time
+import typing
+import uuid
+
+import PIL.Image
+
+from catprint import printer
+
+_LOG = logging.getLogger(__name__)
+
+# jobs waiting per printer before submit refuses more
+DEFAULT_MAX_QUEUE_DEPTH = 32
+
+# finished jobs kept for lookup by id
+DEFAULT_HISTORY = 1000
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class Prepended:
+    """`first`, then the rest of `pages`, e.g. after peeking at the first page.
+
+    Unlike itertools.chain it can be closed, which closes `pages` too, so a
+    cancelled job frees a generator's resources (like RenderPool.pages' shared
+    memory) even before it started.
+    """
+
+    def __init__(self, first: PIL.Image.Image, pages: typing.Iterator[PIL.Image.Image]):
+        self._first = [first]
+        self._pages = pages
+
+    def __iter__(self) -> "Prepended":
+        return self
+
+    def __next__(self) -> PIL.Image.Image:
+        if self._first:
+            return self._first.pop()
+        return next(self._pages)
+
+    def close(self) -> None:
+        self._first.clear()
+        getattr(self._pages, "close", lambda: None)()
+
+
+class JobState(enum.Enum):
+    QUEUED = "queued"
+    RENDERING = "rendering"
+    SENDING = "sending"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclasses.dataclass(eq=False)
+class Job:
+    address: str
+    device: typing.Any
+    pages: typing.Iterable[PIL.Image.Image]
+    priority: int = 0
+    print_kwargs: dict = dataclasses.field(default_factory=dict)
+    id: str = dataclasses.field(default_factory=lambda: uuid.uuid4().hex[:12])
+    state: JobState = JobState.QUEUED
+    error: str | None = None
+    # rows written to the printer, and rows rendered so far (the total once sending ends)
+    rows_sent: int = 0
+    rows_total: int = 0
+    stats: printer.StreamStats | None = None
+    submitted_at: float = dataclasses.field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    _finished: asyncio.Event = dataclasses.field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent queued (so far, if still queued)."""
+        return (self.started_at or time.monotonic()) - self.submitted_at
+
+    @property
+    def service_time(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    async def wait(self) -> "Job":
+        """Wait until the job is done, failed or cancelled."""
+        await self._finished.wait()
+        return self
+
+
+@dataclasses.dataclass
+class PrinterStats:
+    done: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    queued: int = 0
+    rows: int = 0
+    wait_time: float = 0.0
+    service_time: float = 0.0
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.failed + self.cancelled
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_time / self.finished if self.finished else 0.0
+
+    @property
+    def mean_service(self) -> float:
+        return self.service_time / self.finished if self.finished else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.service_time if self.service_time else 0.0
+
+    @property
+    def jobs_per_minute(self) -> float:
+        return 60 * self.done / self.service_time if self.service_time else 0.0
+
+
+class _Worker:
+    def __init__(self, address: str):
+        self.address = address
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.stats = PrinterStats()
+        self.task: asyncio.Task | None = None
+        # the job being printed and the task printing it
+        self.current: tuple[Job, asyncio.Task] | None = None
+
+
+class Scheduler:
+    """One print worker per printer address, each with its own priority queue.
+
+    Higher `priority` jobs go first; equal priorities print in submission order.
+    `print_kwargs` given here apply to every job (e.g. a `pool`).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        history: int = DEFAULT_HISTORY,
+        **print_kwargs,
+    ):
+        self.max_queue_depth = max_queue_depth
+        self.history = history
+        self.print_kwargs = print_kwargs
+        self.jobs: collections.OrderedDict[str, Job] = collections.OrderedDict()
+        self._workers: dict[str, _Worker] = {}
+        self._seq = itertools.count()
+
+    def submit(
+        self,
+        device,
+        pages: typing.Iterable[PIL.Image.Image],
+        *,
+        priority: int = 0,
+        address: str | None = None,
+        **print_kwargs,
+    ) -> Job:
+        """Queue `pages` for `device` and return the job without waiting for it.
+
+        `address` is the printer whose queue the job joins; it defaults to the
+        device's, and is given when `device` stands in for a printer (mock sinks).
+        Raises QueueFull when that printer already has `max_queue_depth` jobs waiting.
+        """
+        address = str(address or device.address)
+        worker = self._worker(address)
+        if worker.stats.queued >= self.max_queue_depth:
+            raise QueueFull(f"{worker.stats.queued} jobs already queued for {address}")
+        job = Job(address, device, pages, priority, {**self.print_kwargs, **print_kwargs})
+        self.jobs[job.id] = job
+        self._prune()
+        worker.stats.queued += 1
+        worker.queue.put_nowait((-priority, next(self._seq), job))
+        _LOG.info("Queued job %s for %s (priority %d, %d waiting)", job.id, address, priority, worker.stats.queued)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it is unknown or already finished.
+
+        A running job stops between writes and its link is dropped, which ends
+        the job on the printer.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        worker = self._workers[job.address]
+        if job.state is JobState.QUEUED:
+            # the worker skips it when it comes up
+            worker.stats.queued -= 1
+            worker.stats.cancelled += 1
+            job.state = JobState.CANCELLED
+            job.finished_at = time.monotonic()
+            worker.stats.wait_time += job.wait_time
+            _close_pages(job)
+            job._finished.set()
+        elif worker.current is not None and worker.current[0] is job:
+            worker.current[1].cancel()
+        _LOG.info("Cancelled job %s for %s", job.id, job.address)
+        return True
+
+    def stats(self) -> dict[str, PrinterStats]:
+        return {address: worker.stats for address, worker in self._workers.items()}
+
+    async def close(self) -> None:
+        """Stop the workers, cancelling running and queued jobs."""
+        for job in list(self.jobs.values()):
+            if job.state is JobState.QUEUED:
+                self.cancel(job.id)
+        for worker in self._workers.values():
+            if worker.task is not None:
+                worker.task.cancel()
+        for worker in self._workers.values():
+            if worker.task is not None:
+                try:
+                    await worker.task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    def _worker(self, address: str) -> _Worker:
+        loop = asyncio.get_running_loop()
+        worker = self._workers.get(address)
+        # a worker left behind by an earlier event loop can't be resumed on this one
+        if worker is None or (worker.task is not None and worker.task.get_loop() is not loop):
+            worker = self._workers[address] = _Worker(address)
+        if worker.task is None or worker.task.done():
+            worker.task = loop.create_task(self._work(worker))
+        return worker
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    async def _work(self, worker: _Worker) -> None:
+        while True:
+            _, _, job = await worker.queue.get()
+            if job.state is not JobState.QUEUED:
+                continue
+            worker.stats.queued -= 1
+            task = asyncio.create_task(self._run(job, worker.stats))
+            worker.current = (job, task)
+            try:
+                # cancelling the job's task must not stop the worker
+                await asyncio.wait({task})
+            finally:
+                worker.current = None
+                if not task.done():
+                    task.cancel()
+                    await asyncio.wait({task})
+
+    async def _run(self, job: Job, stats: PrinterStats) -> None:
+        job.started_at = time.monotonic()
+        job.state = JobState.RENDERING
+        try:
+            pages = iter(job.pages)
+            first = await asyncio.to_thread(next, pages, None)
+            if first is None:
+                raise ValueError("Nothing to print")
+            job.state = JobState.SENDING
+
+            def progress(sent: int, total: int) -> None:
+                job.rows_sent, job.rows_total = sent, total
+
+            job.stats = await printer.print_stream(
+                Prepended(first, pages), device=job.device, progress=progress, **job.print_kwargs
+            )
+            job.rows_sent = job.rows_total = job.stats.rows
+            job.state = JobState.DONE
+            stats.done += 1
+            stats.rows += job.stats.rows
+        except asyncio.CancelledError:
+            job.state = JobState.CANCELLED
+            stats.cancelled += 1
+            raise
+        except Exception as e:
+            _LOG.warning("Job %s for %s failed: %s", job.id, job.address, e)
+            job.state = JobState.FAILED
+            job.error = str(e) or type(e).__name__
+            stats.failed += 1
+        finally:
+            _close_pages(job)
+            job.finished_at = time.monotonic()
+            stats.wait_time += job.wait_time
+            stats.service_time += job.service_time
+            job._finished.set()
+
+
+def _close_pages(job: Job) -> None:
+    """Drop the job's pages so their generator, and any shared memory it holds, is freed."""
+    pages, job.pages = job.pages, ()
+    with contextlib.suppress(ValueError):
+        # ValueError: still running in a render thread; it is freed when that returns
+        getattr(pages, "close", lambda: None)()
@@ -0,0 +1,156 @@
+"""On-disk spool of a job's packed raster.
+
+A long job (a 30-page PDF is ~100k rows) held as images, then as one packed
+raster and one encoded command stream, does not fit comfortably in a Pi's
+memory. A spool file holds the packed rows instead: rendering appends to it and
+the transport reads bands back through a memory map, so resident memory stays
+at a few bands whatever the job's length. The header also records the encoding
+settings and the last row the printer acknowledged, so a job interrupted by a
+restart can be finished with `printer.print_spool`.
+
+    await printer.print_stream(receipt.iter_blocks(blocks), device, spool="job.spool")
+    # after a crash:
+    await printer.print_spool("job.spool", device)
+
+Layout: a HEADER_SIZE-byte header, then ROW_BYTES per row in printer bit order
+(see `printer.pack`). The file is flushed but not fsynced, so it survives the
+process, not a power cut.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+
+from catprint.printer import PRINTER_WIDTH, ROW_BYTES
+from catprint.raster import PackedRaster
+
+# magic, width, row bytes, flags, rows, rows acknowledged by the printer
+_HEADER = struct.Struct("<4sHHB3xQQ")
+_MAGIC = b"CPS1"
+
+# rows start here, leaving room for the header to grow
+HEADER_SIZE = 64
+
+_FEED_BLANK = 1
+_COMPRESS = 2
+_FINISHED = 4
+
+
+class Spool:
+    """A spool file, usable as a `PrintJob.raster`: `len()` is its size in raster
+    bytes, slicing reads rows from the memory map and `+=` appends packed rows.
+
+    Use `Spool.create` for a new job and `Spool.open` for an existing file.
+    Rendering appends from one thread while bands are read from others, so
+    every access to the file and its map holds a lock.
+    """
+
+    def __init__(self, path: str | os.PathLike, file, flags: int, rows: int, rows_acked: int):
+        self.path = os.fspath(path)
+        self._file = file
+        self._flags = flags
+        self.rows = rows
+        self.rows_acked = rows_acked
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: str | os.PathLike, *, feed_blank: bool = False, compress: bool = False) -> "Spool":
+        spool = cls(path, open(path, "w+b"), _FEED_BLANK * feed_blank | _COMPRESS * compress, 0, 0)
+        spool._file.truncate(HEADER_SIZE)
+        spool._write_header()
+        return spool
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "Spool":
+        file = open(path, "r+b")
+        try:
+            magic, width, row_bytes, flags, rows, rows_acked = _HEADER.unpack(file.read(_HEADER.size))
+        except struct.error:
+            file.close()
+            raise ValueError(f"{os.fspath(path)} is not a print spool") from None
+        if magic != _MAGIC or (width, row_bytes) != (PRINTER_WIDTH, ROW_BYTES):
+            file.close()
+            raise ValueError(f"{os.fspath(path)} is not a print spool for a {PRINTER_WIDTH} px printer")
+        # a row cut short by a crash mid-append is dropped
+        rows = min(rows, (os.fstat(file.fileno()).st_size - HEADER_SIZE) // ROW_BYTES)
+        return cls(path, file, flags, rows, min(rows_acked, rows))
+
+    @property
+    def feed_blank(self) -> bool:
+        return bool(self._flags & _FEED_BLANK)
+
+    @property
+    def compress(self) -> bool:
+        return bool(self._flags & _COMPRESS)
+
+    @property
+    def finished(self) -> bool:
+        """Whether rendering completed, i.e. the spool holds the whole job."""
+        return bool(self._flags & _FINISHED)
+
+    def __len__(self) -> int:
+        return self.rows * ROW_BYTES
+
+    def __getitem__(self, key: slice) -> bytes:
+        with self._lock:
+            start, stop, _ = key.indices(len(self))
+            if stop <= start:
+                return b""
+            if self._map is None or len(self._map) < HEADER_SIZE + stop:
+                # the file has grown since it was mapped
+                if self._map is not None:
+                    self._map.close()
+                self._file.flush()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[HEADER_SIZE + start : HEADER_SIZE + stop]
+
+    def append(self, rows: bytes | bytearray | memoryview | PackedRaster) -> None:
+        """Append packed rows (a whole number of ROW_BYTES rows)."""
+        chunks = rows.rows() if isinstance(rows, PackedRaster) else [rows]
+        with self._lock:
+            self._file.seek(HEADER_SIZE + len(self))
+            for chunk in chunks:
+                if len(chunk) % ROW_BYTES:
+                    raise ValueError(f"Spooled data must be a whole number of {ROW_BYTES}-byte rows")
+                self._file.write(chunk)
+                self.rows += len(chunk) // ROW_BYTES
+            self._write_header()
+
+    def __iadd__(self, rows: bytes | bytearray | memoryview | PackedRaster) -> "Spool":
+        self.append(rows)
+        return self
+
+    def ack(self, rows: int) -> None:
+        """Record that the printer has acknowledged the first `rows` rows."""
+        with self._lock:
+            if rows != self.rows_acked:
+                self.rows_acked = rows
+                self._write_header()
+
+    def finish(self) -> None:
+        """Mark rendering as complete."""
+        with self._lock:
+            self._flags |= _FINISHED
+            self._write_header()
+            self._file.flush()
+
+    def _write_header(self) -> None:
+        header = _HEADER.pack(_MAGIC, PRINTER_WIDTH, ROW_BYTES, self._flags, self.rows, self.rows_acked)
+        self._file.flush()
+        os.pwrite(self._file.fileno(), header, 0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+    def __enter__(self) -> "Spool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
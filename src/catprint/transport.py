@@ -0,0 +1,187 @@
+"""Non-Bluetooth transports for the printer protocol.
+
+`catprint.printer` talks to printers through the small subset of the BleakClient
+API defined by `Transport`. BleakClient is the BLE implementation; the classes here
+let the render -> encode -> send pipeline run where there is no Bluetooth:
+
+- `FileTransport` writes the exact command stream to a file (or os.devnull),
+  for capturing byte streams and for mock printing.
+- `TcpTransport` streams to a local TCP endpoint standing in for a printer and
+  forwards anything it sends back as notifications.
+
+Devices whose address is a `file://` or `tcp://` URL are routed to these
+transports by `for_address`.
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import dataclasses
+import os
+import typing
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+
+class Transport(abc.ABC):
+    """Connection to a printer, shaped like the parts of BleakClient that printer uses.
+
+    Subclasses must implement connecting, disconnecting and writing; one that
+    misses any of them fails when constructed, not halfway through a print.
+    Notifications are optional: transports that forward them set `notifies`
+    and implement `start_notify` / `stop_notify`.
+    """
+
+    # ATT MTU; printer.write_plan sizes chunks from it
+    mtu_size: int | None = None
+    # BleakClient exposes GATT services here; transports without them get plain writes
+    services = None
+    # whether printer.ConnectionPool may keep the connection open between jobs
+    poolable = True
+    # whether start_notify is available; printer sends without flow control otherwise
+    notifies = False
+
+    @property
+    @abc.abstractmethod
+    def is_connected(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    async def connect(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def disconnect(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def write_gatt_char(self, char_specifier, data: bytes, response: bool | None = None) -> None:
+        ...
+
+    async def __aenter__(self) -> "Transport":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        await self.disconnect()
+        return False
+
+
+class FileTransport(Transport):
+    """Write the command stream to `path`, truncating it on connect.
+
+    Not pooled: every job connects, so each file holds exactly one job and is
+    complete on disk once the job returns.
+    """
+
+    poolable = False
+
+    def __init__(self, path: str | os.PathLike, mtu_size: int = 4096):
+        self.path = Path(path)
+        self.mtu_size = mtu_size
+        self._fh: typing.BinaryIO | None = None
+        self.bytes_written = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._fh is not None
+
+    async def connect(self) -> None:
+        if self.path != Path(os.devnull):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "wb")
+
+    async def disconnect(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    async def write_gatt_char(self, char_specifier, data: bytes, response: bool | None = None) -> None:
+        self._fh.write(data)
+        self.bytes_written += len(data)
+
+
+class TcpTransport(Transport):
+    """Stream the command stream to a TCP endpoint standing in for a printer."""
+
+    notifies = True
+
+    def __init__(self, host: str, port: int, mtu_size: int = 512):
+        self.host = host
+        self.port = port
+        self.mtu_size = mtu_size
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._notify_task: asyncio.Task | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def disconnect(self) -> None:
+        await self.stop_notify(None)
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+    async def write_gatt_char(self, char_specifier, data: bytes, response: bool | None = None) -> None:
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def start_notify(self, char_specifier, callback: typing.Callable) -> None:
+        async def _forward():
+            while data := await self._reader.read(512):
+                callback(char_specifier, bytearray(data))
+
+        self._notify_task = asyncio.create_task(_forward())
+
+    async def stop_notify(self, char_specifier) -> None:
+        if self._notify_task is not None:
+            self._notify_task.cancel()
+            try:
+                await self._notify_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._notify_task = None
+
+
+def for_address(address: str) -> Transport | None:
+    """Return the transport for a `file://` or `tcp://` address, None for BLE addresses.
+
+    Raises ValueError for a `tcp://` address without a port.
+    """
+    url = urlparse(address)
+    if url.scheme == "file":
+        return FileTransport(unquote(url.path))
+    if url.scheme == "tcp":
+        if url.port is None:
+            raise ValueError(f"TCP printer address needs a port, e.g. tcp://127.0.0.1:9100, got {address!r}")
+        return TcpTransport(url.hostname or "127.0.0.1", url.port)
+    return None
+
+
+@dataclasses.dataclass
+class SinkDevice:
+    name: str
+    address: str
+
+
+def spool_device(device, directory: str | os.PathLike | None = None, job: str = "job") -> SinkDevice:
+    """Stand-in for `device` that captures its command stream instead of printing.
+
+    The stream goes to `<directory>/<address>-<job>.bin`, or is discarded if no
+    directory is given.
+    """
+    name = getattr(device, "name", "MX06")
+    if directory is None:
+        return SinkDevice(name, f"file://{os.devnull}")
+    address = str(getattr(device, "address", "printer")).replace(":", "")
+    path = Path(directory).resolve() / f"{address}-{job}.bin"
+    return SinkDevice(name, path.as_uri())
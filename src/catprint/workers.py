@@ -0,0 +1,229 @@
+"""Render receipts in worker processes.
+
+PIL dithering, text layout and pdf2image conversion are CPU-bound and hold the
+GIL for much of their time, so rendering in threads still stalls the API's event
+loop. `RenderPool` renders receipt parts (see `receipt.iter_parts`) in a process
+pool and hands back packed 1-bit rasters, 48 bytes per row, rather than pickled
+PIL images; `printer.print_stream` takes those as pages directly.
+
+Rasters come back through shared memory: each part is written into a segment
+the worker creates under a name chosen by this process, and its pages are read
+straight out of it. A segment is unlinked as soon as its last page has been
+consumed, when the job's page iterator is closed (job done or cancelled), or at
+`shutdown`, whichever comes first.
+
+    pool = RenderPool(workers=2)
+    pages = pool.pages(receipt.iter_parts(blocks, template=tpl))
+    await printer.print_stream(pages, device)
+"""
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import typing
+import uuid
+from multiprocessing import shared_memory
+
+from catprint import printer, render
+
+_LOG = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = max((os.cpu_count() or 2) - 1, 1)
+
+# parts rendering ahead of the one being printed, per job
+DEFAULT_LOOKAHEAD = 4
+
+
+def render_packed(part: typing.Callable[[], typing.Iterable]) -> list[bytes]:
+    """Render one receipt part and pack its pages (runs in a worker process)."""
+    return [printer.pack_page(page) for page in part()]
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """This process's font registry and banner cache counters; RenderPool.cache_stats
+    sums them over its workers."""
+    fonts = render.get_fonts()
+    banners = render.get_banners()
+    return {
+        "fonts": {"loaded": len(fonts), "hits": fonts.hits, "loads": fonts.loads, "evictions": fonts.evictions},
+        "banners": {
+            "entries": len(banners),
+            "bytes": banners.nbytes,
+            "hits": banners.hits,
+            "misses": banners.misses,
+            "evictions": banners.evictions,
+        },
+    }
+
+
+def _worker_stats() -> tuple[int, dict[str, dict[str, int]]]:
+    return os.getpid(), cache_stats()
+
+
+def _render_part(part: typing.Callable[[], typing.Iterable], name: str) -> tuple[list[int], int, dict]:
+    """render_shared, plus the worker's pid and cache_stats as of this part."""
+    return (render_shared(part, name), *_worker_stats())
+
+
+def render_shared(part: typing.Callable[[], typing.Iterable], name: str) -> list[int]:
+    """Render one part into a new shared memory segment `name` (runs in a worker process).
+
+    Returns the packed length of each page. The segment is not tracked here: the
+    process that named it owns it and unlinks it.
+    """
+    pages = render_packed(part)
+    size = sum(len(page) for page in pages)
+    shm = shared_memory.SharedMemory(name, create=True, size=max(size, 1), track=False)
+    try:
+        offset = 0
+        for page in pages:
+            shm.buf[offset : offset + len(page)] = page
+            offset += len(page)
+    except BaseException:
+        shm.unlink()
+        raise
+    finally:
+        shm.close()
+    return [len(page) for page in pages]
+
+
+class SharedRaster:
+    """The packed pages of one rendered part, viewed in place in shared memory."""
+
+    def __init__(self, name: str, lengths: list[int]):
+        self.name = name
+        self._shm = shared_memory.SharedMemory(name, track=False)
+        self.pages: list[memoryview] = []
+        offset = 0
+        for length in lengths:
+            self.pages.append(self._shm.buf[offset : offset + length])
+            offset += length
+
+    def release(self) -> None:
+        """Drop the views and free the segment."""
+        for page in self.pages:
+            page.release()
+        self.pages = []
+        try:
+            self._shm.close()
+        except BufferError:
+            # someone still holds a view; the mapping goes when they drop it
+            _LOG.debug("Segment %s still has views", self.name)
+        _unlink(self.name)
+
+
+def _unlink(name: str) -> None:
+    try:
+        shm = shared_memory.SharedMemory(name, track=False)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+class RenderPool:
+    """Process pool rendering receipt parts into packed rasters.
+
+    Workers are started on first use with the "spawn" method; forking the API
+    server (which runs threads and an event loop) is not safe.
+    """
+
+    def __init__(
+        self, workers: int = DEFAULT_WORKERS, lookahead: int = DEFAULT_LOOKAHEAD, banners: typing.Iterable[str] = ()
+    ):
+        self.workers = workers
+        self.lookahead = lookahead
+        # rendered by every worker as it starts (see render.warm_up)
+        self.banners = list(banners)
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        # names of segments that exist, or may be being written by a worker
+        self._segments: set[str] = set()
+        # latest cache_stats of each worker, by pid
+        self._worker_stats: dict[int, dict[str, dict[str, int]]] = {}
+
+    def __len__(self) -> int:
+        """Shared memory segments currently held for jobs."""
+        return len(self._segments)
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            # every worker warms up as it starts, before its first part
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=render.warm_up,
+                initargs=(self.banners,),
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Start (and warm up) the worker processes now instead of on the first job."""
+        executor = self._get_executor()
+        for future in [executor.submit(_worker_stats) for _ in range(self.workers)]:
+            pid, stats = future.result()
+            self._worker_stats[pid] = stats
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """cache_stats summed over the workers, each as of the last part it rendered."""
+        total = {name: dict.fromkeys(counters, 0) for name, counters in cache_stats().items()}
+        for stats in list(self._worker_stats.values()):
+            for name, counters in stats.items():
+                for counter, value in counters.items():
+                    total[name][counter] += value
+        return total
+
+    def pages(self, parts: typing.Iterable[typing.Callable[[], typing.Iterable]]) -> typing.Iterator[memoryview]:
+        """Packed pages of `parts`, in order, rendering up to `lookahead` parts ahead.
+
+        Each page is a view into shared memory that stays valid until the next page
+        is requested; copy it to keep it. Blocks while a part renders, so consume it
+        from a thread (print_stream does). Closing the iterator early frees every
+        segment of the job, including those still being rendered.
+        """
+        executor = self._get_executor()
+        pending: collections.deque[tuple[str, concurrent.futures.Future]] = collections.deque()
+        try:
+            for part in parts:
+                name = f"cp{os.getpid()}_{uuid.uuid4().hex[:8]}"
+                self._segments.add(name)
+                pending.append((name, executor.submit(_render_part, part, name)))
+                if len(pending) > self.lookahead:
+                    yield from self._take(*pending.popleft())
+            while pending:
+                yield from self._take(*pending.popleft())
+        finally:
+            for name, future in pending:
+                if future.cancel():
+                    self._segments.discard(name)
+                else:
+                    future.add_done_callback(lambda _, name=name: self._free(name))
+
+    def _take(self, name: str, future: concurrent.futures.Future) -> typing.Iterator[memoryview]:
+        try:
+            lengths, pid, stats = future.result()
+            self._worker_stats[pid] = stats
+            raster = SharedRaster(name, lengths)
+        except BaseException:
+            self._free(name)
+            raise
+        try:
+            yield from raster.pages
+        finally:
+            raster.release()
+            self._segments.discard(name)
+
+    def _free(self, name: str) -> None:
+        _unlink(name)
+        self._segments.discard(name)
+
+    def shutdown(self) -> None:
+        """Stop the workers and free any segments jobs still hold."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._worker_stats.clear()
+        for name in list(self._segments):
+            self._free(name)
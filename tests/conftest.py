@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a private event loop.
+
+    The loop is closed afterwards, so tests relying on get_event_loop() keep
+    working and nothing leaks between tests.
+    """
+
+    def run(coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    return run
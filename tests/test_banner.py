@@ -0,0 +1,72 @@
+import itertools
+
+from catprint import render
+
+
+def _cells(text, font_size):
+    """The character grid text_banner should produce, sampled pixel by pixel."""
+    font = render.get_fonts().get(render.MONO_FONT, font_size)
+    _, _, char_width, char_height = font.getbbox("#")
+    banner_img = render.banner(text)
+    letters = itertools.cycle(c for c in text if c != " ")
+    return [
+        "".join(
+            " " if banner_img.getpixel((int((x + 0.5) * char_width), int((y + 0.5) * char_height))) else next(letters)
+            for x in range(int(banner_img.width / char_width))
+        )
+        for y in range(int(banner_img.height / char_height))
+    ]
+
+
+def test_text_banner_fills_the_banner_with_its_letters():
+    import PIL.Image
+
+    for text, size in [("SALE", 18), ("FREE COFFEE", 14), ("Dík", 22)]:
+        font = render.get_fonts().get(render.MONO_FONT, size)
+        char_height = font.getbbox("#")[3]
+        img = render.text_banner(text, font_size=size)
+        expected = PIL.Image.new("1", img.size, color="white")
+        atlas = render.get_fonts().atlas(render.MONO_FONT, size)
+        for y, line in enumerate(_cells(text, size)):
+            atlas.draw(expected, (0, y * char_height), line)
+        assert img.tobytes() == expected.tobytes(), text
+
+
+def test_banners_are_cached_and_copied():
+    cache = render.BannerCache()
+    render.set_banners(cache)
+    try:
+        first = render.text_banner("SALE")
+        first.paste(0, (0, 0, first.width, 20))
+        again = render.text_banner("SALE")
+        assert cache.hits == 1 and len(cache) == 2  # the banner and its text banner
+        assert again.tobytes() != first.tobytes()
+        assert render.banner("SALE").tobytes() == render._render_banner("SALE").tobytes()
+        render.text_banner("SALE", font_size=14)
+        assert len(cache) == 3
+    finally:
+        render.set_banners(None)
+
+
+def test_banner_cache_evicts_by_size():
+    sale = render._render_banner("SALE")
+    size = sale.width * sale.height
+    cache = render.BannerCache(max_bytes=2 * size)
+    for text in ("SALE", "SALE!", "SALE?"):
+        cache.get(("banner", text), lambda text=text: render._render_banner(text))
+    assert cache.evictions >= 1 and cache.nbytes <= 2 * size
+    assert ("banner", "SALE") not in cache._entries
+    # bigger than the whole cache: returned but not kept
+    assert cache.get(("big",), lambda: sale.resize((sale.width * 3, sale.height))).width == sale.width * 3
+    assert ("big",) not in cache._entries
+
+
+def test_warm_up_renders_banners():
+    cache = render.BannerCache()
+    render.set_banners(cache)
+    try:
+        render.warm_up(["FREE COFFEE"])
+        render.text_banner("FREE COFFEE")
+        assert (cache.misses, cache.hits) == (2, 1)
+    finally:
+        render.set_banners(None)
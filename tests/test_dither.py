@@ -0,0 +1,65 @@
+import PIL.Image
+import pytest
+
+from catprint import dither, render
+
+
+def _white(img):
+    return img.convert("L").histogram()[255]
+
+
+def test_bayer_map():
+    assert list(dither.bayer_map(2).tobytes()) == [1, 128, 192, 64]
+    assert sorted(dither.bayer_map(8).tobytes()) == [1 + rank * 255 // 64 for rank in range(64)]
+    with pytest.raises(ValueError):
+        dither.bayer_map(6)
+
+
+def test_blue_noise_map_ranks_every_pixel_once():
+    tile = dither.blue_noise_map(16)
+    assert sorted(tile.tobytes()) == [1 + rank * 255 // 256 for rank in range(256)]
+    assert dither.blue_noise_map(16) is tile
+
+
+def test_engines_keep_black_white_and_tone():
+    for name in dither.ENGINES:
+        for level in (0, 64, 128, 192, 255):
+            flat = PIL.Image.new("L", (128, 128), level)
+            img = dither.dither(flat, name)
+            assert img.mode == "1" and img.size == flat.size
+            share = _white(img) / (128 * 128)
+            if level in (0, 255):
+                assert share == level / 255, (name, level)
+            elif name != "atkinson":  # atkinson drops a quarter of the error, so it is contrastier
+                assert abs(share - level / 255) < 0.02, (name, level, share)
+
+
+def test_ordered_dithers_are_tileable():
+    gradient = PIL.Image.linear_gradient("L").resize((render.PRINTER_WIDTH, 1500))
+    for name in ("bayer", "blue-noise"):
+        whole = dither.dither(gradient, name)
+        strip = dither.dither(gradient.crop((0, 1024, gradient.width, 1280)), name)
+        assert strip.tobytes() == whole.crop((0, 1024, whole.width, 1280)).tobytes(), name
+
+
+def test_only_one_tile_row_is_kept_per_width():
+    dither._strip.cache_clear()
+    dither.bayer(PIL.Image.new("L", (render.PRINTER_WIDTH, 5000), 128))
+    assert dither._strip.cache_info().currsize == 1
+    assert dither._strip(dither.bayer_map, dither.BAYER_SIZE, render.PRINTER_WIDTH).size == (render.PRINTER_WIDTH, 8)
+
+
+def test_atkinson_keeps_light_backgrounds_clean():
+    light = PIL.Image.new("L", (render.PRINTER_WIDTH, 64), 240)
+    assert _white(dither.atkinson(light)) == light.width * light.height
+    assert _white(dither.floyd_steinberg(light)) < light.width * light.height
+
+
+def test_image_page_dither_modes():
+    img = PIL.Image.radial_gradient("L").resize((600, 400)).convert("RGB")
+    assert render.image_page(img).tobytes() == render.image_page(img, dither="floyd-steinberg").tobytes()
+    for name in dither.ENGINES:
+        assert render.photo(img, dither=name).size == (render.PRINTER_WIDTH, 256)
+    assert render.pdf_page(img, dither="bayer").tobytes() != render.pdf_page(img).tobytes()
+    with pytest.raises(ValueError, match="blue-noise"):
+        render.image_page(img, dither="halftone")
@@ -0,0 +1,60 @@
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import emulator, printer
+
+
+def _receipt(height=120):
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, height), color="white")
+    draw = PIL.ImageDraw.Draw(img)
+    for y in range(0, height - 10, 30):
+        draw.text((4, y), f"line {y} of the emulated receipt", fill="black")
+    return img
+
+
+async def _print(fleet, img, **kwargs):
+    device = type("D", (), {"name": "MX06", "address": "EM:01"})()
+    pool = printer.ConnectionPool(factory=fleet)
+    await printer.print(img, device=device, pool=pool, **kwargs)
+    unit = fleet.printers["EM:01"]
+    await unit.wait_idle()
+    await pool.close()
+    return unit
+
+
+def test_emulator_reconstructs_printed_bitmap(run):
+    img = _receipt()
+    unit = run(_print(emulator.EmulatorFleet(feed_rate=5000, link_rate=1e6), img))
+    assert unit.stats.crc_errors == 0 and unit.stats.overruns == 0
+    assert printer.pack(unit.image()) == printer.pack(img)
+    assert unit.settings["SET_ENERGY"] == (17500).to_bytes(2, "little")
+
+
+def test_emulator_decodes_feeds_and_compressed_lines(run):
+    img = _receipt()
+    unit = run(_print(emulator.EmulatorFleet(feed_rate=5000, link_rate=1e6), img, feed_blank=True, compress=True))
+    assert printer.pack(unit.image()) == printer.pack(img)
+
+
+def test_flow_control_prevents_overruns(run):
+    settings = dict(feed_rate=400, link_rate=1e6, buffer_size=1024)
+    paced = run(_print(emulator.EmulatorFleet(**settings), _receipt(200)))
+    assert paced.stats.pauses > 0
+    assert paced.stats.overruns == 0
+    assert paced.stats.rows_per_second > 0
+
+    blind = run(_print(emulator.EmulatorFleet(flow_control=False, **settings), _receipt(200)))
+    assert blind.stats.overruns > 0
+
+
+def test_corrupted_frames_are_counted(run):
+    unit = emulator.EmulatedPrinter(link_rate=1e6)
+    frame = bytearray(printer.Command.DRAW_BITMAP.format(bytes(printer.ROW_BYTES)))
+    frame[-2] ^= 0xFF
+
+    async def main():
+        async with unit:
+            await unit.write_gatt_char(printer.PRINT_CHARACTERISTIC, bytes(frame), response=False)
+
+    run(main())
+    assert unit.stats.frames == 1 and unit.stats.crc_errors == 1
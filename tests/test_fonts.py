@@ -0,0 +1,88 @@
+from catprint import render
+
+
+def test_registry_loads_each_font_once():
+    fonts = render.FontRegistry()
+    first = fonts.get(render.MONO_FONT, 18)
+    assert fonts.get(render.MONO_FONT, 18) is first
+    assert fonts.get(render.MONO_FONT, 20) is not first
+    assert (fonts.loads, fonts.hits, len(fonts)) == (2, 1, 2)
+
+
+def test_registry_evicts_least_recently_used():
+    fonts = render.FontRegistry(max_fonts=2)
+    small = fonts.get(render.MONO_FONT, 10)
+    fonts.get(render.MONO_FONT, 11)
+    fonts.get(render.MONO_FONT, 10)
+    fonts.get(render.MONO_FONT, 12)
+    assert fonts.evictions == 1 and len(fonts) == 2
+    assert fonts.get(render.MONO_FONT, 10) is small
+    fonts.get(render.MONO_FONT, 11)
+    assert fonts.loads == 4
+
+
+def test_renders_share_preloaded_fonts():
+    fonts = render.FontRegistry()
+    render.set_fonts(fonts)
+    try:
+        render.preload_fonts()
+        loads = fonts.loads
+        assert loads == len(render.BUNDLED_FONTS)
+        first = render.text("Příliš žluťoučký kůň")
+        render.text_banner("HI")
+        render.id_card("Company", "Name", description="About")
+        assert fonts.loads == loads and fonts.hits > 0
+        assert render.text("Příliš žluťoučký kůň").tobytes() == first.tobytes()
+    finally:
+        render.set_fonts(None)
+
+
+def _freetype_line(font, line):
+    import PIL.Image
+    import PIL.ImageDraw
+
+    img = PIL.Image.new("1", (render.PRINTER_WIDTH, 3 * font.size), color="white")
+    PIL.ImageDraw.Draw(img).text((0, 4), line, fill="black", font=font)
+    return img
+
+
+def _atlas_line(atlas, line):
+    import PIL.Image
+
+    img = PIL.Image.new("1", (render.PRINTER_WIDTH, 3 * atlas.font.size), color="white")
+    atlas.draw(img, (0, 4), line)
+    return img
+
+
+def test_atlas_matches_freetype():
+    lines = [
+        "Příliš žluťoučký kůň úpěl ďábelské ódy",
+        "Total: 129,90 Kč (DPH 21 %) #42 @home",
+        "Avocado_toast x2 > 1",
+        ">", "_", "A", "ě", "__ __", "   ", "",
+        "שלום abc",  # right-to-left: FreeType draws it
+        "e\u0301",  # combining mark: FreeType draws it
+    ]
+    for size in (12, 16, 18, 22):
+        fonts = render.FontRegistry()
+        font, atlas = fonts.get(render.MONO_FONT, size), fonts.atlas(render.MONO_FONT, size)
+        for line in lines:
+            assert _atlas_line(atlas, line).tobytes() == _freetype_line(font, line).tobytes(), (size, line)
+
+
+def test_text_uses_the_atlas():
+    fonts = render.FontRegistry()
+    render.set_fonts(fonts)
+    try:
+        render.text("Hello\nHello")
+        assert len(fonts.atlas(render.MONO_FONT, 18)) == len(set("Hello"))
+    finally:
+        render.set_fonts(None)
+
+
+def test_atlas_is_dropped_with_its_font():
+    fonts = render.FontRegistry(max_fonts=1)
+    atlas = fonts.atlas(render.MONO_FONT, 18)
+    assert fonts.atlas(render.MONO_FONT, 18) is atlas
+    fonts.get(render.MONO_FONT, 20)
+    assert fonts.atlas(render.MONO_FONT, 18) is not atlas
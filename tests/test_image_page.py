@@ -0,0 +1,94 @@
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageEnhance
+
+from catprint import render
+from catprint.raster import PackedRaster
+
+
+def _pillow_chain(image, *, dither=True, contrast=1.2, sharpen=True, threshold=212):
+    """image_page as it was: one Pillow stage (and one full image) per step."""
+    if image.width > render.PRINTER_WIDTH:
+        image = image.resize((render.PRINTER_WIDTH, int(image.height * render.PRINTER_WIDTH / image.width)), render.LANCZOS)
+    image = image.convert("L")
+    if contrast != 1.0:
+        image = PIL.ImageEnhance.Contrast(image).enhance(contrast)
+    if sharpen:
+        image = PIL.ImageEnhance.Sharpness(image).enhance(1.5)
+    if dither:
+        return image.convert("1")
+    return image.point(lambda x: 0 if x < threshold else 255, mode="1")
+
+
+def _photo():
+    size = (900, 600)
+    gradient = PIL.Image.radial_gradient("L").resize(size)
+    noise = PIL.Image.effect_noise(size, 40)
+    return PIL.Image.merge("RGB", (PIL.Image.effect_mandelbrot(size, (-2, -1.5, 1, 1.5), 100), PIL.Image.blend(noise, gradient, 0.5), gradient))
+
+
+def _pdf_page():
+    img = PIL.Image.new("RGB", (1240, 600), "white")
+    draw = PIL.ImageDraw.Draw(img)
+    font = render.get_fonts().get(render.MONO_FONT, 28)
+    for y in range(40, 560, 40):
+        draw.text((80, y), "Faktura č. 2024-0815  Total 129,90 Kč  DPH 21 %", fill=(40, 40, 40), font=font)
+    return img
+
+
+def _black(img):
+    return sum(bin(b).count("1") for b in PackedRaster.from_image(img).tobytes())
+
+
+def test_image_page_matches_the_pillow_chain():
+    for image in (_photo(), _pdf_page(), _photo().convert("L"), _photo().convert("P")):
+        for options in (
+            dict(dither=False),
+            dict(dither=False, contrast=1.5),
+            dict(dither=False, contrast=1.6, threshold=160),
+            dict(dither=False, contrast=1.1, sharpen=False),
+            dict(dither=False, contrast=1.0, sharpen=False),
+        ):
+            fused, reference = render.image_page(image, **options), _pillow_chain(image, **options)
+            assert fused.mode == "1" and fused.size == reference.size
+            diff = sum(bin(a ^ b).count("1") for a, b in zip(fused.tobytes(), reference.tobytes()))
+            # rounding in the fused sharpen flips pixels sitting right at the threshold
+            assert diff <= fused.width * fused.height // 500, (image.mode, options, diff)
+
+
+def test_unsharpened_gray_image_page_is_exact():
+    for image in (_photo().convert("L"), _pdf_page().convert("L"), _photo().resize((2000, 1333)).convert("L")):
+        for options in (dict(contrast=1.1), dict(contrast=1.5, threshold=128), dict(contrast=1.0, threshold=128)):
+            options.update(dither=False, sharpen=False)
+            assert render.image_page(image, **options).tobytes() == _pillow_chain(image, **options).tobytes(), options
+
+
+def test_unsharpened_downscaled_image_page_stays_within_half_a_percent():
+    # gray before the resize, and the box reduce, round differently from the old chain
+    for image in (_photo(), _photo().resize((3000, 2000)), _photo().resize((3000, 2000)).convert("L")):
+        for options in (dict(contrast=1.0, threshold=128), dict(contrast=1.5, threshold=128), dict(contrast=1.1)):
+            options.update(dither=False, sharpen=False)
+            fused, reference = render.image_page(image, **options), _pillow_chain(image, **options)
+            diff = sum(bin(a ^ b).count("1") for a, b in zip(fused.tobytes(), reference.tobytes()))
+            assert diff <= fused.width * fused.height // 200, (image.size, image.mode, options, diff)
+
+
+def test_dithered_image_page_keeps_its_tone():
+    for image in (_photo(), _pdf_page()):
+        for options in (dict(), dict(contrast=1.1, sharpen=False)):
+            fused, reference = render.image_page(image, **options), _pillow_chain(image, **options)
+            assert abs(_black(fused) - _black(reference)) <= fused.width * fused.height // 200, options
+
+
+def test_image_page_packed():
+    image = _pdf_page()
+    raster = render.image_page(image, dither=False, packed=True)
+    assert isinstance(raster, PackedRaster)
+    assert raster == PackedRaster.from_image(render.image_page(image, dither=False))
+
+
+def test_threshold_tables_are_bounded():
+    image = _pdf_page()
+    for threshold in range(100, 200):
+        render.image_page(image, dither=False, sharpen=False, threshold=threshold + 0.5)
+    assert render._threshold_lut.cache_info().currsize <= 16
@@ -0,0 +1,84 @@
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import printer, transport
+
+
+def _coupon(text="COUPON -10%"):
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, 120), color="white")
+    PIL.ImageDraw.Draw(img).text((10, 40), text, fill="black")
+    return img
+
+
+def _job(img, **settings):
+    return printer.PrintJob(printer.pack(img), **settings)
+
+
+def test_repeat_job_is_served_from_cache():
+    cache = printer.JobCache()
+    first = _job(_coupon(), feed_blank=True)
+    expected = first.stream()
+    assert cache.stream(_job(_coupon(), feed_blank=True)) == expected
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    again = _job(_coupon(), feed_blank=True)
+    assert cache.stream(again) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again.stats == first.stats
+
+
+def test_settings_and_content_are_part_of_the_key():
+    cache = printer.JobCache()
+    cache.stream(_job(_coupon()))
+    cache.stream(_job(_coupon(), feed_blank=True))
+    cache.stream(_job(_coupon(), compress=True))
+    cache.stream(_job(_coupon("COUPON -20%")))
+    assert cache.misses == 4 and cache.hits == 0
+
+
+def test_cache_evicts_least_recently_used():
+    a, b, c = (_job(_coupon(t)) for t in "abc")
+    size = len(a.stream()[0])
+    cache = printer.JobCache(max_bytes=2 * size + size // 2)
+    cache.stream(a)
+    cache.stream(b)
+    cache.stream(a)
+    cache.stream(c)
+    assert cache.key(a) in cache and cache.key(c) in cache
+    assert cache.key(b) not in cache
+    assert cache.evictions == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    job = _job(_coupon(), compress=True)
+    expected = job.stream()
+    printer.JobCache(directory=tmp_path).stream(_job(_coupon(), compress=True))
+
+    fresh = printer.JobCache(directory=tmp_path)
+    again = _job(_coupon(), compress=True)
+    assert fresh.stream(again) == expected
+    assert (fresh.disk_hits, fresh.misses) == (1, 0)
+    assert again.stats == job.stats
+
+
+def test_disk_tier_is_trimmed(tmp_path):
+    cache = printer.JobCache(directory=tmp_path, max_disk_bytes=1)
+    cache.stream(_job(_coupon("a")))
+    cache.stream(_job(_coupon("b")))
+    assert list(tmp_path.glob("*.job")) == []
+
+
+def test_print_uses_cache(run, tmp_path):
+    cache = printer.JobCache()
+    device = transport.SinkDevice("MX06", (tmp_path / "out.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        for _ in range(3):
+            await printer.print(_coupon(), device=device, pool=pool, cache=cache)
+            # each job rewrites the sink file with exactly its own stream
+            assert (tmp_path / "out.bin").read_bytes() == printer.encode(_coupon())
+        await pool.close()
+
+    run(main())
+    assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,82 @@
+import random
+
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import printer
+
+
+def _rows(raster):
+    return [raster[i : i + printer.ROW_BYTES] for i in range(0, len(raster), printer.ROW_BYTES)]
+
+
+def test_rle_round_trip_on_text_like_rows():
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, 40), color="white")
+    PIL.ImageDraw.Draw(img).text((3, 5), "Hello receipt 123", fill="black")
+    PIL.ImageDraw.Draw(img).rectangle([0, 30, 383, 39], fill="black")
+    for row in _rows(printer.pack(img)):
+        assert printer.rle_decode_row(printer.rle_encode_row(row)) == row
+
+
+def test_rle_round_trip_on_noise():
+    rnd = random.Random(5)
+    for _ in range(20):
+        row = rnd.randbytes(printer.ROW_BYTES)
+        assert printer.rle_decode_row(printer.rle_encode_row(row)) == row
+
+
+def test_long_runs_are_split_at_127_pixels():
+    assert printer.rle_encode_row(bytes(printer.ROW_BYTES)) == bytes([0x7F, 0x7F, 0x7F, 3])
+    assert printer.rle_encode_row(b"\xff" * printer.ROW_BYTES) == bytes([0xFF, 0xFF, 0xFF, 0x83])
+
+
+def test_compress_falls_back_to_raw_lines():
+    rnd = random.Random(6)
+    noisy = rnd.randbytes(printer.ROW_BYTES)
+    sparse = b"\x01" + bytes(printer.ROW_BYTES - 1)
+    stats = printer.EncodeStats()
+    data = printer.encode_rows(noisy + sparse + noisy, compress=True, stats=stats)
+
+    assert data == b"".join(
+        (
+            printer.encode_rows(noisy),
+            printer.Command.DRAW_COMPRESSED_BITMAP.format(printer.rle_encode_row(sparse)),
+            printer.encode_rows(noisy),
+        )
+    )
+    assert stats.compressed_rows == 1
+    assert stats.bytes_saved > 0
+
+
+def test_capability_flag_disables_compression(run, monkeypatch):
+    written = []
+
+    class Client:
+        def __init__(self, device):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def write_gatt_char(self, uuid, data):
+            written.append(bytes(data))
+
+    monkeypatch.setattr(printer, "BleakClient", Client)
+    monkeypatch.setattr(printer, "_capabilities", {})
+    printer.set_capabilities("AA:NO", printer.Capabilities(compressed_bitmap=False))
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, 2), color="white")
+    device = type("D", (), {"name": "MX06", "address": "AA:NO"})()
+
+    stats = run(printer.print(img, device=device, compress=True, pool=printer.ConnectionPool()))
+    assert stats.compressed_rows == 0
+    assert b"".join(written) == printer.encode(img)
+
+
+def test_only_known_models_compress():
+    unknown = type("D", (), {"name": "GB02", "address": "AA:UN"})()
+    known = type("D", (), {"name": "MX06", "address": "AA:KN"})()
+    assert not printer.get_capabilities(unknown).compressed_bitmap
+    assert printer.get_capabilities(known).compressed_bitmap
@@ -0,0 +1,86 @@
+import random
+
+import crc8
+import PIL.Image
+
+from catprint import printer
+from catprint.compat import batched, FLIP_LEFT_RIGHT
+
+
+def _legacy_encode(img):
+    # the per-row encoder printer.print used before encode() existed
+    return b"".join(
+        (
+            printer.Command.SET_QUALITY.format(b"\x33"),
+            printer.Command.CONTROL_LATTICE.format(b"\xaa\x55\x17\x38\x44\x5f\x5f\x5f\x44\x38\x2c"),
+            printer.Command.SET_ENERGY.format(17500),
+            printer.Command.DRAWING_MODE.format(b"\x00"),
+            printer.Command.OTHER_FEED_PAPER.format(b"\0x23"),
+            *(
+                printer.Command.DRAW_BITMAP.format(bytes(reversed(chunk)))
+                for chunk in batched(
+                    img.convert("RGB").convert("1").point(lambda p: 255 - p).transpose(FLIP_LEFT_RIGHT).tobytes(),
+                    printer.PRINTER_WIDTH // 8,
+                )
+            ),
+            printer.Command.CONTROL_LATTICE.format(b"\xaa\x55\x17\x00\x00\x00\x00\x00\x00\x00\x17"),
+            printer.Command.FEED_PAPER.format(50),
+        )
+    )
+
+
+def _noise(mode, height=37, seed=1):
+    rnd = random.Random(seed)
+    img = PIL.Image.new("L", (printer.PRINTER_WIDTH, height))
+    img.putdata([rnd.randrange(256) for _ in range(img.width * img.height)])
+    return img.convert(mode)
+
+
+def test_encode_matches_legacy_for_1bit_image():
+    img = _noise("1")
+    assert printer.encode(img) == _legacy_encode(img)
+
+
+def test_encode_matches_legacy_for_rgb_and_gray_images():
+    for mode in ("L", "RGB"):
+        img = _noise(mode, seed=2)
+        assert printer.encode(img) == _legacy_encode(img)
+
+
+def test_crc8_rows_matches_crc8_module():
+    rnd = random.Random(3)
+    raster = bytes(rnd.randrange(256) for _ in range(printer.ROW_BYTES * 20))
+    expected = b"".join(
+        crc8.crc8(raster[i : i + printer.ROW_BYTES]).digest() for i in range(0, len(raster), printer.ROW_BYTES)
+    )
+    assert printer.crc8_rows(raster) == expected
+
+
+def test_encode_rows_empty():
+    assert printer.encode_rows(b"") == b""
+
+
+def test_feed_blank_replaces_blank_runs_with_feeds():
+    blank = bytes(printer.ROW_BYTES)
+    ink = b"\x01" * printer.ROW_BYTES
+    raster = blank * 3 + ink + blank * 10 + ink * 2
+    stats = printer.EncodeStats()
+    data = printer.encode_rows(raster, feed_blank=True, stats=stats)
+
+    assert data == b"".join(
+        (
+            printer.Command.FEED_PAPER.format(3),
+            printer.encode_rows(ink),
+            printer.Command.FEED_PAPER.format(10),
+            printer.encode_rows(ink * 2),
+        )
+    )
+    assert stats.rows == 16 and stats.blank_rows == 13
+    assert stats.bytes_saved == len(printer.encode_rows(raster)) - len(data)
+
+
+def test_feed_blank_off_keeps_stream_and_reports_no_savings():
+    img = _noise("1")
+    stats = printer.EncodeStats()
+    assert printer.encode(img, stats=stats) == _legacy_encode(img)
+    assert stats.bytes_saved == 0
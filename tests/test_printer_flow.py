@@ -0,0 +1,77 @@
+import asyncio
+
+from catprint import printer
+
+PAUSE = bytes.fromhex("5178ae0101001070ff")
+RESUME = bytes.fromhex("5178ae0101000000ff")
+
+
+class NotifyingClient:
+    """Signals a full buffer after `pause_after` writes and resumes `resume_in` seconds later."""
+
+    def __init__(self, pause_after=3, resume_in=0.05):
+        self.pause_after = pause_after
+        self.resume_in = resume_in
+        self.callback = None
+        self.writes = []
+        self.paused_at = None
+        self.resumed_at = None
+
+    async def start_notify(self, uuid, callback):
+        self.callback = callback
+
+    async def stop_notify(self, uuid):
+        self.callback = None
+
+    async def write_gatt_char(self, uuid, data):
+        loop = asyncio.get_running_loop()
+        self.writes.append((loop.time(), bytes(data)))
+        if bytes(data) == printer.Command.GET_DEV_STATE.format(b"\x00"):
+            self.callback(None, bytearray(b"Qx\xa3\x01\x03\x00\x01\x00\x00\x00\xff"))
+        elif len(self.writes) == self.pause_after:
+            self.callback(None, bytearray(PAUSE))
+            self.paused_at = loop.time()
+            loop.call_later(self.resume_in, self._resume)
+        await asyncio.sleep(0)
+
+    def _resume(self):
+        self.resumed_at = asyncio.get_running_loop().time()
+        self.callback(None, bytearray(RESUME))
+
+
+def test_parse_flow_control_notifications():
+    note = printer.parse_notification(PAUSE)
+    assert note.command == 0xAE and note.payload == b"\x10"
+    assert printer.parse_notification(b"garbage") is None
+
+
+def test_send_waits_for_resume(run):
+    client = NotifyingClient()
+
+    async def main():
+        flow = await printer.start_flow_control(client)
+        await printer.send(client, bytes(64 * 8), flow=flow)
+        return flow
+
+    flow = run(main())
+    assert flow.pauses == 1 and not flow.paused
+    assert flow.state.out_of_paper
+    after_pause = [t for t, _ in client.writes[3:]]
+    assert after_pause and min(after_pause) >= client.resumed_at
+    assert b"".join(d for _, d in client.writes[1:]) == bytes(64 * 8)
+
+
+def test_pause_times_out(run):
+    flow = printer.FlowControl()
+    flow(None, PAUSE)
+    assert flow.paused
+    run(flow.wait(timeout=0.01))
+    assert not flow.paused
+
+
+def test_clients_without_notify_fall_back_to_pacing(run):
+    class Plain:
+        async def write_gatt_char(self, uuid, data):
+            pass
+
+    assert run(printer.start_flow_control(Plain())) is None
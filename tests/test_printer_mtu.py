@@ -0,0 +1,49 @@
+import asyncio
+import types
+
+from catprint import printer
+
+
+class FakeLink:
+    """Client double with an MTU, characteristic properties and a per-write latency."""
+
+    def __init__(self, mtu=185, properties=("write", "write-without-response"), latency=0.0):
+        self.mtu_size = mtu
+        char = types.SimpleNamespace(properties=list(properties), max_write_without_response_size=mtu - 3)
+        self.services = types.SimpleNamespace(get_characteristic=lambda uuid: char)
+        self.latency = latency
+        self.writes = []
+
+    async def write_gatt_char(self, uuid, data, response=None):
+        self.writes.append((bytes(data), response))
+        await asyncio.sleep(self.latency() if callable(self.latency) else self.latency)
+
+
+def test_chunks_follow_mtu_and_skip_responses(run):
+    client = FakeLink(mtu=185)
+    data = bytes(range(256)) * 4
+    run(printer.send(client, data))
+
+    assert b"".join(w for w, _ in client.writes) == data
+    assert {len(w) for w, _ in client.writes[:-1]} == {182}
+    assert all(response is False for _, response in client.writes)
+
+
+def test_write_with_response_when_required():
+    client = FakeLink(mtu=100, properties=("write",))
+    assert printer.write_plan(client) == (97, True)
+
+
+def test_unknown_mtu_falls_back_to_default_chunk():
+    assert printer.write_plan(object()) == (printer.DEFAULT_CHUNK_SIZE, True)
+
+
+def test_pacer_backs_off_on_slow_writes_and_recovers():
+    pacer = printer.Pacer()
+    pacer.record(0.001)
+    assert pacer.delay == 0
+    pacer.record(0.05)
+    assert pacer.delay > 0 and pacer.backoffs == 1
+    for _ in range(50):
+        pacer.record(0.001)
+    assert pacer.delay == 0
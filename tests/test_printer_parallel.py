@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from PIL import Image
+
+
+class SlowClient:
+    connecting = 0
+    max_connecting = 0
+
+    def __init__(self, device):
+        self.device = device
+
+    async def __aenter__(self):
+        SlowClient.connecting += 1
+        SlowClient.max_connecting = max(SlowClient.max_connecting, SlowClient.connecting)
+        await asyncio.sleep(0.01)
+        SlowClient.connecting -= 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def write_gatt_char(self, uuid, data):
+        await asyncio.sleep(0.01)
+
+
+def _device(address):
+    return type("D", (), {"name": "MX06", "address": address})()
+
+
+def test_printers_transfer_in_parallel(run, monkeypatch):
+    from catprint import printer
+
+    monkeypatch.setattr(printer, "BleakClient", SlowClient)
+    SlowClient.max_connecting = 0
+    img = Image.new("1", (printer.PRINTER_WIDTH, 24), color="white")
+
+    async def timed(addresses):
+        pool = printer.ConnectionPool()
+        start = time.perf_counter()
+        await asyncio.gather(*(printer.print(img, device=_device(a), pool=pool) for a in addresses))
+        elapsed = time.perf_counter() - start
+        await pool.close()
+        return elapsed
+
+    one = run(timed(["AA:01"]))
+    four = run(timed(["AA:01", "AA:02", "AA:03", "AA:04"]))
+
+    # connects are still serialized, but transfers overlap
+    assert SlowClient.max_connecting == 1
+    assert four < one * 2
+
+
+def test_same_printer_jobs_are_serialized(run, monkeypatch):
+    from catprint import printer
+
+    active = {"now": 0, "max": 0}
+
+    class TrackingClient(SlowClient):
+        async def write_gatt_char(self, uuid, data):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.001)
+            active["now"] -= 1
+
+    monkeypatch.setattr(printer, "BleakClient", TrackingClient)
+    img = Image.new("1", (printer.PRINTER_WIDTH, 4), color="white")
+
+    async def main():
+        pool = printer.ConnectionPool()
+        await asyncio.gather(*(printer.print(img, device=_device("AA:01"), pool=pool) for _ in range(3)))
+        await pool.close()
+
+    run(main())
+    assert active["max"] == 1
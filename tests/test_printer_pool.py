@@ -0,0 +1,89 @@
+import asyncio
+
+from PIL import Image
+
+
+class CountingClient:
+    instances = []
+
+    def __init__(self, device):
+        self.device = device
+        self.is_connected = True
+        self.closed = False
+        self.writes = 0
+        CountingClient.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+        self.is_connected = False
+        return False
+
+    async def write_gatt_char(self, uuid, data):
+        self.writes += 1
+
+
+def _device(address="AA:BB"):
+    return type("D", (), {"name": "MX06", "address": address})()
+
+
+def _patch(monkeypatch):
+    from catprint import printer
+
+    CountingClient.instances = []
+    monkeypatch.setattr(printer, "BleakClient", CountingClient)
+    return printer
+
+
+def test_pool_reuses_link_between_jobs(run, monkeypatch):
+    printer = _patch(monkeypatch)
+    img = Image.new("1", (printer.PRINTER_WIDTH, 4), color="white")
+
+    async def main():
+        pool = printer.ConnectionPool(idle_ttl=60)
+        await printer.print(img, device=_device(), pool=pool)
+        await printer.print(img, device=_device(), pool=pool)
+        assert "AA:BB" in pool
+        await pool.close()
+        return pool
+
+    pool = run(main())
+    assert len(CountingClient.instances) == 1
+    assert CountingClient.instances[0].closed
+    assert len(pool) == 0
+
+
+def test_pool_reconnects_stale_link(run, monkeypatch):
+    printer = _patch(monkeypatch)
+    img = Image.new("1", (printer.PRINTER_WIDTH, 4), color="white")
+
+    async def main():
+        pool = printer.ConnectionPool(idle_ttl=60)
+        await printer.print(img, device=_device(), pool=pool)
+        CountingClient.instances[0].is_connected = False
+        await printer.print(img, device=_device(), pool=pool)
+        await pool.close()
+
+    run(main())
+    assert len(CountingClient.instances) == 2
+    assert CountingClient.instances[1].writes > 0
+
+
+def test_pool_closes_idle_links(run, monkeypatch):
+    from catprint import printer
+
+    CountingClient.instances = []
+    monkeypatch.setattr(printer, "BleakClient", CountingClient)
+
+    async def main():
+        pool = printer.ConnectionPool(idle_ttl=0.01)
+        async with pool.connection(_device()):
+            pass
+        assert "AA:BB" in pool
+        await asyncio.sleep(0.05)
+        assert "AA:BB" not in pool
+
+    run(main())
+    assert CountingClient.instances[0].closed
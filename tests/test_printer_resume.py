@@ -0,0 +1,77 @@
+import PIL.Image
+import PIL.ImageDraw
+
+from catprint import emulator, printer
+
+
+def _tall_receipt(rows=600):
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, rows), color="white")
+    draw = PIL.ImageDraw.Draw(img)
+    for y in range(0, rows, 20):
+        draw.text((4, y), f"row {y}", fill="black")
+    return img
+
+
+class DroppingPrinter(emulator.EmulatedPrinter):
+    """Emulated unit whose first link drops after `drop_after` bytes."""
+
+    def __init__(self, device=None, drop_after=20_000, **kwargs):
+        super().__init__(device, **kwargs)
+        self.drop_after = drop_after
+        self.links = 0
+        self.sent_per_link = []
+
+    async def connect(self):
+        await super().connect()
+        self.links += 1
+        self.sent_per_link.append(0)
+
+    async def write_gatt_char(self, char_specifier, data, response=None):
+        if self.links == 1 and self.sent_per_link[-1] + len(data) > self.drop_after:
+            self._connected = False
+            raise printer.BleakError("Disconnected")
+        await super().write_gatt_char(char_specifier, data, response)
+        self.sent_per_link[-1] += len(data)
+
+
+def test_job_resumes_from_last_acknowledged_row(run, monkeypatch):
+    monkeypatch.setattr(printer.asyncio, "sleep", _fast_backoff(printer.asyncio.sleep))
+    img = _tall_receipt()
+    unit = DroppingPrinter(feed_rate=50_000, link_rate=5e6)
+    device = type("D", (), {"name": "MX06", "address": "EM:DROP"})()
+
+    async def main():
+        await printer.print(img, device=device, pool=printer.ConnectionPool(factory=lambda d: unit), resume_overlap=4)
+        await unit.wait_idle()
+
+    run(main())
+
+    assert unit.links == 2
+    full = len(printer.encode(img))
+    # the second link only carried the tail of the job, not a full reprint
+    assert unit.sent_per_link[1] < full - unit.drop_after + printer.BAND_ROWS * 60
+    printed = printer.pack(unit.image())
+    # resumed rows overlap the first attempt by less than a band plus the overlap
+    reprinted = unit.image().height - img.height
+    assert 4 <= reprinted < printer.BAND_ROWS + 4
+    assert printed.endswith(printer.pack(img)[-printer.ROW_BYTES * 100 :])
+
+
+def test_stream_from_row_resends_preamble():
+    job = printer.PrintJob(printer.pack(_tall_receipt(200)))
+    data, offsets, rows = job.stream(130)
+    assert data.startswith(printer.preamble()) and data.endswith(printer.postamble())
+    assert rows == [194, 200]
+    progress = job.track(offsets, rows)
+    progress(offsets[0] - 1)
+    assert job.rows_acked == 0
+    progress(offsets[0])
+    assert job.rows_acked == 194
+
+
+def _fast_backoff(real_sleep):
+    async def sleep(delay, *args, **kwargs):
+        # skip the reconnect backoff, keep emulator timing intact
+        return await real_sleep(min(delay, 0.01), *args, **kwargs)
+
+    return sleep
@@ -80,3 +80,42 @@ def test_printer_retries(monkeypatch):
 
     # run print - should retry once and then succeed
     asyncio.get_event_loop().run_until_complete(printer.print(img, device=type("D", (), {"name": "MX06", "address": "AA:BB"})()))
+
+
+def test_printer_retries_against_emulator(run, monkeypatch):
+    from catprint import emulator, printer
+    from PIL import Image
+
+    fleet = emulator.EmulatorFleet(connect_delay=0.05, feed_rate=2000, link_rate=50_000)
+
+    class FlakyEmulator:
+        calls = 0
+
+        def __new__(cls, device):
+            cls.calls += 1
+            if cls.calls == 1:
+                class BadClient:
+                    async def __aenter__(self_inner):
+                        await asyncio.sleep(0.05)
+                        raise printer.BleakDBusError("[org.bluez.Error.Failed] Operation already in progress")
+
+                    async def __aexit__(self_inner, exc_type, exc, tb):
+                        return False
+
+                return BadClient()
+            return fleet(device)
+
+    monkeypatch.setattr(printer, "BleakClient", FlakyEmulator)
+    img = Image.new("1", (printer.PRINTER_WIDTH, 40), color="white")
+    device = type("D", (), {"name": "MX06", "address": "AA:EM"})()
+
+    async def main():
+        await printer.print(img, device=device, pool=printer.ConnectionPool())
+        await fleet.printers["AA:EM"].wait_idle()
+
+    run(main())
+
+    unit = fleet.printers["AA:EM"]
+    assert FlakyEmulator.calls == 2
+    assert unit.stats.crc_errors == 0
+    assert unit.image().size == img.size
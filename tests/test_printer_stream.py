@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+import PIL.Image
+import PIL.ImageDraw
+import pytest
+
+from catprint import emulator, printer, render, transport
+
+
+def _page(text, height):
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, height), color="white")
+    PIL.ImageDraw.Draw(img).text((8, height // 3), text, fill="black")
+    return img
+
+
+def _pages():
+    return [_page("logo", 50), _page("first block", 100), _page("x", 13), _page("footer", 90)]
+
+
+@pytest.mark.parametrize("settings", [{}, {"feed_blank": True}, {"compress": True}])
+def test_stream_matches_printing_the_stacked_pages(run, tmp_path, settings):
+    streamed = transport.SinkDevice("MX06", (tmp_path / "streamed.bin").as_uri())
+    stacked = transport.SinkDevice("MX06", (tmp_path / "stacked.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        stats = await printer.print_stream(iter(_pages()), device=streamed, pool=pool, **settings)
+        await printer.print(render.stack(*_pages()), device=stacked, pool=pool, cache=printer.JobCache(), **settings)
+        await pool.close()
+        return stats
+
+    stats = run(main())
+    assert (tmp_path / "streamed.bin").read_bytes() == (tmp_path / "stacked.bin").read_bytes()
+    assert stats.pages == 4 and stats.rows == 253
+
+
+class RecordingClient(transport.Transport):
+    mtu_size = 247
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.written = 0
+        self.first_write_at = None
+
+    @property
+    def is_connected(self):
+        return True
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def write_gatt_char(self, char_specifier, data, response=None):
+        await asyncio.sleep(self.delay)
+        if self.first_write_at is None and self.written > len(printer.preamble()):
+            self.first_write_at = time.perf_counter()
+        self.written += len(data)
+
+
+def _device():
+    return type("D", (), {"name": "MX06", "address": "AA:ST"})()
+
+
+def test_first_line_is_sent_while_later_pages_render(run):
+    client = RecordingClient()
+    rendered = []
+
+    def slow_pages():
+        for n in range(5):
+            time.sleep(0.05)
+            rendered.append(time.perf_counter())
+            yield _page(f"page {n}", printer.BAND_ROWS)
+
+    stats = run(printer.print_stream(slow_pages(), device=_device(), pool=printer.ConnectionPool(factory=lambda d: client)))
+    assert client.first_write_at < rendered[-1]
+    assert stats.first_line_after < 0.2
+
+
+def test_encoding_is_held_back_by_the_queue(run, monkeypatch):
+    client = RecordingClient(delay=0.002)
+    lag = []
+    band_bytes = printer.BAND_ROWS * 56
+    encode_rows = printer.encode_rows
+    encoded = 0
+
+    def counting_encode_rows(raster, **kwargs):
+        nonlocal encoded
+        encoded += len(raster) // printer.ROW_BYTES
+        sent_rows = max(client.written - len(printer.preamble()), 0) // band_bytes * printer.BAND_ROWS
+        lag.append(encoded - sent_rows)
+        return encode_rows(raster, **kwargs)
+
+    monkeypatch.setattr(printer, "encode_rows", counting_encode_rows)
+    pages = [_page(str(n), printer.BAND_ROWS) for n in range(30)]
+    device, pool = _device(), printer.ConnectionPool(factory=lambda d: client)
+    run(printer.print_stream(pages, device=device, pool=pool, cache=printer.JobCache(), queue_size=2))
+    # queued bands, plus one batch being written and one being encoded
+    assert max(lag) <= (2 + 4) * printer.BAND_ROWS
+
+
+def test_rendering_is_held_back_by_the_encoder(run):
+    client = RecordingClient(delay=0.002)
+    lead = []
+
+    def pages():
+        for n in range(30):
+            sent_rows = max(client.written - len(printer.preamble()), 0) // (printer.BAND_ROWS * 56) * printer.BAND_ROWS
+            lead.append(n * printer.BAND_ROWS - sent_rows)
+            yield _page(str(n), printer.BAND_ROWS)
+
+    cache = printer.JobCache()
+    device, pool = _device(), printer.ConnectionPool(factory=lambda d: client)
+    run(printer.print_stream(pages(), device=device, pool=pool, cache=cache, queue_size=2))
+    # the rendering window, queued bands, and one batch being written and one being encoded
+    assert max(lead) <= (2 + 2 + 4) * printer.BAND_ROWS
+    # longer than the queue, so not kept for the cache
+    assert len(cache) == 0
+
+
+def test_repeat_stream_is_served_from_the_cache(run, tmp_path):
+    cache = printer.JobCache()
+    first = transport.SinkDevice("MX06", (tmp_path / "first.bin").as_uri())
+    again = transport.SinkDevice("MX06", (tmp_path / "again.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        stats = await printer.print_stream(iter(_pages()), device=first, pool=pool, cache=cache, compress=True)
+        assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+        repeat = await printer.print_stream(iter(_pages()), device=again, pool=pool, cache=cache, compress=True)
+        assert (cache.hits, cache.misses) == (1, 1)
+        # the same raster printed whole shares the entry
+        await printer.print(render.stack(*_pages()), device=first, pool=pool, cache=cache, compress=True)
+        assert cache.hits == 2
+        return stats, repeat
+
+    stats, repeat = run(main())
+    assert (tmp_path / "again.bin").read_bytes() == (tmp_path / "first.bin").read_bytes()
+    assert (repeat.rows, repeat.encoded_bytes, repeat.pages) == (stats.rows, stats.encoded_bytes, 4)
+
+
+def test_stream_resumes_after_a_dropped_link(run, monkeypatch):
+    real_sleep = printer.asyncio.sleep
+
+    async def fast_sleep(delay, *args, **kwargs):
+        return await real_sleep(min(delay, 0.01), *args, **kwargs)
+
+    monkeypatch.setattr(printer.asyncio, "sleep", fast_sleep)
+
+    class Dropping(emulator.EmulatedPrinter):
+        links = 0
+
+        async def connect(self):
+            await super().connect()
+            self.links += 1
+
+        async def write_gatt_char(self, char_specifier, data, response=None):
+            if self.links == 1 and self.stats.bytes_received > 8000:
+                self._connected = False
+                raise printer.BleakError("Disconnected")
+            await super().write_gatt_char(char_specifier, data, response)
+
+    unit = Dropping(feed_rate=50_000, link_rate=5e6)
+    pages = [_page(f"page {n}", 100) for n in range(6)]
+
+    async def main():
+        stats = await printer.print_stream(iter(pages), device=_device(), pool=printer.ConnectionPool(factory=lambda d: unit))
+        await unit.wait_idle()
+        return stats
+
+    stats = run(main())
+    assert unit.links == 2 and stats.rows == 600
+    reprinted = unit.image().height - 600
+    assert printer.DEFAULT_RESUME_OVERLAP <= reprinted < printer.BAND_ROWS * 3
+    assert printer.pack(unit.image()).endswith(printer.pack(render.stack(*pages))[-printer.ROW_BYTES * 200 :])
+
+
+def test_render_errors_surface(run):
+    client = RecordingClient()
+
+    def pages():
+        yield _page("ok", 20)
+        raise ValueError("bad block")
+
+    with pytest.raises(ValueError, match="bad block"):
+        run(printer.print_stream(pages(), device=_device(), pool=printer.ConnectionPool(factory=lambda d: client)))
@@ -0,0 +1,110 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from catprint import printer, render
+from catprint.raster import PackedRaster
+
+
+def _page(h=40, seed=0):
+    img = Image.new("L", (printer.PRINTER_WIDTH, h), color=255)
+    draw = ImageDraw.Draw(img)
+    for i in range(0, h, 4):
+        draw.line((seed * 7 % 50, i, 200 + i, i), fill=0)
+    return img.convert("1")
+
+
+def test_round_trip_matches_pack():
+    page = _page()
+    raster = PackedRaster.from_image(page)
+    assert raster.size == page.size
+    assert raster.tobytes() == printer.pack(page)
+    assert list(raster.to_image().getdata()) == list(page.getdata())
+
+
+def test_rejects_partial_rows():
+    with pytest.raises(ValueError):
+        PackedRaster(bytes(printer.ROW_BYTES + 1))
+
+
+def test_concat_and_slice_share_memory():
+    a, b = PackedRaster.from_image(_page(30, 1)), PackedRaster.from_image(_page(50, 2))
+    stacked = a + b
+    assert len(stacked) == 80
+    assert stacked.tobytes() == a.tobytes() + b.tobytes()
+    assert all(s.obj is a._segments[0].obj or s.obj is b._segments[0].obj for s in stacked._segments)
+
+    middle = stacked[20:40]
+    assert len(middle) == 20
+    assert middle.tobytes() == stacked.tobytes()[20 * printer.ROW_BYTES : 40 * printer.ROW_BYTES]
+    assert len(middle._segments) == 2
+    assert bytes(stacked[-1]) == b.tobytes()[-printer.ROW_BYTES :]
+    assert [bytes(row) for row in middle.rows()] == [bytes(stacked[i]) for i in range(20, 40)]
+    assert len(stacked[70:10]) == 0
+
+
+def test_memory_is_a_bit_per_pixel():
+    rgb = _page(800).convert("RGB")
+    raster = PackedRaster.from_image(rgb)
+    assert raster.nbytes * 24 == len(rgb.tobytes())
+
+
+def test_stack_and_blank_match_pil():
+    pages = [_page(30, 1), _page(20, 2).resize((192, 10))]
+    expected = render.stack(*pages, render.blank(15))
+    stacked = render.stack(PackedRaster.from_image(pages[0]), pages[1], render.blank(15, packed=True))
+    assert isinstance(stacked, PackedRaster)
+    assert stacked.tobytes() == printer.pack(expected)
+
+
+def test_print_encodes_packed_raster_like_image(run, tmp_path):
+    from catprint import transport
+
+    page = render.stack(_page(70, 3), render.blank(20))
+    raster = PackedRaster.from_image(page)
+    device = transport.SinkDevice("MX06", (tmp_path / "out.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        await printer.print(raster, device=device, pool=pool, cache=printer.JobCache())
+        await pool.close()
+
+    run(main())
+    assert (tmp_path / "out.bin").read_bytes() == printer.encode(page)
+
+
+def _blocks():
+    return [_page(30, 1), _page(20, 2).resize((192, 10)), render.blank(15), _page(45, 3).convert("L")]
+
+
+def test_lazy_stack_matches_stack():
+    blocks = _blocks()
+    lazy = render.stack(*blocks, lazy=True)
+    expected = render.stack(*blocks)
+    assert isinstance(lazy, render.VStack)
+    assert lazy.size == expected.size
+    assert lazy.parts[0] is blocks[0]
+    assert lazy.materialize().tobytes() == expected.tobytes()
+    assert lazy.packed().tobytes() == printer.pack(expected)
+    assert b"".join(lazy.rows()) == printer.pack(expected)
+    # nested lazy stacks flatten instead of nesting
+    assert len(render.VStack(lazy, render.blank(5)).parts) == 5
+
+
+def test_print_and_stream_consume_lazy_stack(run, tmp_path):
+    from catprint import transport
+
+    expected = printer.encode(render.stack(*_blocks()))
+    printed = transport.SinkDevice("MX06", (tmp_path / "printed.bin").as_uri())
+    streamed = transport.SinkDevice("MX06", (tmp_path / "streamed.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        await printer.print(render.stack(*_blocks(), lazy=True), device=printed, pool=pool, cache=printer.JobCache())
+        stats = await printer.print_stream([render.stack(*_blocks(), lazy=True)], device=streamed, pool=pool)
+        await pool.close()
+        return stats
+
+    stats = run(main())
+    assert (tmp_path / "printed.bin").read_bytes() == expected
+    assert (tmp_path / "streamed.bin").read_bytes() == expected
+    assert stats.pages == 1 and stats.rows == 110
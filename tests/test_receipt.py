@@ -34,3 +34,20 @@ def test_render_blocks_pdf_none_ignored():
     blocks = [{"type": "pdf", "data": None}]
     pages = receipt.render_blocks(blocks)
     assert pages == []
+
+
+def test_iter_blocks_renders_lazily():
+    from catprint import receipt
+
+    seen = []
+
+    def blocks():
+        for text in ("one", "two", "three"):
+            seen.append(text)
+            yield {"type": "text", "data": text}
+
+    pages = receipt.iter_blocks(blocks())
+    assert seen == []
+    next(pages)
+    assert seen == ["one"]
+    assert len(list(pages)) == 2
@@ -0,0 +1,185 @@
+import asyncio
+
+import PIL.Image
+import pytest
+
+from catprint import printer, scheduler, transport
+
+
+class SlowLink(transport.Transport):
+    mtu_size = 512
+
+    def __init__(self, device, delay=0.002):
+        self.delay = delay
+
+    @property
+    def is_connected(self):
+        return True
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def write_gatt_char(self, char_specifier, data, response=None):
+        await asyncio.sleep(self.delay)
+
+
+def _device(address):
+    return type("D", (), {"name": "MX06", "address": address})()
+
+
+def _pages(rows=64):
+    return [PIL.Image.new("1", (printer.PRINTER_WIDTH, rows), color="white")]
+
+
+def _scheduler(**kwargs):
+    return scheduler.Scheduler(pool=printer.ConnectionPool(factory=SlowLink), **kwargs)
+
+
+def test_jobs_for_one_printer_run_by_priority_then_fifo(run):
+    async def main():
+        sched = _scheduler()
+        busy = sched.submit(_device("AA:01"), _pages(256))
+        await asyncio.sleep(0.001)
+        assert busy.state is not scheduler.JobState.QUEUED
+        low = [sched.submit(_device("AA:01"), _pages()) for _ in range(3)]
+        high = sched.submit(_device("AA:01"), _pages(), priority=5)
+        await asyncio.gather(*(job.wait() for job in [busy, *low, high]))
+        await sched.close()
+        return busy, low, high
+
+    busy, low, high = run(main())
+    order = sorted([busy, *low, high], key=lambda job: job.started_at)
+    assert order == [busy, high, *low]
+    assert all(job.state is scheduler.JobState.DONE for job in order)
+    assert high.wait_time < low[-1].wait_time
+
+
+def test_printers_have_independent_workers(run):
+    async def main():
+        sched = _scheduler()
+        jobs = [sched.submit(_device(f"AA:0{n}"), _pages(256)) for n in range(3)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await sched.close()
+        return jobs
+
+    jobs = run(main())
+    # all three started before any of them finished
+    assert max(job.started_at for job in jobs) < min(job.finished_at for job in jobs)
+
+
+def test_queue_depth_is_enforced(run):
+    async def main():
+        sched = _scheduler(max_queue_depth=2)
+        jobs = [sched.submit(_device("AA:01"), _pages()) for _ in range(2)]
+        with pytest.raises(scheduler.QueueFull):
+            sched.submit(_device("AA:01"), _pages())
+        # other printers have their own queues
+        jobs.append(sched.submit(_device("AA:02"), _pages()))
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await sched.close()
+
+    run(main())
+
+
+def test_failed_job_does_not_stop_the_worker(run):
+    def broken():
+        raise ValueError("bad block")
+        yield
+
+    async def main():
+        sched = _scheduler()
+        bad = sched.submit(_device("AA:01"), broken())
+        empty = sched.submit(_device("AA:01"), [])
+        good = sched.submit(_device("AA:01"), _pages())
+        await asyncio.gather(bad.wait(), empty.wait(), good.wait())
+        await sched.close()
+        return sched, bad, empty, good
+
+    sched, bad, empty, good = run(main())
+    assert bad.state is scheduler.JobState.FAILED and bad.error == "bad block"
+    assert empty.state is scheduler.JobState.FAILED
+    assert good.state is scheduler.JobState.DONE
+    assert sched.get(bad.id) is bad
+
+
+def test_printer_stats(run):
+    async def main():
+        sched = _scheduler()
+        jobs = [sched.submit(_device("AA:01"), _pages(128)) for _ in range(3)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await sched.close()
+        return sched.stats()["AA:01"]
+
+    stats = run(main())
+    assert (stats.done, stats.failed, stats.queued, stats.rows) == (3, 0, 0, 384)
+    assert stats.wait_time > 0 and stats.mean_service > 0
+    assert stats.rows_per_second > 0
+
+
+def test_cancel_queued_and_running_jobs(run):
+    async def main():
+        sched = _scheduler()
+        running = sched.submit(_device("AA:01"), _pages(2048))
+        queued = sched.submit(_device("AA:01"), _pages())
+        after = sched.submit(_device("AA:01"), _pages())
+        while running.rows_sent == 0:
+            await asyncio.sleep(0.005)
+        assert sched.cancel(queued.id)
+        assert sched.cancel(running.id)
+        await asyncio.gather(running.wait(), queued.wait(), after.wait())
+        assert not sched.cancel(running.id)
+        await sched.close()
+        return sched, running, queued, after
+
+    sched, running, queued, after = run(main())
+    assert running.state is scheduler.JobState.CANCELLED
+    assert 0 < running.rows_sent < 2048
+    assert queued.state is scheduler.JobState.CANCELLED and queued.started_at is None
+    # the worker carries on with the next job
+    assert after.state is scheduler.JobState.DONE
+    stats = sched.stats()["AA:01"]
+    assert (stats.done, stats.cancelled, stats.queued) == (1, 2, 0)
+
+
+def test_cancelled_queued_job_closes_its_pages(run):
+    closed = []
+
+    def rest():
+        try:
+            yield from _pages()
+        finally:
+            closed.append(True)
+
+    async def main():
+        sched = _scheduler()
+        running = sched.submit(_device("AA:01"), _pages(2048))
+        pages = rest()
+        # started, as the API leaves it after peeking at the first page
+        queued = sched.submit(_device("AA:01"), scheduler.Prepended(next(pages), pages))
+        assert sched.cancel(queued.id)
+        assert closed and queued.pages == ()
+        sched.cancel(running.id)
+        await running.wait()
+        await sched.close()
+
+    run(main())
+
+
+def test_progress_is_reported_while_sending(run):
+    seen = []
+
+    async def main():
+        sched = _scheduler()
+        job = sched.submit(_device("AA:01"), _pages(512))
+        while not job.finished:
+            seen.append((job.rows_sent, job.rows_total))
+            await asyncio.sleep(0.002)
+        await sched.close()
+        return job
+
+    job = run(main())
+    assert any(0 < sent < 512 for sent, _ in seen)
+    assert (job.rows_sent, job.rows_total) == (512, 512)
@@ -0,0 +1,149 @@
+import sys
+import threading
+
+import PIL.Image
+import PIL.ImageDraw
+import pytest
+
+from catprint import emulator, printer, render, transport
+from catprint.raster import PackedRaster
+from catprint.spool import HEADER_SIZE, Spool
+
+
+def _page(text, height):
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, height), color="white")
+    PIL.ImageDraw.Draw(img).text((8, height // 3), text, fill="black")
+    return img
+
+
+def _device():
+    return type("D", (), {"name": "MX06", "address": "AA:SP"})()
+
+
+def test_spool_round_trip(tmp_path):
+    path = tmp_path / "job.spool"
+    first, second = printer.pack(_page("one", 30)), PackedRaster.from_image(_page("two", 20))
+    with Spool.create(path, feed_blank=True) as spool:
+        spool += first
+        spool.append(second)
+        assert spool.rows == 50 and len(spool) == 50 * printer.ROW_BYTES
+        assert spool[: len(first)] == first
+        assert spool[len(first) :] == second.tobytes()
+        spool.ack(12)
+        with pytest.raises(ValueError):
+            spool.append(b"\x00" * 5)
+
+    with open(path, "ab") as f:
+        # a row cut short by a crash
+        f.write(b"\xff" * 10)
+    with Spool.open(path) as spool:
+        assert (spool.rows, spool.rows_acked) == (50, 12)
+        assert spool.feed_blank and not spool.compress and not spool.finished
+        assert spool[:] == first + second.tobytes()
+        spool.finish()
+    with Spool.open(path) as spool:
+        assert spool.finished
+
+
+def test_spool_reads_while_another_thread_appends(tmp_path, request):
+    # switch threads as often as possible, so reads and remaps interleave
+    request.addfinalizer(lambda interval=sys.getswitchinterval(): sys.setswitchinterval(interval))
+    sys.setswitchinterval(1e-6)
+    rows = [bytes([n % 256]) * printer.ROW_BYTES for n in range(5000)]
+    errors = []
+    with Spool.create(tmp_path / "job.spool") as spool:
+
+        def read():
+            while spool.rows < len(rows):
+                try:
+                    # each read past the mapped end remaps the growing file
+                    n = spool.rows - 1
+                    assert spool[n * printer.ROW_BYTES : (n + 1) * printer.ROW_BYTES] in (rows[n], b"")
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for row in rows:
+            spool += row
+        for reader in readers:
+            reader.join()
+        assert spool[:] == b"".join(rows)
+    assert not errors
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * HEADER_SIZE)
+    with pytest.raises(ValueError):
+        Spool.open(path)
+
+
+@pytest.mark.parametrize("settings", [{}, {"feed_blank": True}])
+def test_spooled_stream_matches_in_memory(run, tmp_path, settings):
+    pages = [_page("logo", 50), _page("block", 150), _page("footer", 40)]
+    spooled = transport.SinkDevice("MX06", (tmp_path / "spooled.bin").as_uri())
+    plain = transport.SinkDevice("MX06", (tmp_path / "plain.bin").as_uri())
+
+    async def main():
+        pool = printer.ConnectionPool()
+        stats = await printer.print_stream(iter(pages), device=spooled, pool=pool, spool=tmp_path / "job.spool", **settings)
+        await printer.print_stream(iter(pages), device=plain, pool=pool, **settings)
+        await pool.close()
+        return stats
+
+    stats = run(main())
+    assert stats.rows == 240
+    assert (tmp_path / "spooled.bin").read_bytes() == (tmp_path / "plain.bin").read_bytes()
+    assert not (tmp_path / "job.spool").exists()
+
+
+def test_spool_resumes_after_a_restart(run, tmp_path, monkeypatch):
+    real_sleep = printer.asyncio.sleep
+
+    async def fast_sleep(delay, *args, **kwargs):
+        return await real_sleep(min(delay, 0.01), *args, **kwargs)
+
+    monkeypatch.setattr(printer.asyncio, "sleep", fast_sleep)
+
+    class Dying(emulator.EmulatedPrinter):
+        async def write_gatt_char(self, char_specifier, data, response=None):
+            if self.stats.bytes_received > 8000:
+                self._connected = False
+                raise printer.BleakError("Disconnected")
+            await super().write_gatt_char(char_specifier, data, response)
+
+    path = tmp_path / "job.spool"
+    pages = [_page(f"page {n}", 100) for n in range(6)]
+    dying = Dying(feed_rate=50_000, link_rate=5e6)
+    with pytest.raises(printer.BleakError):
+        run(printer.print_stream(iter(pages), device=_device(), pool=printer.ConnectionPool(factory=lambda d: dying), spool=path, retries=1))
+
+    with Spool.open(path) as spool:
+        assert spool.finished and spool.rows == 600
+        acked = spool.rows_acked
+    assert 0 < acked < 600
+
+    unit = emulator.EmulatedPrinter(feed_rate=50_000, link_rate=5e6)
+
+    async def main():
+        stats = await printer.print_spool(path, device=_device(), pool=printer.ConnectionPool(factory=lambda d: unit))
+        await unit.wait_idle()
+        return stats
+
+    stats = run(main())
+    resumed_at = acked - printer.DEFAULT_RESUME_OVERLAP
+    assert stats.rows == 600 - resumed_at
+    assert printer.pack(unit.image()) == printer.pack(render.stack(*pages))[resumed_at * printer.ROW_BYTES :]
+    assert not path.exists()
+
+
+def test_unfinished_spool_is_not_printed(run, tmp_path):
+    path = tmp_path / "job.spool"
+    with Spool.create(path) as spool:
+        spool += printer.pack(_page("half", 20))
+    with pytest.raises(RuntimeError, match="not finished"):
+        run(printer.print_spool(path, device=_device(), pool=printer.ConnectionPool(factory=lambda d: None)))
+    assert path.exists()
@@ -0,0 +1,97 @@
+import asyncio
+
+import PIL.Image
+import pytest
+import PIL.ImageDraw
+
+from catprint import printer, transport
+
+
+def _receipt():
+    img = PIL.Image.new("1", (printer.PRINTER_WIDTH, 30), color="white")
+    PIL.ImageDraw.Draw(img).text((4, 8), "captured", fill="black")
+    return img
+
+
+def test_for_address_routes_urls():
+    assert isinstance(transport.for_address("file:///tmp/x.bin"), transport.FileTransport)
+    tcp = transport.for_address("tcp://127.0.0.1:9100")
+    assert isinstance(tcp, transport.TcpTransport) and tcp.port == 9100
+    assert transport.for_address("AA:BB:CC:DD:EE:01") is None
+    with pytest.raises(ValueError, match="port"):
+        transport.for_address("tcp://127.0.0.1")
+
+
+def test_incomplete_transport_fails_on_construction():
+    class NoWrites(transport.Transport):
+        is_connected = True
+
+        async def connect(self):
+            pass
+
+        async def disconnect(self):
+            pass
+
+    with pytest.raises(TypeError, match="write_gatt_char"):
+        NoWrites()
+
+
+def test_transports_without_notifications_skip_flow_control(run, tmp_path):
+    sink = transport.FileTransport(tmp_path / "out.bin")
+    assert not sink.notifies and not hasattr(sink, "start_notify")
+    assert run(printer.start_flow_control(sink)) is None
+
+
+def test_file_sink_captures_exact_stream(run, tmp_path):
+    img = _receipt()
+    device = transport.spool_device(type("D", (), {"name": "MX06", "address": "AA:BB"})(), tmp_path, job="t1")
+
+    path = tmp_path / "AABB-t1.bin"
+
+    async def main():
+        pool = printer.ConnectionPool()
+        for _ in range(2):
+            await printer.print(img, device=device, pool=pool)
+            # closed with the job: complete on disk, and the next job starts over
+            assert device.address not in pool
+            assert path.read_bytes() == printer.encode(img)
+        await pool.close()
+
+    run(main())
+
+
+def test_discarding_sink_without_directory(run):
+    device = transport.spool_device(type("D", (), {"name": "MX06", "address": "AA:BB"})())
+    assert device.address.startswith("file://")
+
+    async def main():
+        pool = printer.ConnectionPool()
+        await printer.print(_receipt(), device=device, pool=pool)
+        await pool.close()
+
+    run(main())
+
+
+def test_tcp_stand_in_receives_stream(run):
+    img = _receipt()
+    received = bytearray()
+
+    async def main():
+        async def handle(reader, writer):
+            while data := await reader.read(4096):
+                received.extend(data)
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        device = type("D", (), {"name": "MX06", "address": f"tcp://127.0.0.1:{port}"})()
+        pool = printer.ConnectionPool()
+        await printer.print(img, device=device, pool=pool)
+        await pool.close()
+        await asyncio.sleep(0.05)
+        server.close()
+        await server.wait_closed()
+
+    run(main())
+    # the state query sent once notifications are up, then the job itself
+    assert bytes(received) == printer.Command.GET_DEV_STATE.format(b"\x00") + printer.encode(img)
@@ -0,0 +1,100 @@
+import pickle
+
+import PIL.Image
+import pytest
+
+from catprint import printer, receipt, render, transport, workers
+
+
+BLOCKS = [
+    {"type": "text", "data": "Hello world"},
+    {"type": "banner", "data": "SALE"},
+    {"type": "image", "data": PIL.Image.new("L", (200, 80), color=90)},
+    {"type": "text", "data": ""},
+]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = workers.RenderPool(workers=2, lookahead=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_parts_pickle_and_render_like_iter_blocks():
+    parts = list(receipt.iter_parts(BLOCKS))
+    assert len(parts) == len(BLOCKS)
+    rendered = [page for part in parts for page in pickle.loads(pickle.dumps(part))()]
+    expected = list(receipt.iter_blocks(BLOCKS))
+    assert [printer.pack_page(p) for p in rendered] == [printer.pack_page(p) for p in expected]
+
+
+def test_pool_returns_packed_pages_in_order(pool):
+    # pages are views into shared memory, valid until the next one is taken
+    packed = [bytes(p) for p in pool.pages(receipt.iter_parts(BLOCKS))]
+    assert packed == [printer.pack_page(p) for p in receipt.iter_blocks(BLOCKS)]
+    assert all(len(p) % printer.ROW_BYTES == 0 for p in packed)
+
+
+def test_print_stream_takes_packed_pages(run, pool, tmp_path):
+    device = transport.SinkDevice("MX06", (tmp_path / "out.bin").as_uri())
+
+    async def main():
+        link_pool = printer.ConnectionPool()
+        stats = await printer.print_stream(pool.pages(receipt.iter_parts(BLOCKS)), device=device, pool=link_pool)
+        await link_pool.close()
+        return stats
+
+    stats = run(main())
+    raster = b"".join(printer.pack_page(p) for p in receipt.iter_blocks(BLOCKS))
+    assert stats.rows == len(raster) // printer.ROW_BYTES
+    assert (tmp_path / "out.bin").read_bytes() == printer.encode(printer.unpack(raster))
+
+
+def test_every_worker_preloads_fonts_and_reports_them(pool):
+    list(pool.pages(receipt.iter_parts(BLOCKS)))
+    executor = pool._get_executor()
+    per_worker = dict(f.result() for f in [executor.submit(workers._worker_stats) for _ in range(8)])
+    assert all(stats["fonts"]["loads"] >= len(render.BUNDLED_FONTS) for stats in per_worker.values())
+    fonts = pool.cache_stats()["fonts"]
+    assert fonts["loads"] >= len(render.BUNDLED_FONTS) and fonts["hits"] > 0
+
+
+def test_every_worker_warms_up_banners():
+    pool = workers.RenderPool(workers=2, banners=["SALE"])
+    try:
+        pool.start()
+        executor = pool._get_executor()
+        per_worker = dict(f.result() for f in [executor.submit(workers._worker_stats) for _ in range(8)])
+        # the banner and its text banner, rendered before any job
+        assert all(stats["banners"]["entries"] == 2 for stats in per_worker.values())
+        list(pool.pages(receipt.iter_parts([{"type": "banner", "data": "SALE"}])))
+        assert pool.cache_stats()["banners"]["hits"] >= 1
+    finally:
+        pool.shutdown()
+
+
+def _segments():
+    import os
+
+    if not os.path.isdir("/dev/shm"):
+        return []
+    return [n for n in os.listdir("/dev/shm") if n.startswith(f"cp{os.getpid()}_")]
+
+
+def test_shared_segments_are_freed_as_pages_are_consumed(pool):
+    pages = pool.pages(receipt.iter_parts(BLOCKS))
+    first = bytes(next(pages))
+    assert len(pool) > 0
+    rest = [bytes(p) for p in pages]
+    assert [first, *rest] == [printer.pack_page(p) for p in receipt.iter_blocks(BLOCKS)]
+    assert len(pool) == 0 and _segments() == []
+
+
+def test_closing_early_frees_segments_still_rendering(pool):
+    pages = pool.pages(receipt.iter_parts(BLOCKS * 4))
+    next(pages)
+    pages.close()
+    # parts already running finish in the workers, then get unlinked
+    pool.shutdown()
+    assert len(pool) == 0 and _segments() == []